@@ -5,15 +5,19 @@ __all__ = ["Logging", "trace", "set_global_redaction", "print"]
 
 def __getattr__(name):
     if name == "Logging":
-        from .custom_logging import Logging
-        return Logging
-    if name == "trace":
-        from .tracer import trace
-        return trace
-    if name == "set_global_redaction":
-        from .tracer import set_global_redaction
-        return set_global_redaction
-    if name == "print":
-        from .printing import print as pyeztrace_print  # noqa: A001
-        return pyeztrace_print
-    raise AttributeError(f"module 'pyeztrace' has no attribute {name!r}")
\ No newline at end of file
+        from .custom_logging import Logging as value
+    elif name == "trace":
+        from .tracer import trace as value
+    elif name == "set_global_redaction":
+        from .tracer import set_global_redaction as value
+    elif name == "print":
+        from .printing import print as value  # noqa: A001
+    else:
+        raise AttributeError(f"module 'pyeztrace' has no attribute {name!r}")
+    # Cache on the module so later lookups bypass __getattr__ entirely.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,12 +2,30 @@ import os
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+# Environment variables are read once per process; LogConfig instances share the snapshot.
+_ENV_CACHE: Dict[str, Optional[str]] = {}
+
+
+def _read_env(name: str) -> Optional[str]:
+    try:
+        return _ENV_CACHE[name]
+    except KeyError:
+        value = os.environ.get(name)
+        _ENV_CACHE[name] = value
+        return value
+
+
+def clear_env_cache() -> None:
+    """Forget cached environment reads (used by tests that mutate os.environ)."""
+    _ENV_CACHE.clear()
+
+
 class LogConfig:
     """Configuration for the logging system."""
     def __init__(self):
-        env_base_format = os.environ.get("EZTRACE_LOG_FORMAT")
-        env_console_format = os.environ.get("EZTRACE_CONSOLE_LOG_FORMAT")
-        env_file_format = os.environ.get("EZTRACE_FILE_LOG_FORMAT")
+        env_base_format = _read_env("EZTRACE_LOG_FORMAT")
+        env_console_format = _read_env("EZTRACE_CONSOLE_LOG_FORMAT")
+        env_file_format = _read_env("EZTRACE_FILE_LOG_FORMAT")
 
         self._explicit: Dict[str, bool] = {
             "format": env_base_format is not None,
@@ -32,10 +50,11 @@ class LogConfig:
 
     def _get_env(self, key: str, default: str) -> str:
         """Get environment variable with EZTRACE_ prefix."""
-        return os.environ.get(f'EZTRACE_{key}', default)
+        value = _read_env(f'EZTRACE_{key}')
+        return default if value is None else value
 
     def _get_env_bool(self, key: str, default: bool) -> bool:
-        value = os.environ.get(f'EZTRACE_{key}')
+        value = _read_env(f'EZTRACE_{key}')
         if value is None:
             return default
         return value.lower() in {"1", "true", "yes", "on"}
@@ -2,11 +2,20 @@ import os
 import json
 import time
 import gzip
+import io
+import re
 import uuid
+import datetime
 import sys
-from contextlib import contextmanager
-from typing import Any, Dict, Iterable, Optional, Set
+import threading
+import functools
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
 from urllib.parse import urlparse
+try:
+    import orjson  # Optional fast JSON encoder for the batch exporters
+except Exception:
+    orjson = None  # type: ignore
 
 # Internal EZTrace Setup for project name
 from pyeztrace.setup import Setup
@@ -16,6 +25,13 @@ class _OtelState:
     """Holds OpenTelemetry state lazily, without importing heavy deps by default."""
     enabled: bool = False
     initialized: bool = False
+    # Set once enable_from_env() has evaluated the environment.
+    resolved: bool = False
+    # True when spans are known to be no-ops and no debug output was requested,
+    # letting start_span() skip all diagnostic bookkeeping.
+    noop: bool = False
+    # Tracer start_span() uses directly; None unless OTEL is enabled and initialized.
+    active_tracer = None
     tracer_provider = None
     tracer = None
     span_processor = None
@@ -28,17 +44,40 @@ _state = _OtelState()
 
 _GCP_TELEMETRY_ENDPOINT = "https://telemetry.googleapis.com/v1/traces"
 _GCP_DEFAULT_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
-_GCP_EXPORTER_NAMES = {"gcp", "google", "googlecloud", "google-cloud"}
+# Accepted spellings of EZTRACE_OTEL_EXPORTER mapped to their canonical name.
+_EXPORTER_ALIASES = {
+    "console": "console",
+    "stdout": "console",
+    "otlp": "otlp",
+    "otlphttp": "otlp",
+    "otlp-http": "otlp",
+    "gcp": "gcp",
+    "google": "gcp",
+    "googlecloud": "gcp",
+    "google-cloud": "gcp",
+    "s3": "s3",
+    "azure": "azure",
+    "azureblob": "azure",
+    "azure-blob": "azure",
+}
 _GCP_PROJECT_ENV_KEYS = (
     "EZTRACE_GCP_PROJECT_ID",
     "GOOGLE_CLOUD_PROJECT",
     "GCLOUD_PROJECT",
     "GCP_PROJECT",
 )
-_DIAGNOSTIC_ONCE_KEYS: Set[str] = set()
+# Bounded so that diagnostics keyed on varying error text cannot grow forever;
+# the oldest keys are evicted first and may be reported again.
+_DIAGNOSTIC_ONCE_MAX_KEYS = 1024
+_DIAGNOSTIC_ONCE_KEYS: "OrderedDict[str, None]" = OrderedDict()
+_HEADER_PAIR_RE = re.compile(r"([^,=]*)=([^,]*)")
+_GCP_TOKEN_REFRESH_MARGIN_S = 60.0
+_JSON_SAFE_TYPES = (str, int, float, bool, type(None))
 
 
+@functools.lru_cache(maxsize=None)
 def _env_bool(key: str, default: bool = False) -> bool:
+    # Cached: env vars are treated as fixed for the life of the process.
     v = os.environ.get(key)
     if v is None:
         return default
@@ -49,6 +88,13 @@ def _otel_debug_enabled() -> bool:
     return _env_bool("EZTRACE_OTEL_DEBUG", False)
 
 
+def clear_env_cache() -> None:
+    """Drop cached environment flags so the next read sees os.environ again."""
+    _env_bool.cache_clear()
+    _should_use_gcp_auth.cache_clear()
+    _resolve_otlp_endpoint.cache_clear()
+
+
 def _emit_diagnostic(
     message: str,
     *,
@@ -61,7 +107,9 @@ def _emit_diagnostic(
     if once_key and once_key in _DIAGNOSTIC_ONCE_KEYS:
         return
     if once_key:
-        _DIAGNOSTIC_ONCE_KEYS.add(once_key)
+        _DIAGNOSTIC_ONCE_KEYS[once_key] = None
+        if len(_DIAGNOSTIC_ONCE_KEYS) > _DIAGNOSTIC_ONCE_MAX_KEYS:
+            _DIAGNOSTIC_ONCE_KEYS.popitem(last=False)
     try:
         sys.__stderr__.write(f"[PyEzTrace OTEL {level}] {message}\n")
         sys.__stderr__.flush()
@@ -80,8 +128,17 @@ def _span_export_result_failure():
 class _DiagnosticSpanExporter:
     """Wrap an exporter and surface runtime export failures."""
 
+    __slots__ = ("_inner", "_success", "_failure")
+
     def __init__(self, inner):
         self._inner = inner
+        try:
+            from opentelemetry.sdk.trace.export import SpanExportResult
+            self._success = SpanExportResult.SUCCESS
+        except Exception:
+            # Without the SDK there is no result type to compare against.
+            self._success = None
+        self._failure = _span_export_result_failure()
 
     def export(self, spans: Iterable[Any]):
         try:
@@ -93,17 +150,13 @@ class _DiagnosticSpanExporter:
                 level="ERROR",
                 once_key=f"export-exc:{type(e).__name__}:{e}",
             )
-            return _span_export_result_failure()
+            return self._failure
 
-        try:
-            from opentelemetry.sdk.trace.export import SpanExportResult
-            if result != SpanExportResult.SUCCESS:
-                _emit_diagnostic(
-                    f"Span exporter returned non-success result: {result}",
-                    once_key=f"export-non-success:{result}",
-                )
-        except Exception:
-            pass
+        if self._success is not None and result is not self._success:
+            _emit_diagnostic(
+                f"Span exporter returned non-success result: {result}",
+                once_key=f"export-non-success:{result}",
+            )
         return result
 
     def shutdown(self):
@@ -118,19 +171,20 @@ class _DiagnosticSpanExporter:
             return fn(*args, **kwargs)
         return True
 
-    def __getattr__(self, item):
-        return getattr(self._inner, item)
-
 
 class _RefreshingGoogleBearerSpanExporter:
     """
-    Wraps an OTLP exporter and refreshes GCP bearer auth before each export.
+    Wraps an OTLP exporter and refreshes GCP bearer auth when the token nears expiry.
     Used for OTLP exporter versions that do not support a custom requests session.
     """
 
-    def __init__(self, inner, credentials):
+    __slots__ = ("_inner", "_credentials", "_token", "_token_expiry")
+
+    def __init__(self, inner, credentials, token: Optional[str] = None):
         self._inner = inner
         self._credentials = credentials
+        self._token = token
+        self._token_expiry = _google_token_expiry(credentials) if token else None
 
     def _set_authorization_header(self, token: str) -> None:
         authorization = f"Bearer {token}"
@@ -144,18 +198,26 @@ class _RefreshingGoogleBearerSpanExporter:
         if isinstance(session_headers, dict):
             session_headers["Authorization"] = authorization
 
-    def export(self, spans: Iterable[Any]):
-        token, err = _refresh_google_access_token(self._credentials)
-        if token is None:
-            _state.error = f"Google bearer token refresh failed: {err}"
-            _emit_diagnostic(
-                f"Google bearer token refresh failed: {err}",
-                level="ERROR",
-                once_key=f"gcp-token-refresh-failed:{err}",
-            )
-            return _span_export_result_failure()
+    def _token_is_fresh(self) -> bool:
+        # Credentials without a known expiry are refreshed on every export.
+        if not self._token or self._token_expiry is None:
+            return False
+        return time.time() < self._token_expiry - _GCP_TOKEN_REFRESH_MARGIN_S
 
-        self._set_authorization_header(token)
+    def export(self, spans: Iterable[Any]):
+        if not self._token_is_fresh():
+            token, err = _refresh_google_access_token(self._credentials)
+            if token is None:
+                _state.error = f"Google bearer token refresh failed: {err}"
+                _emit_diagnostic(
+                    f"Google bearer token refresh failed: {err}",
+                    level="ERROR",
+                    once_key=f"gcp-token-refresh-failed:{err}",
+                )
+                return _span_export_result_failure()
+            self._token = token
+            self._token_expiry = _google_token_expiry(self._credentials)
+            self._set_authorization_header(token)
         return self._inner.export(spans)
 
     def shutdown(self):
@@ -170,10 +232,8 @@ class _RefreshingGoogleBearerSpanExporter:
             return fn(*args, **kwargs)
         return True
 
-    def __getattr__(self, item):
-        return getattr(self._inner, item)
-
 
+@functools.lru_cache(maxsize=8)
 def _is_google_telemetry_endpoint(endpoint: str) -> bool:
     if not endpoint:
         return False
@@ -186,11 +246,14 @@ def _is_google_telemetry_endpoint(endpoint: str) -> bool:
         return False
 
 
+def _canonical_exporter(name: Optional[str]) -> str:
+    """Normalize an exporter name; unknown names are returned lowercased as-is."""
+    key = (name or "").strip().lower()
+    return _EXPORTER_ALIASES.get(key, key)
+
+
 def _has_authorization_header(headers: Dict[str, str]) -> bool:
-    for k in headers.keys():
-        if str(k).strip().lower() == "authorization":
-            return True
-    return False
+    return any(str(k).strip().lower() == "authorization" for k in headers)
 
 
 def _parse_scopes(raw_scopes: str):
@@ -201,24 +264,39 @@ def _parse_scopes(raw_scopes: str):
     return scopes or [_GCP_DEFAULT_SCOPE]
 
 
+@functools.lru_cache(maxsize=8)
 def _should_use_gcp_auth(endpoint: str, exporter_name: str) -> bool:
     explicit = os.environ.get("EZTRACE_OTLP_GCP_AUTH")
     if explicit is not None:
         return explicit.strip().lower() in ("1", "true", "yes", "y", "on")
 
-    name = (exporter_name or "").strip().lower()
-    if name in _GCP_EXPORTER_NAMES:
+    if _canonical_exporter(exporter_name) == "gcp":
         return True
 
     return _is_google_telemetry_endpoint(endpoint)
 
 
+@functools.lru_cache(maxsize=8)
 def _resolve_otlp_endpoint(exporter_name: str) -> str:
-    name = (exporter_name or "").strip().lower()
-    default_endpoint = _GCP_TELEMETRY_ENDPOINT if name in _GCP_EXPORTER_NAMES else "http://localhost:4318/v1/traces"
+    if _canonical_exporter(exporter_name) == "gcp":
+        default_endpoint = _GCP_TELEMETRY_ENDPOINT
+    else:
+        default_endpoint = "http://localhost:4318/v1/traces"
     return os.environ.get("EZTRACE_OTLP_ENDPOINT", default_endpoint)
 
 
+@functools.lru_cache(maxsize=1)
+def _google_auth_default(scopes):
+    # ADC discovery probes files and possibly the metadata server; only successful
+    # lookups are memoized because lru_cache does not cache raised exceptions.
+    import google.auth
+    return google.auth.default(scopes=list(scopes))
+
+
+def _reset_gcp_caches_for_tests():
+    _google_auth_default.cache_clear()
+
+
 def _resolve_gcp_project_id() -> Optional[str]:
     for key in _GCP_PROJECT_ENV_KEYS:
         value = os.environ.get(key)
@@ -226,8 +304,8 @@ def _resolve_gcp_project_id() -> Optional[str]:
             return value.strip()
 
     try:
-        import google.auth
-        _credentials, project_id = google.auth.default(scopes=_parse_scopes(os.environ.get("EZTRACE_GCP_SCOPES", "")))
+        scopes = tuple(_parse_scopes(os.environ.get("EZTRACE_GCP_SCOPES", "")))
+        _credentials, project_id = _google_auth_default(scopes)
         if project_id:
             return str(project_id)
     except Exception:
@@ -237,13 +315,13 @@ def _resolve_gcp_project_id() -> Optional[str]:
 
 def _load_google_credentials():
     try:
-        import google.auth
+        import google.auth  # noqa: F401
     except Exception as e:
         return None, f"GCP auth requires google-auth: {e}"
 
-    scopes = _parse_scopes(os.environ.get("EZTRACE_GCP_SCOPES", ""))
+    scopes = tuple(_parse_scopes(os.environ.get("EZTRACE_GCP_SCOPES", "")))
     try:
-        credentials, _project = google.auth.default(scopes=scopes)
+        credentials, _project = _google_auth_default(scopes)
         if credentials is None:
             return None, "Unable to load Google credentials from ADC."
         return credentials, None
@@ -259,6 +337,20 @@ def _build_google_authorized_session(credentials):
         return None, f"Unable to create Google AuthorizedSession: {e}"
 
 
+def _google_token_expiry(credentials) -> Optional[float]:
+    """Return the credentials' expiry as epoch seconds, or None when unknown."""
+    expiry = getattr(credentials, "expiry", None)
+    if expiry is None:
+        return None
+    try:
+        if expiry.tzinfo is None:
+            # google-auth reports expiry as a naive UTC datetime.
+            expiry = expiry.replace(tzinfo=datetime.timezone.utc)
+        return expiry.timestamp()
+    except Exception:
+        return None
+
+
 def _refresh_google_access_token(credentials):
     try:
         from google.auth.transport.requests import Request
@@ -281,12 +373,12 @@ def _build_otlp_http_exporter(endpoint: str, headers: Dict[str, str], exporter_n
     except Exception as e:
         return None, f"OTLP HTTP exporter requires opentelemetry-exporter-otlp: {e}"
 
-    resolved_headers = dict(headers or {})
-    use_gcp_auth = _should_use_gcp_auth(endpoint, exporter_name) and not _has_authorization_header(resolved_headers)
+    headers = headers or {}
+    use_gcp_auth = _should_use_gcp_auth(endpoint, exporter_name) and not _has_authorization_header(headers)
 
     if not use_gcp_auth:
         try:
-            return OTLPSpanExporter(endpoint=endpoint, headers=resolved_headers or None), None
+            return OTLPSpanExporter(endpoint=endpoint, headers=headers or None), None
         except Exception as e:
             return None, f"Error creating OTLP HTTP exporter: {e}"
 
@@ -297,7 +389,7 @@ def _build_otlp_http_exporter(endpoint: str, headers: Dict[str, str], exporter_n
     session, session_err = _build_google_authorized_session(credentials)
     if session is not None:
         try:
-            return OTLPSpanExporter(endpoint=endpoint, headers=resolved_headers or None, session=session), None
+            return OTLPSpanExporter(endpoint=endpoint, headers=headers or None, session=session), None
         except TypeError as e:
             # Older OTLP exporter versions do not accept "session"; fallback to bearer token header.
             if "session" not in str(e):
@@ -311,72 +403,89 @@ def _build_otlp_http_exporter(endpoint: str, headers: Dict[str, str], exporter_n
     if token is None:
         return None, f"{session_err} Fallback bearer token setup failed: {token_err}"
 
+    # Copy only here: the bearer header must not leak into the caller's dict.
+    resolved_headers = dict(headers)
     resolved_headers["Authorization"] = f"Bearer {token}"
     try:
-        exporter = OTLPSpanExporter(endpoint=endpoint, headers=resolved_headers or None)
-        return _RefreshingGoogleBearerSpanExporter(exporter, credentials), None
+        exporter = OTLPSpanExporter(endpoint=endpoint, headers=resolved_headers)
+        return _RefreshingGoogleBearerSpanExporter(exporter, credentials, token=token), None
     except Exception as e:
         return None, f"Error creating OTLP HTTP exporter with Google bearer auth: {e}"
 
 
+def _build_console_exporter(name: str):
+    try:
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter(), None
+    except Exception as e:
+        return None, f"Console exporter requires OpenTelemetry SDK: {e}"
+
+
+def _build_otlp_exporter(name: str):
+    endpoint = _resolve_otlp_endpoint(name)
+    headers = _parse_headers(os.environ.get("EZTRACE_OTLP_HEADERS", ""))
+    return _build_otlp_http_exporter(endpoint=endpoint, headers=headers, exporter_name=name)
+
+
+def _build_s3_exporter(name: str):
+    try:
+        import boto3  # noqa: F401
+    except Exception as e:
+        return None, f"S3 exporter requires boto3: {e}"
+    try:
+        return _S3SpanExporter(), None
+    except Exception as e:
+        return None, f"Error creating S3 exporter: {e}"
+
+
+def _build_azure_exporter(name: str):
+    try:
+        from azure.storage.blob import BlobServiceClient  # noqa: F401
+    except Exception as e:
+        return None, f"Azure exporter requires azure-storage-blob: {e}"
+    try:
+        return _AzureBlobSpanExporter(), None
+    except Exception as e:
+        return None, f"Error creating Azure exporter: {e}"
+
+
+_EXPORTER_BUILDERS = {
+    # Console exporter (dev friendly, no extra deps)
+    "console": _build_console_exporter,
+    # OTLP HTTP exporter (default OTEL path); "gcp" adds Google auth defaults
+    "otlp": _build_otlp_exporter,
+    "gcp": _build_otlp_exporter,
+    # S3 exporter (optional, requires boto3)
+    "s3": _build_s3_exporter,
+    # Azure Blob exporter (optional)
+    "azure": _build_azure_exporter,
+}
+
+
 def _build_exporter(exporter_name: str):
     """
     Build an exporter instance based on name. Import heavy libs only on demand.
     Supported: 'console', 'otlp', 'gcp', 's3', 'azure'.
     Returns (exporter, error_str)
     """
-    name = (exporter_name or "").strip().lower()
+    name = _canonical_exporter(exporter_name)
+    builder = _EXPORTER_BUILDERS.get(name)
+    if builder is None:
+        # Fallback to no exporter
+        return None, f"Unknown exporter '{exporter_name}'"
+    return builder(name)
 
-    # Console exporter (dev friendly, no extra deps)
-    if name in ("console", "stdout"):
-        try:
-            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
-            return ConsoleSpanExporter(), None
-        except Exception as e:
-            return None, f"Console exporter requires OpenTelemetry SDK: {e}"
 
-    # OTLP HTTP exporter (default OTEL path)
-    if name in ("otlp", "otlphttp", "otlp-http", "gcp", "google", "googlecloud", "google-cloud"):
-        endpoint = _resolve_otlp_endpoint(name)
-        headers = _parse_headers(os.environ.get("EZTRACE_OTLP_HEADERS", ""))
-        return _build_otlp_http_exporter(endpoint=endpoint, headers=headers, exporter_name=name)
-
-    # S3 exporter (optional, requires boto3)
-    if name in ("s3",):
-        try:
-            import boto3  # noqa: F401
-        except Exception as e:
-            return None, f"S3 exporter requires boto3: {e}"
-        try:
-            return _S3SpanExporter(), None
-        except Exception as e:
-            return None, f"Error creating S3 exporter: {e}"
-
-    # Azure Blob exporter (optional)
-    if name in ("azure", "azureblob", "azure-blob"):
-        try:
-            from azure.storage.blob import BlobServiceClient  # noqa: F401
-        except Exception as e:
-            return None, f"Azure exporter requires azure-storage-blob: {e}"
-        try:
-            return _AzureBlobSpanExporter(), None
-        except Exception as e:
-            return None, f"Error creating Azure exporter: {e}"
-
-    # Fallback to no exporter
-    return None, f"Unknown exporter '{exporter_name}'"
+@functools.lru_cache(maxsize=8)
+def _parse_header_pairs(header_str: str):
+    # Format: key1=val1,key2=val2 (values may themselves contain '=')
+    return tuple((k.strip(), v.strip()) for k, v in _HEADER_PAIR_RE.findall(header_str))
 
 
 def _parse_headers(header_str: str) -> Dict[str, str]:
-    headers: Dict[str, str] = {}
     if not header_str:
-        return headers
-    # Format: key1=val1,key2=val2
-    for part in header_str.split(','):
-        if '=' in part:
-            k, v = part.split('=', 1)
-            headers[k.strip()] = v.strip()
-    return headers
+        return {}
+    return dict(_parse_header_pairs(header_str))
 
 
 def _span_to_dict(span) -> Dict[str, Any]:
@@ -386,10 +495,12 @@ def _span_to_dict(span) -> Dict[str, Any]:
     try:
         if span.attributes:
             for k, v in span.attributes.items():
-                try:
-                    json.dumps(v)
+                # OTEL attribute values are primitives or homogeneous sequences of them.
+                if isinstance(v, _JSON_SAFE_TYPES):
                     attrs[str(k)] = v
-                except Exception:
+                elif isinstance(v, (list, tuple)) and all(isinstance(x, _JSON_SAFE_TYPES) for x in v):
+                    attrs[str(k)] = list(v)
+                else:
                     attrs[str(k)] = str(v)
     except Exception:
         pass
@@ -405,16 +516,15 @@ def _span_to_dict(span) -> Dict[str, Any]:
     except Exception:
         pass
 
-    def _hex(id_int: int, width: int) -> str:
-        try:
-            return format(id_int, f"0{width}x")
-        except Exception:
-            return ""
+    trace_id = getattr(ctx, "trace_id", 0)
+    span_id = getattr(ctx, "span_id", 0)
+    parent = getattr(span, "parent", None)
+    parent_span_id = getattr(parent, "span_id", 0) if parent else None
 
     return {
-        "trace_id": _hex(getattr(ctx, "trace_id", 0), 32),
-        "span_id": _hex(getattr(ctx, "span_id", 0), 16),
-        "parent_span_id": _hex(getattr(span.parent, "span_id", 0), 16) if getattr(span, "parent", None) else "",
+        "trace_id": f"{trace_id:032x}" if isinstance(trace_id, int) else "",
+        "span_id": f"{span_id:016x}" if isinstance(span_id, int) else "",
+        "parent_span_id": f"{parent_span_id:016x}" if isinstance(parent_span_id, int) else "",
         "name": getattr(span, "name", ""),
         "start_time_unix_nano": getattr(span, "start_time", 0),
         "end_time_unix_nano": getattr(span, "end_time", 0),
@@ -434,7 +544,10 @@ def enable_from_env() -> bool:
     """Enable OpenTelemetry if EZTRACE_OTEL_ENABLED is true. Idempotent."""
     _state.enabled = _env_bool("EZTRACE_OTEL_ENABLED", False)
     _state.error = None
+    _state.resolved = True
+    _state.noop = not _state.enabled and not _otel_debug_enabled()
     if not _state.enabled:
+        _state.active_tracer = None
         _emit_diagnostic(
             "OTEL bridge is disabled (EZTRACE_OTEL_ENABLED is false). Spans will be no-op.",
             level="DEBUG",
@@ -446,7 +559,7 @@ def enable_from_env() -> bool:
         return _state.enabled
 
     exporter_name = os.environ.get("EZTRACE_OTEL_EXPORTER", "")
-    resolved_exporter_name = exporter_name or "otlp"
+    resolved_exporter_name = _canonical_exporter(exporter_name) or "otlp"
     otlp_endpoint = _resolve_otlp_endpoint(resolved_exporter_name)
     service_name = os.environ.get("EZTRACE_SERVICE_NAME") or (Setup.get_project() if Setup.is_setup_done() else "PyEzTrace")
 
@@ -494,6 +607,8 @@ def enable_from_env() -> bool:
                     once_key=f"exporter-fatal:{_state.error}",
                 )
                 _state.enabled = False
+                _state.active_tracer = None
+                _state.noop = not _otel_debug_enabled()
                 return False
 
         processor = BatchSpanProcessor(_DiagnosticSpanExporter(exporter))
@@ -504,6 +619,7 @@ def enable_from_env() -> bool:
         _state.span_processor = processor
         _state.exporter = exporter
         _state.tracer = ot_trace.get_tracer("pyeztrace")
+        _state.active_tracer = _state.tracer
         _state.initialized = True
         _emit_diagnostic(
             f"OTEL enabled. service.name={service_name} exporter={type(exporter).__name__}",
@@ -520,17 +636,19 @@ def enable_from_env() -> bool:
         )
         _state.enabled = False
         _state.initialized = False
+        _state.active_tracer = None
+        _state.noop = not _otel_debug_enabled()
         return False
 
 
 def is_enabled() -> bool:
-    if not _state.initialized:
+    if not _state.resolved:
         enable_from_env()
     return _state.enabled and _state.tracer is not None
 
 
 def get_tracer():
-    if not _state.initialized:
+    if not _state.resolved:
         enable_from_env()
     return _state.tracer
 
@@ -548,72 +666,120 @@ def get_otel_status() -> Dict[str, Any]:
     }
 
 
-@contextmanager
-def start_span(name: str, attributes: Optional[Dict[str, Any]] = None):
+class _NoopSpanContext:
+    """Reusable no-op context manager returned by start_span() when OTEL is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpanContext()
+_EMPTY_ATTRIBUTES: Dict[str, Any] = {}
+
+
+class _SpanContext:
     """
-    Context manager that starts an OTEL span if enabled, else no-op.
-    Safe to use in sync or async functions (regular 'with' works in async).
+    Context manager around the OTEL tracer's span context manager.
+    Failures to create, enter or close the span are reported as diagnostics
+    and never propagate into traced code.
     """
-    if is_enabled():
-        tracer = get_tracer()
-        if attributes is None:
-            attributes = {}
 
+    __slots__ = ("_tracer", "_name", "_attributes", "_inner")
+
+    def __init__(self, tracer, name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+        self._inner = None
+
+    def __enter__(self):
+        name = self._name
         try:
-            span_cm = tracer.start_as_current_span(name, attributes=attributes)
+            inner = self._tracer.start_as_current_span(name, attributes=self._attributes)
         except Exception as e:
             _emit_diagnostic(
                 f"start_span('{name}') degraded to no-op: unable to create span context manager ({e}).",
                 once_key=f"start-span-create-failed:{type(e).__name__}:{e}",
             )
-            yield None
-            return
-
+            return None
         try:
-            span = span_cm.__enter__()
+            span = inner.__enter__()
         except Exception as e:
             _emit_diagnostic(
                 f"start_span('{name}') degraded to no-op: unable to enter span context ({e}).",
                 once_key=f"start-span-enter-failed:{type(e).__name__}:{e}",
             )
-            yield None
-            return
+            return None
+        self._inner = inner
+        return span
 
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        inner = self._inner
+        if inner is None:
+            return False
+        self._inner = None
         try:
-            yield span
-        except Exception:
-            exc_type, exc_value, exc_tb = sys.exc_info()
-            try:
-                span_cm.__exit__(exc_type, exc_value, exc_tb)
-            except Exception as e:
+            inner.__exit__(exc_type, exc_value, exc_tb)
+        except Exception as e:
+            if exc_type is not None:
                 _emit_diagnostic(
-                    f"Error while closing span for '{name}' after exception: {e}",
+                    f"Error while closing span for '{self._name}' after exception: {e}",
                     level="ERROR",
                     once_key=f"start-span-exit-after-error:{type(e).__name__}:{e}",
                 )
-            raise
-        else:
-            try:
-                span_cm.__exit__(None, None, None)
-            except Exception as e:
+            else:
                 _emit_diagnostic(
-                    f"Error while closing span for '{name}': {e}",
+                    f"Error while closing span for '{self._name}': {e}",
                     level="ERROR",
                     once_key=f"start-span-exit:{type(e).__name__}:{e}",
                 )
+        # Never swallow the traced code's exception.
+        return False
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """
+    Return a context manager that starts an OTEL span if enabled, else a no-op.
+    Safe to use in sync or async functions (regular 'with' works in async).
+    """
+    state = _state
+    tracer = state.active_tracer
+    if tracer is None and not state.resolved:
+        enable_from_env()
+        tracer = state.active_tracer
+    if tracer is not None:
+        return _SpanContext(tracer, name, attributes or _EMPTY_ATTRIBUTES)
+    if state.noop:
+        return _NOOP_SPAN
+    if state.error:
+        _emit_diagnostic(
+            f"start_span('{name}') is no-op because OTEL failed to initialize: {state.error}",
+            once_key=f"start-span-init-error:{state.error}",
+        )
     else:
-        if _state.error:
-            _emit_diagnostic(
-                f"start_span('{name}') is no-op because OTEL failed to initialize: {_state.error}",
-                once_key=f"start-span-init-error:{_state.error}",
-            )
-        else:
-            _emit_diagnostic(
-                f"start_span('{name}') is no-op because OTEL is disabled.",
-                once_key=f"start-span-disabled:{name}",
-                debug_only=True,
-            )
-        yield None
+        _emit_diagnostic(
+            f"start_span('{name}') is no-op because OTEL is disabled.",
+            once_key=f"start-span-disabled:{name}",
+            debug_only=True,
+        )
+    return _NOOP_SPAN
+
+
+_STATUS_TYPES = None
+
+
+def _status_types():
+    """Return (Status, StatusCode), importing them on first use only."""
+    global _STATUS_TYPES
+    if _STATUS_TYPES is None:
+        from opentelemetry.trace.status import Status, StatusCode
+        _STATUS_TYPES = (Status, StatusCode)
+    return _STATUS_TYPES
 
 
 def record_exception(span, exc: BaseException):
@@ -621,7 +787,7 @@ def record_exception(span, exc: BaseException):
         if span is None:
             return
         # Record exception and mark status as error
-        from opentelemetry.trace.status import Status, StatusCode
+        Status, StatusCode = _status_types()
         try:
             span.record_exception(exc)
         except Exception:
@@ -636,33 +802,138 @@ def record_exception(span, exc: BaseException):
 
 def _reset_diagnostics_state_for_tests():
     _DIAGNOSTIC_ONCE_KEYS.clear()
+    clear_env_cache()
+    _reset_gcp_caches_for_tests()
 
 
 # -----------------
 # Custom Exporters
 # -----------------
 
+def _dumps_compact(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _env_int(key: str, default: int, lo: int, hi: int) -> int:
+    raw = os.environ.get(key)
+    if raw is None:
+        return default
+    try:
+        return min(max(int(raw.strip()), lo), hi)
+    except ValueError:
+        return default
+
+
 class _BaseJsonBatchExporter:
-    """Utility for exporting batches of spans as JSON-Lines, optionally gzipped."""
+    """
+    Utility for exporting batches of spans as JSON-Lines, optionally gzipped.
+
+    Uploads run on a small thread pool so the BatchSpanProcessor worker only
+    pays for serialization. When every worker slot is busy the upload runs
+    inline, which applies backpressure instead of queueing without bound.
+    Set EZTRACE_EXPORT_WORKERS=0 to upload synchronously.
+    """
     def __init__(self):
         self.compress = _env_bool("EZTRACE_COMPRESS", True)
+        self.compress_level = _env_int("EZTRACE_GZIP_LEVEL", 1, 0, 9)
+        self.upload_workers = _env_int("EZTRACE_EXPORT_WORKERS", 4, 0, 32)
+        self._executor = None
+        self._shutdown = False
+        self._inflight = set()
+        self._inflight_lock = threading.Lock()
+
+    def _upload(self, name: str, body: bytes) -> None:
+        raise NotImplementedError
+
+    def _submit_upload(self, name: str, body: bytes) -> None:
+        if self.upload_workers <= 0:
+            self._upload(name, body)
+            return
+        with self._inflight_lock:
+            # Once shut down, no pool is (re)created: upload on the caller.
+            saturated = self._shutdown or len(self._inflight) >= self.upload_workers * 2
+            if not saturated:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.upload_workers,
+                        thread_name_prefix="pyeztrace-export",
+                    )
+                future = self._executor.submit(self._upload, name, body)
+                self._inflight.add(future)
+        if saturated:
+            self._upload(name, body)
+            return
+        future.add_done_callback(self._upload_done)
+
+    def _upload_done(self, future) -> None:
+        with self._inflight_lock:
+            self._inflight.discard(future)
+        exc = future.exception()
+        if exc is not None:
+            _state.error = f"Span export failed: {exc}"
+            _emit_diagnostic(
+                f"Span export failed at runtime: {exc}",
+                level="ERROR",
+                once_key=f"export-exc:{type(exc).__name__}:{exc}",
+            )
 
-    def _serialize(self, spans: Iterable[Any]) -> bytes:
-        lines = []
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        from concurrent.futures import wait
+        with self._inflight_lock:
+            pending = list(self._inflight)
+        if not pending:
+            return True
+        _done, not_done = wait(pending, timeout=timeout_millis / 1000.0)
+        return not not_done
+
+    def shutdown(self):
+        with self._inflight_lock:
+            self._shutdown = True
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        return True
+
+    def _result_success(self):
+        try:
+            from opentelemetry.sdk.trace.export import SpanExportResult
+            return SpanExportResult.SUCCESS
+        except Exception:
+            return 0
+
+    def _iter_lines(self, spans: Iterable[Any]):
         for sp in spans:
             try:
-                data = _span_to_dict(sp)
-                lines.append(json.dumps(data, separators=(",", ":")))
+                yield _dumps_compact(_span_to_dict(sp))
             except Exception:
                 # Best-effort: fallback minimal representation
                 try:
-                    lines.append(json.dumps({"name": getattr(sp, "name", "span")}))
+                    yield _dumps_compact({"name": getattr(sp, "name", "span")})
                 except Exception:
                     pass
-        payload = ("\n".join(lines)).encode("utf-8")
-        if self.compress:
-            return gzip.compress(payload)
-        return payload
+
+    def _serialize(self, spans: Iterable[Any]) -> bytes:
+        if not self.compress:
+            return b"\n".join(self._iter_lines(spans))
+        # Stream lines straight into the compressor so the uncompressed batch
+        # is never held in memory as a whole.
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=self.compress_level) as gz:
+            first = True
+            for line in self._iter_lines(spans):
+                if not first:
+                    gz.write(b"\n")
+                gz.write(line)
+                first = False
+        return buf.getvalue()
 
     def _object_name(self, prefix: str) -> str:
         ts = time.strftime("%Y/%m/%d/%H/%M/%S", time.gmtime())
@@ -683,26 +954,17 @@ class _S3SpanExporter(_BaseJsonBatchExporter):
         session = boto3.session.Session(region_name=region) if region else boto3.session.Session()
         self.client = session.client("s3")
 
+    def _upload(self, name: str, body: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=name, Body=body, ContentType="application/json")
+
     def export(self, spans: Iterable[Any]):
-        body = self._serialize(spans)
-        key = self._object_name(self.prefix)
-        self.client.put_object(Bucket=self.bucket, Key=key, Body=body, ContentType="application/json")
+        self._submit_upload(self._object_name(self.prefix), self._serialize(spans))
         return self._result_success()
 
-    def shutdown(self):
-        return True
-
     # OpenTelemetry SpanExporter API compatibility shim
     def __call__(self, *args, **kwargs):  # pragma: no cover
         return self
 
-    def _result_success(self):
-        try:
-            from opentelemetry.sdk.trace.export import SpanExportResult
-            return SpanExportResult.SUCCESS
-        except Exception:
-            return 0
-
 
 class _AzureBlobSpanExporter(_BaseJsonBatchExporter):
     def __init__(self):
@@ -727,18 +989,9 @@ class _AzureBlobSpanExporter(_BaseJsonBatchExporter):
         except Exception:
             pass
 
+    def _upload(self, name: str, body: bytes) -> None:
+        self.container_client.upload_blob(name=name, data=body, overwrite=False, content_type="application/json")
+
     def export(self, spans: Iterable[Any]):
-        body = self._serialize(spans)
-        blob_name = self._object_name(self.prefix)
-        self.container_client.upload_blob(name=blob_name, data=body, overwrite=False, content_type="application/json")
+        self._submit_upload(self._object_name(self.prefix), self._serialize(spans))
         return self._result_success()
-
-    def shutdown(self):
-        return True
-
-    def _result_success(self):
-        try:
-            from opentelemetry.sdk.trace.export import SpanExportResult
-            return SpanExportResult.SUCCESS
-        except Exception:
-            return 0
@@ -1,33 +1,93 @@
+import sys
 import threading
-import asyncio
+import warnings
+from collections import deque
 import contextvars
 from typing import Optional
 from pyeztrace import exceptions
 from pyeztrace.config import config
 
 
+# initialize() keyword -> LogConfig attribute it overrides.
+_CONFIG_OVERRIDE_ATTRS = {
+    "log_format": "format",
+    "console_format": "console_format",
+    "file_format": "file_format",
+    "log_level": "log_level",
+    "log_file": "log_file",
+    "log_dir": "log_dir",
+    "max_size": "max_size",
+    "backup_count": "backup_count",
+    "buffer_enabled": "buffer_enabled",
+    "buffer_flush_interval": "buffer_flush_interval",
+}
+
+# Hot-path state lives in module globals so readers pay a single global load
+# instead of a class attribute lookup; Setup remains the public interface.
+# One ContextVar serves threads and asyncio tasks alike: each thread starts
+# from its own context and each task runs in a copy of its creator's.
+_LEVEL = contextvars.ContextVar("eztrace_level", default=0)
+_SETUP_DONE = False
+_PROJECT: Optional[str] = None
+
+
+def is_setup_done() -> bool:
+    # A single global read is atomic; writers hold Setup's config lock.
+    return _SETUP_DONE
+
+
+def get_project() -> Optional[str]:
+    # Published once per initialize/set_project; a plain read needs no lock.
+    return _PROJECT
+
+
+def get_level() -> int:
+    return _LEVEL.get()
+
+
+def increment_level():
+    """Increase the call depth; pass the returned token to decrement_level()."""
+    return _LEVEL.set(_LEVEL.get() + 1)
+
+
+def decrement_level(token=None) -> None:
+    """Restore the call depth, by token when available, else by subtracting one."""
+    if token is not None:
+        try:
+            _LEVEL.reset(token)
+            return
+        except (ValueError, RuntimeError):
+            # Token from another context, or already used: fall back.
+            pass
+    _LEVEL.set(_LEVEL.get() - 1)
+
+
+def _warn_async_deprecated(name: str, replacement: str) -> None:
+    warnings.warn(
+        f"Setup.{name}() is deprecated; call Setup.{replacement}() instead.",
+        DeprecationWarning,
+        stacklevel=3,
+    )
+
+
 class Setup:
     """
     A class to manage the setup state of the application (thread-safe and asyncio-safe).
+
+    Writers (initialize, set_project, reset, setters) take a lock; readers on
+    the per-trace-call path never do.
     """
-    __project = None
-    __setup_done = False
-    __thread_level = threading.local()
-    __async_level = contextvars.ContextVar("async_level", default=0)
     __show_metrics = False
     __disable_file_logging = None
-    __lock = threading.Lock()
-    __async_lock = asyncio.Lock()
+    # Init-time configuration (setup flag, project, metrics/file-logging flags).
+    __config_lock = threading.Lock()
+    # Testing mode flag and captured logs, so log capture never contends with config reads.
+    __logs_lock = threading.Lock()
     __metrics_registered = False
+    __metrics_lock = threading.Lock()
     __testing_mode = False
-
-    @classmethod
-    def _in_async_task(cls) -> bool:
-        """Return True when called from within an active asyncio Task."""
-        try:
-            return asyncio.current_task() is not None
-        except RuntimeError:
-            return False
+    # Always present so the capture path never needs hasattr().
+    _captured_logs = deque()
 
     # Methods for testing
     @classmethod
@@ -38,83 +98,56 @@ class Setup:
         - Log messages are captured for inspection
         - No side effects to real application monitoring
         """
-        with cls.__lock:
+        with cls.__logs_lock:
+            cls._captured_logs.clear()
             cls.__testing_mode = True
-            cls._captured_logs = []
 
     @classmethod
     def disable_testing_mode(cls):
         """Disable testing mode."""
-        with cls.__lock:
+        with cls.__logs_lock:
             cls.__testing_mode = False
-            if hasattr(cls, '_captured_logs'):
-                delattr(cls, '_captured_logs')
+            cls._captured_logs.clear()
 
     @classmethod
     def is_testing_mode(cls):
         """Check if testing mode is enabled."""
-        with cls.__lock:
-            return cls.__testing_mode
+        return cls.__testing_mode
 
     @classmethod
     def get_captured_logs(cls):
         """Get logs captured in testing mode."""
-        with cls.__lock:
+        with cls.__logs_lock:
             if not cls.__testing_mode:
                 raise exceptions.SetupError("Not in testing mode. No logs captured.")
-            return cls._captured_logs.copy() if hasattr(cls, '_captured_logs') else []
+            return list(cls._captured_logs)
 
     @classmethod
     def capture_log(cls, log_entry):
         """Capture a log entry in testing mode."""
-        with cls.__lock:
-            if cls.__testing_mode and hasattr(cls, '_captured_logs'):
+        # Production fast path: a plain flag read, no lock and no attribute probing.
+        if not cls.__testing_mode:
+            return
+        # Re-check under the lock so an entry cannot land after a concurrent
+        # enable/disable has cleared the buffer for the next session.
+        with cls.__logs_lock:
+            if cls.__testing_mode:
                 cls._captured_logs.append(log_entry)
 
     @classmethod
     def clear_captured_logs(cls):
         """Clear captured logs in testing mode."""
-        with cls.__lock:
-            if cls.__testing_mode and hasattr(cls, '_captured_logs'):
+        with cls.__logs_lock:
+            if cls.__testing_mode:
                 cls._captured_logs.clear()
 
     # Synchronous methods (thread-safe)
     @classmethod
-    def _apply_runtime_config_overrides(
-        cls,
-        *,
-        log_format: Optional[str] = None,
-        console_format: Optional[str] = None,
-        file_format: Optional[str] = None,
-        log_level: Optional[str] = None,
-        log_file: Optional[str] = None,
-        log_dir: Optional[str] = None,
-        max_size: Optional[int] = None,
-        backup_count: Optional[int] = None,
-        buffer_enabled: Optional[bool] = None,
-        buffer_flush_interval: Optional[float] = None,
-    ) -> None:
-        """Apply explicit config overrides before logger initialization."""
-        if log_format is not None:
-            config.format = log_format
-        if console_format is not None:
-            config.console_format = console_format
-        if file_format is not None:
-            config.file_format = file_format
-        if log_level is not None:
-            config.log_level = log_level
-        if log_file is not None:
-            config.log_file = log_file
-        if log_dir is not None:
-            config.log_dir = log_dir
-        if max_size is not None:
-            config.max_size = max_size
-        if backup_count is not None:
-            config.backup_count = backup_count
-        if buffer_enabled is not None:
-            config.buffer_enabled = buffer_enabled
-        if buffer_flush_interval is not None:
-            config.buffer_flush_interval = buffer_flush_interval
+    def _apply_runtime_config_overrides(cls, **overrides) -> None:
+        """Apply explicit (non-None) config overrides before logger initialization."""
+        for key, value in overrides.items():
+            if value is not None:
+                setattr(config, _CONFIG_OVERRIDE_ATTRS[key], value)
 
     @classmethod
     def initialize(
@@ -134,12 +167,17 @@ class Setup:
         buffer_enabled: Optional[bool] = None,
         buffer_flush_interval: Optional[float] = None,
     ):
-        with cls.__lock:
-            if cls.__setup_done:
+        global _SETUP_DONE, _PROJECT
+        # Double-checked: a plain read rejects repeat calls without locking,
+        # the locked re-check keeps "initialized exactly once" under races.
+        if _SETUP_DONE:
+            raise exceptions.SetupAlreadyDoneError("Setup is already done.")
+        with cls.__config_lock:
+            if _SETUP_DONE:
                 raise exceptions.SetupAlreadyDoneError("Setup is already done.")
-            cls.__setup_done = True
-            cls.__thread_level.value = 0
-            cls.__project = project.upper()
+            _SETUP_DONE = True
+            _LEVEL.set(0)
+            _PROJECT = sys.intern(project.upper())
             cls.__show_metrics = show_metrics
             cls._apply_runtime_config_overrides(
                 log_format=log_format,
@@ -157,139 +195,113 @@ class Setup:
                 cls.__disable_file_logging = config.disable_file_logging
             else:
                 cls.__disable_file_logging = disable_file_logging
-            if show_metrics:
-                cls._register_metrics_handler()
+        if show_metrics:
+            cls._register_metrics_handler()
 
     @classmethod
     def _register_metrics_handler(cls):
         """Register the atexit handler for metrics if not already registered"""
-        if not cls.__metrics_registered:
-            from pyeztrace.custom_logging import Logging
-            import atexit
+        if cls.__metrics_registered:
+            return
+        # Import outside any lock: custom_logging may call back into Setup.
+        from pyeztrace.custom_logging import Logging
+        import atexit
+        with cls.__metrics_lock:
+            if cls.__metrics_registered:
+                return
             atexit.register(Logging.log_final_metrics_summary)
             cls.__metrics_registered = True
 
-    @classmethod
-    def is_setup_done(cls):
-        with cls.__lock:
-            return cls.__setup_done
+    is_setup_done = staticmethod(is_setup_done)
 
     @classmethod
     def set_setup_done(cls):
-        with cls.__lock:
-            cls.__setup_done = True
-
-    @classmethod
-    def increment_level(cls):
-        with cls.__lock:
-            if cls._in_async_task():
-                current = cls.__async_level.get()
-                cls.__async_level.set(current + 1)
-            else:
-                if not hasattr(cls.__thread_level, "value"):
-                    cls.__thread_level.value = 0
-                cls.__thread_level.value += 1
-
-    @classmethod
-    def decrement_level(cls):
-        with cls.__lock:
-            if cls._in_async_task():
-                current = cls.__async_level.get()
-                cls.__async_level.set(current - 1)
-            else:
-                if not hasattr(cls.__thread_level, "value"):
-                    cls.__thread_level.value = 0
-                cls.__thread_level.value -= 1
+        global _SETUP_DONE
+        with cls.__config_lock:
+            _SETUP_DONE = True
 
-    @classmethod
-    def get_level(cls):
-        with cls.__lock:
-            if cls._in_async_task():
-                return cls.__async_level.get()
-            return getattr(cls.__thread_level, "value", 0)
+    # Level and project readers are the module functions themselves (no extra
+    # call layer); the level ContextVar needs no lock.
+    increment_level = staticmethod(increment_level)
+    decrement_level = staticmethod(decrement_level)
+    get_level = staticmethod(get_level)
+    get_project = staticmethod(get_project)
 
-    @classmethod
-    def get_project(cls):
-        with cls.__lock:
-            return cls.__project
-
-    # Async methods (asyncio-safe)
+    # Async methods (deprecated)
+    # Thin awaitable wrappers kept for backwards compatibility. The state they
+    # touch is per-task (ContextVar) or lock-free to read, so the sync methods
+    # are equally safe from coroutines and avoid an extra await.
     @classmethod
     async def async_initialize(cls, project="eztracer"):
-        async with cls.__async_lock:
-            with cls.__lock:
-                if cls.__setup_done:
-                    raise exceptions.SetupAlreadyDoneError("Setup is already done.")
-                cls.__setup_done = True
-                cls.__async_level.set(0)
-                cls.__project = project.upper()
+        global _SETUP_DONE, _PROJECT
+        _warn_async_deprecated("async_initialize", "initialize")
+        if _SETUP_DONE:
+            raise exceptions.SetupAlreadyDoneError("Setup is already done.")
+        with cls.__config_lock:
+            if _SETUP_DONE:
+                raise exceptions.SetupAlreadyDoneError("Setup is already done.")
+            _SETUP_DONE = True
+            _LEVEL.set(0)
+            _PROJECT = sys.intern(project.upper())
 
     @classmethod
     async def async_is_setup_done(cls):
-        async with cls.__async_lock:
-            with cls.__lock:
-                return cls.__setup_done
+        _warn_async_deprecated("async_is_setup_done", "is_setup_done")
+        return cls.is_setup_done()
 
     @classmethod
     async def async_set_setup_done(cls):
-        async with cls.__async_lock:
-            with cls.__lock:
-                cls.__setup_done = True
+        _warn_async_deprecated("async_set_setup_done", "set_setup_done")
+        cls.set_setup_done()
 
     @classmethod
     async def async_increment_level(cls):
-        async with cls.__async_lock:
-            with cls.__lock:
-                current = cls.__async_level.get()
-                cls.__async_level.set(current + 1)
+        _warn_async_deprecated("async_increment_level", "increment_level")
+        cls.increment_level()
 
     @classmethod
     async def async_decrement_level(cls):
-        async with cls.__async_lock:
-            with cls.__lock:
-                current = cls.__async_level.get()
-                cls.__async_level.set(current - 1)
+        _warn_async_deprecated("async_decrement_level", "decrement_level")
+        cls.decrement_level()
 
     @classmethod
     async def async_get_level(cls):
-        async with cls.__async_lock:
-            with cls.__lock:
-                return cls.__async_level.get()
+        _warn_async_deprecated("async_get_level", "get_level")
+        return cls.get_level()
 
     @classmethod
     async def async_get_project(cls):
-        async with cls.__async_lock:
-            with cls.__lock:
-                return cls.__project
-        
+        _warn_async_deprecated("async_get_project", "get_project")
+        return cls.get_project()
+
     @classmethod
     def set_show_metrics(cls, show_metrics: bool):
         """
         Set whether to show metrics or not.
         """
-        with cls.__lock:
+        with cls.__config_lock:
             cls.__show_metrics = show_metrics
-            if show_metrics:
-                cls._register_metrics_handler()
+        if show_metrics:
+            cls._register_metrics_handler()
 
     @classmethod
     def get_show_metrics(cls) -> bool:
         """
         Get whether to show metrics or not.
         """
-        with cls.__lock:
-            return cls.__show_metrics
+        # Single attribute read; writers hold the config lock.
+        return cls.__show_metrics
 
     @classmethod
     def reset(cls):
         """Reset all class variables to their initial state. Used primarily for testing."""
-        with cls.__lock:
-            cls.__project = None
-            cls.__setup_done = False
-            cls.__thread_level.value = 0
+        global _SETUP_DONE, _PROJECT
+        with cls.__config_lock:
+            _PROJECT = None
+            _SETUP_DONE = False
             cls.__show_metrics = False
             cls.__disable_file_logging = None
-        cls.__async_level.set(0)
+        _LEVEL.set(0)
 
     @classmethod
     def set_project(cls, project: str) -> None:
@@ -298,19 +310,22 @@ class Setup:
         Args:
             project: The new project name
         """
-        with cls.__lock:
-            if not cls.__setup_done:
+        global _PROJECT
+        with cls.__config_lock:
+            if not _SETUP_DONE:
                 raise exceptions.SetupNotDoneError("Setup must be done before setting project name.")
-            cls.__project = project.upper()
+            _PROJECT = sys.intern(project.upper())
 
     @classmethod
     def get_disable_file_logging(cls) -> bool:
-        with cls.__lock:
-            if cls.__disable_file_logging is None:
-                return config.disable_file_logging
-            return cls.__disable_file_logging
+        # Resolved once by initialize()/set_disable_file_logging(); None only
+        # before setup, where the live config value still applies.
+        value = cls.__disable_file_logging
+        if value is None:
+            return config.disable_file_logging
+        return value
 
     @classmethod
     def set_disable_file_logging(cls, disable: bool) -> None:
-        with cls.__lock:
+        with cls.__config_lock:
             cls.__disable_file_logging = disable
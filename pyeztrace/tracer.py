@@ -627,13 +627,20 @@ def _finalize_sampling_scope(
         if token is not None:
             _active_sampling.reset(token)
 
+class _PatchRefLocal(threading.local):
+    """Per-thread patch reference counts; __init__ runs once in each thread."""
+
+    def __init__(self) -> None:
+        self.ref: Dict[int, int] = {}
+
+
 class trace_children_in_module:
     """
     Context manager to monkey-patch all functions in a module (or class) with a child-tracing decorator.
     Robust for concurrent tracing: uses per-thread and per-coroutine reference counting and locking.
     Only active when tracing_active is True.
     """
-    _thread_local = threading.local()
+    _thread_local = _PatchRefLocal()
     _coroutine_local = contextvars.ContextVar("trace_patch_ref", default=None)
 
     def __init__(self, module_or_class: Any, child_decorator: Callable[[Callable[..., Any]], Callable[..., Any]]) -> None:
@@ -656,8 +663,6 @@ class trace_children_in_module:
         except Exception:
             pass
         # Fallback to thread-local
-        if not hasattr(trace_children_in_module._thread_local, "ref"):
-            trace_children_in_module._thread_local.ref = {}
         return trace_children_in_module._thread_local.ref
 
     def __enter__(self) -> None:
@@ -761,7 +766,7 @@ def child_trace_decorator(func: F) -> F:
             stack_token = _call_stack_ids.set(new_stack)
             
             # Normal tracing logic
-            Setup.increment_level()
+            level_token = Setup.increment_level()
             redaction = _resolve_redaction(None)
             previews = _preview_args_kwargs(args, kwargs, redaction=redaction)
             start_ts = time.time()
@@ -827,7 +832,7 @@ def child_trace_decorator(func: F) -> F:
                     setattr(e, "_eztrace_logged", True)
                     raise
                 finally:
-                    Setup.decrement_level()
+                    Setup.decrement_level(level_token)
                     _currently_tracing.reset(token)
                     try:
                         _call_stack_ids.reset(stack_token)
@@ -866,7 +871,7 @@ def child_trace_decorator(func: F) -> F:
             stack_token = _call_stack_ids.set(new_stack)
             
             # Normal tracing logic
-            Setup.increment_level()
+            level_token = Setup.increment_level()
             redaction = _resolve_redaction(None)
             previews = _preview_args_kwargs(args, kwargs, redaction=redaction)
             start_ts = time.time()
@@ -932,7 +937,7 @@ def child_trace_decorator(func: F) -> F:
                     setattr(e, "_eztrace_logged", True)
                     raise
                 finally:
-                    Setup.decrement_level()
+                    Setup.decrement_level(level_token)
                     _currently_tracing.reset(token)
                     try:
                         _call_stack_ids.reset(stack_token)
@@ -1167,6 +1172,7 @@ def trace(
             async def async_wrapper(*args, **kwargs):
                 redaction_token = None
                 token = None
+                level_token = None
                 tracing_token = None
                 stack_token = None
                 sampling_state = None
@@ -1187,7 +1193,7 @@ def trace(
                     redaction_to_use = _resolve_redaction(configured_redaction)
                     redaction_token = _active_redaction.set(redaction_to_use)
                     token = tracing_active.set(True)
-                    Setup.increment_level()
+                    level_token = Setup.increment_level()
                     
                     # Get the function ID
                     func_id = id(func)
@@ -1317,7 +1323,7 @@ def trace(
                 finally:
                     try:
                         if token is not None:
-                            Setup.decrement_level()
+                            Setup.decrement_level(level_token)
                             tracing_active.reset(token)
                         if redaction_token is not None:
                             _active_redaction.reset(redaction_token)
@@ -1344,6 +1350,7 @@ def trace(
             def wrapper(*args, **kwargs):
                 redaction_token = None
                 token = None
+                level_token = None
                 tracing_token = None
                 stack_token = None
                 sampling_state = None
@@ -1364,7 +1371,7 @@ def trace(
                     redaction_to_use = _resolve_redaction(configured_redaction)
                     redaction_token = _active_redaction.set(redaction_to_use)
                     token = tracing_active.set(True)
-                    Setup.increment_level()
+                    level_token = Setup.increment_level()
                     
                     # Get the function ID
                     func_id = id(func)
@@ -1493,7 +1500,7 @@ def trace(
                 finally:
                     try:
                         if token is not None:
-                            Setup.decrement_level()
+                            Setup.decrement_level(level_token)
                             tracing_active.reset(token)
                         if redaction_token is not None:
                             _active_redaction.reset(redaction_token)
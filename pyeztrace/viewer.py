@@ -1,10 +1,232 @@
+import gzip
+import hashlib
 import json
+import mmap
+import sys
 import threading
+from functools import lru_cache
 from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import time
+from collections import deque
+try:
+    import orjson  # Optional fast JSON codec for log parsing and API responses
+except Exception:
+    orjson = None  # type: ignore
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """Serialize an API response straight to UTF-8 JSON bytes.
+
+    orjson produces bytes directly; the stdlib fallback skips ASCII escaping,
+    so either way there is a single encode per response.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. integers beyond 64 bits read back from a log line
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _intern(value: Any) -> Any:
+    """Intern low-cardinality strings so long traces share one copy of each."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@lru_cache(maxsize=8192)
+def _parse_timestamp(timestamp_str: str) -> float:
+    """Epoch seconds for a log timestamp; raises ValueError on a malformed one.
+
+    Trace logs repeat the same second many times over, so the strptime/mktime
+    round-trip is cached. Failures raise and are therefore never cached.
+    """
+    # Format: YYYY-MM-DDTHH:MM:SS
+    return time.mktime(time.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S"))
+
+
+# Without orjson, /api/tree is streamed as it is encoded instead of being built into one buffer.
+_STREAM_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_STREAM_CHUNK_CHARS = 64 * 1024
+# Size of the raw-entry window returned by /api/entries.
+_RECENT_ENTRIES = 1000
+# How often the refresher stats the log and sidecar. An unchanged
+# (mtime_ns, size) pair costs two stat() calls and no JSON work, so a short
+# interval gives sub-second freshness without any file-watching dependency.
+_WATCH_INTERVAL_S = 0.25
+
+
+class _Node:
+    """One traced call; slots keep the persistent node map compact."""
+
+    __slots__ = (
+        'call_id', 'parent_id', 'function', 'fn_type', 'start_time', 'end_time',
+        'duration', 'cpu_time', 'mem_peak_kb', 'mem_rss_kb', 'mem_delta_kb',
+        'mem_mode', 'args_preview', 'kwargs_preview', 'result_preview', 'status',
+        'level', 'project', 'error', 'has_error',
+    )
+
+    # Serialized in this order; 'error' is appended only for nodes that errored.
+    _FIELDS = __slots__[:18]
+
+    def __init__(self, call_id: str, parent_id: Optional[str] = None) -> None:
+        self.call_id = call_id
+        self.parent_id = parent_id
+        self.function = None
+        self.fn_type = None
+        self.start_time = None
+        self.end_time = None
+        self.duration = None
+        self.cpu_time = None
+        self.mem_peak_kb = None
+        self.mem_rss_kb = None
+        self.mem_delta_kb = None
+        self.mem_mode = None
+        self.args_preview = None
+        self.kwargs_preview = None
+        self.result_preview = None
+        self.status = None
+        self.level = None
+        self.project = None
+        self.error = None
+        self.has_error = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {k: getattr(self, k) for k in self._FIELDS}
+        if self.has_error:
+            out['error'] = self.error
+        return out
+
+
+def _to_epoch(timestamp_str: str) -> float:
+    try:
+        return _parse_timestamp(timestamp_str)
+    except Exception:
+        return time.time()
+
+
+def _ensure_node(
+    nodes: Dict[str, _Node],
+    roots: Dict[str, None],
+    cid: str,
+    parent_id: Optional[str] = None,
+) -> _Node:
+    node = nodes.get(cid)
+    if node is None:
+        node = nodes[cid] = _Node(cid, parent_id)
+        if not parent_id:
+            roots[cid] = None
+    elif parent_id and node.parent_id is None:
+        node.parent_id = parent_id
+    return node
+
+
+def _apply_entry(
+    e: Dict[str, Any],
+    nodes: Dict[str, _Node],
+    children_of: Dict[str, Dict[str, None]],
+    roots: Dict[str, None],
+    log_metrics: List[Dict[str, Any]],
+) -> None:
+    """Fold one log entry into the persistent tree state.
+
+    This is the per-line hot path, kept as a plain annotated module function
+    (no closures, no attribute lookups on the builder) so it stays cheap to
+    call and can be compiled ahead of time with mypyc or Cython unchanged.
+    """
+    data = e.get('data') or {}
+    call_id = data.get('call_id')
+    parent_id = data.get('parent_id')
+    event = data.get('event')  # 'start' | 'end' | 'error' | None
+    status = _intern(data.get('status'))
+
+    if event == 'metrics_summary':
+        log_metrics.append({
+            'timestamp': e.get('timestamp'),
+            'status': status or e.get('level'),
+            'metrics': data.get('metrics', []),
+            'total_functions': data.get('total_functions'),
+            'total_calls': data.get('total_calls'),
+            'generated_at': data.get('generated_at') or _to_epoch(e.get('timestamp', ''))
+        })
+        return
+
+    if not call_id:
+        # Not a structured trace entry; skip from tree but include as loose log?
+        return
+
+    node = _ensure_node(nodes, roots, call_id, parent_id)
+    # Function names, types, levels and projects repeat across millions of
+    # entries; interned once per node, they share storage across nodes.
+    if not node.function:
+        node.function = _intern(e.get('function') or data.get('function'))
+    if not node.fn_type:
+        node.fn_type = _intern(e.get('fn_type') or data.get('fn_type'))
+    if status is not None:
+        node.status = status
+    if not node.level:
+        node.level = _intern(e.get('level'))
+    if not node.project:
+        node.project = _intern(e.get('project'))
+
+    if parent_id:
+        _ensure_node(nodes, roots, parent_id)
+        siblings = children_of.get(parent_id)
+        if siblings is None:
+            siblings = children_of[parent_id] = {}
+        siblings[call_id] = None
+        roots.pop(call_id, None)
+
+    # Timestamps and metrics
+    applier = _EVENT_APPLIERS.get(event)
+    if applier is not None:
+        applier(node, data, e, status)
+
+
+def _event_time(data: Dict[str, Any], e: Dict[str, Any]) -> float:
+    return data.get('time_epoch') or _to_epoch(e.get('timestamp', ''))
+
+
+def _apply_start(node: _Node, data: Dict[str, Any], e: Dict[str, Any], status: Any) -> None:
+    node.start_time = _event_time(data, e)
+    node.args_preview = data.get('args_preview')
+    node.kwargs_preview = data.get('kwargs_preview')
+    node.status = status or 'running'
+
+
+def _apply_end(node: _Node, data: Dict[str, Any], e: Dict[str, Any], status: Any) -> None:
+    node.end_time = _event_time(data, e)
+    node.duration = e.get('duration')
+    node.cpu_time = data.get('cpu_time')
+    mem_peak_kb = data.get('mem_peak_kb')
+    node.mem_rss_kb = data.get('mem_rss_kb') or mem_peak_kb
+    node.mem_peak_kb = mem_peak_kb
+    node.mem_delta_kb = data.get('mem_delta_kb')
+    node.mem_mode = _intern(data.get('mem_mode')) or node.mem_mode
+    node.result_preview = data.get('result_preview')
+    node.status = status or 'success'
+
+
+def _apply_error(node: _Node, data: Dict[str, Any], e: Dict[str, Any], status: Any) -> None:
+    # Mark node with error info
+    node.error = e.get('message')
+    node.has_error = True
+    node.status = status or 'error'
+    node.end_time = _event_time(data, e)
+
+
+# Trace event -> node updater; one dict lookup replaces the if/elif chain.
+_EVENT_APPLIERS = {
+    'start': _apply_start,
+    'end': _apply_end,
+    'error': _apply_error,
+}
 
 
 class _TraceTreeBuilder:
@@ -17,9 +239,37 @@ class _TraceTreeBuilder:
             self.log_file = Path(str(log_file)).expanduser()
         self._entries_lock = threading.Lock()
         self._cached_entries: List[Dict[str, Any]] = []
+        # Window served by /api/entries, kept current by the ingester.
+        self._last_entries: deque = deque(maxlen=_RECENT_ENTRIES)
+        # Byte offset just past the last complete line read; logs are
+        # append-only, so each poll parses only what was written since. A
+        # trailing partial line is left unread until its newline arrives.
         self._cached_offset = 0
         self._cached_inode: Optional[tuple[int, int]] = None
-        self._cached_remainder = ""
+        # Tree state kept across polls and updated in place by _apply_entry().
+        self._nodes: Dict[str, _Node] = {}
+        # Child ids per node, kept apart so node dicts serialize without filtering.
+        # Each value is a dict used as an ordered set: O(1) duplicate checks
+        # even for parents with very many children.
+        self._children_of: Dict[str, Dict[str, None]] = {}
+        # Ids not (yet) linked under a parent, in first-seen order; a dict
+        # doubles as an insertion-ordered set.
+        self._roots: Dict[str, None] = {}
+        self._log_metrics: List[Dict[str, Any]] = []
+        # build_tree()/sidecar results keyed by (st_mtime_ns, st_size) of their file.
+        self._tree_lock = threading.Lock()
+        self._tree_cache: Optional[Dict[str, Any]] = None
+        self._tree_cache_key: Optional[tuple] = None
+        self._metrics_cache: List[Dict[str, Any]] = []
+        self._metrics_cache_key: Optional[tuple[int, int]] = None
+
+    @staticmethod
+    def _stat_key(path: Path) -> Optional[tuple[int, int]]:
+        try:
+            st = path.stat()
+            return (int(st.st_mtime_ns), int(st.st_size))
+        except Exception:
+            return None
 
     def _stat_inode(self) -> Optional[tuple[int, int]]:
         try:
@@ -31,77 +281,108 @@ class _TraceTreeBuilder:
     def _metrics_file(self) -> Path:
         return Path(str(self.log_file) + ".metrics")
 
-    def _read_lines(self) -> List[str]:
+    def _reset_ingest_state(self) -> None:
+        self._cached_entries = []
+        self._last_entries.clear()
+        self._cached_offset = 0
+        self._nodes = {}
+        self._children_of = {}
+        self._roots = {}
+        self._log_metrics = []
+
+    def _ingest_new(self) -> None:
+        """Parse bytes appended since the last call; caller holds _entries_lock."""
         if not self.log_file.exists():
-            return []
+            self._reset_ingest_state()
+            self._cached_inode = None
+            return
+
+        inode = self._stat_inode()
         try:
-            with self.log_file.open('r', encoding='utf-8', errors='ignore') as f:
-                return f.readlines()
+            size_now = int(self.log_file.stat().st_size)
         except Exception:
-            return []
-
-    def _read_entries_cached(self) -> List[Dict[str, Any]]:
-        with self._entries_lock:
-            if not self.log_file.exists():
-                self._cached_entries = []
-                self._cached_offset = 0
-                self._cached_inode = None
-                self._cached_remainder = ""
-                return []
-
-            inode = self._stat_inode()
-            try:
-                st = self.log_file.stat()
-                size_now = int(st.st_size)
-            except Exception:
-                size_now = 0
+            size_now = 0
 
-            rotated_or_truncated = (
-                self._cached_inode is not None
-                and inode is not None
-                and self._cached_inode != inode
-            ) or size_now < self._cached_offset
+        rotated_or_truncated = (
+            self._cached_inode is not None
+            and inode is not None
+            and self._cached_inode != inode
+        ) or size_now < self._cached_offset
 
-            if rotated_or_truncated:
-                self._cached_entries = []
-                self._cached_offset = 0
-                self._cached_remainder = ""
-
-            self._cached_inode = inode
-
-            try:
-                with self.log_file.open("r", encoding="utf-8", errors="ignore") as f:
-                    if self._cached_offset > 0:
-                        f.seek(self._cached_offset)
-                    chunk = f.read()
-                    self._cached_offset = f.tell()
-            except Exception:
-                return list(self._cached_entries)
+        if rotated_or_truncated:
+            self._reset_ingest_state()
 
-            if not chunk:
-                return list(self._cached_entries)
+        self._cached_inode = inode
 
-            text = self._cached_remainder + chunk
-            lines = text.splitlines(keepends=True)
-            if text and not text.endswith("\n"):
-                self._cached_remainder = lines.pop() if lines else text
-            else:
-                self._cached_remainder = ""
+        if size_now <= self._cached_offset:
+            return
 
-            parsed = self._parse_json_lines(lines)
-            if parsed:
-                self._cached_entries.extend(parsed)
+        try:
+            with self.log_file.open("rb") as f:
+                try:
+                    # Map the file instead of reading it into one bytes object;
+                    # only candidate lines are ever copied out.
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        lines, consumed = self._split_candidate_lines(mm, self._cached_offset)
+                    self._cached_offset += consumed
+                except (OSError, ValueError):
+                    # Not mappable (e.g. some network or special filesystems).
+                    f.seek(self._cached_offset)
+                    lines, consumed = self._split_candidate_lines(f.read(), 0)
+                    self._cached_offset += consumed
+        except Exception:
+            return
+
+        parsed = self._parse_json_lines(lines)
+        if parsed:
+            self._cached_entries.extend(parsed)
+            self._last_entries.extend(parsed)
+            nodes, children_of = self._nodes, self._children_of
+            roots, log_metrics = self._roots, self._log_metrics
+            for entry in parsed:
+                _apply_entry(entry, nodes, children_of, roots, log_metrics)
+
+    @staticmethod
+    def _split_candidate_lines(buf, start: int) -> tuple[List[str], int]:
+        """Decode complete lines of ``buf`` from ``start`` that may be trace entries.
+
+        Returns the decoded lines and the number of bytes consumed, which stops
+        after the last newline so a partial line is re-read on the next poll.
+        """
+        lines: List[str] = []
+        find = buf.find
+        pos = start
+        while True:
+            nl = find(b"\n", pos)
+            if nl < 0:
+                break
+            line = buf[pos:nl].strip()
+            pos = nl + 1
+            # Cheap byte-level guard: lines that cannot be trace entries (blank,
+            # plain-text output, tracebacks) are neither decoded nor parsed.
+            if line[:1] == b"{" and b'"timestamp"' in line and b'"level"' in line:
+                lines.append(line.decode("utf-8", errors="ignore"))
+        return lines, pos - start
+
+    def recent_entries(self) -> List[Dict[str, Any]]:
+        """The most recent raw entries, without copying the full entry list."""
+        with self._entries_lock:
+            self._ingest_new()
+            return list(self._last_entries)
 
+    def _read_entries_cached(self) -> List[Dict[str, Any]]:
+        with self._entries_lock:
+            self._ingest_new()
             return list(self._cached_entries)
 
     def _parse_json_lines(self, lines: List[str]) -> List[Dict[str, Any]]:
         entries = []
         for line in lines:
             s = line.strip()
-            if not s:
+            if not (s[:1] == '{' and '"timestamp"' in s and '"level"' in s):
                 continue
             try:
-                obj = json.loads(s)
+                obj = _loads(s)
                 # Minimal validation
                 if isinstance(obj, dict) and 'timestamp' in obj and 'level' in obj:
                     entries.append(obj)
@@ -112,8 +393,19 @@ class _TraceTreeBuilder:
 
     def _read_metrics_sidecar(self) -> List[Dict[str, Any]]:
         metrics_file = self._metrics_file()
-        if not metrics_file.exists():
+        key = self._stat_key(metrics_file)
+        if key is None:
+            self._metrics_cache_key = None
+            self._metrics_cache = []
             return []
+        if key == self._metrics_cache_key:
+            return self._metrics_cache
+        entries = self._parse_metrics_sidecar(metrics_file)
+        self._metrics_cache = entries
+        self._metrics_cache_key = key
+        return entries
+
+    def _parse_metrics_sidecar(self, metrics_file: Path) -> List[Dict[str, Any]]:
         try:
             lines = metrics_file.read_text(encoding="utf-8", errors="ignore").splitlines()
         except Exception:
@@ -122,10 +414,10 @@ class _TraceTreeBuilder:
         metrics_entries: List[Dict[str, Any]] = []
         for line in lines:
             s = line.strip()
-            if not s:
+            if not (s[:1] == '{' and '"metrics_summary"' in s):
                 continue
             try:
-                obj = json.loads(s)
+                obj = _loads(s)
                 if isinstance(obj, dict) and obj.get("event") == "metrics_summary":
                     metrics_entries.append(obj)
             except Exception:
@@ -133,13 +425,7 @@ class _TraceTreeBuilder:
         return metrics_entries
 
     def _to_epoch(self, timestamp_str: str) -> float:
-        try:
-            # Format: YYYY-MM-DDTHH:MM:SS
-            # Parse conservatively to avoid extra deps
-            struct_time = time.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%S")
-            return time.mktime(struct_time)
-        except Exception:
-            return time.time()
+        return _to_epoch(timestamp_str)
 
     def _safe_json_dumps(self, value: Any) -> str:
         try:
@@ -219,124 +505,162 @@ class _TraceTreeBuilder:
         data = entry.get("data")
         if not isinstance(data, dict):
             data = {}
+        payload_json = self._safe_json_dumps(data)
         return {
             "id": entry_idx,
             "entry": entry,
             "payload": data,
-            "payload_json": self._safe_json_dumps(data),
-            "payload_size": len(self._safe_json_dumps(data)),
+            "payload_json": payload_json,
+            "payload_size": len(payload_json),
         }
 
+    def tree_etag(self) -> Optional[str]:
+        """Weak validator for build_tree() output, from the log and sidecar stat keys."""
+        log_key = self._stat_key(self.log_file)
+        if log_key is None:
+            return None
+        sidecar_key = self._stat_key(self._metrics_file()) or (0, 0)
+        return 'W/"%d-%d-%d-%d"' % (log_key + sidecar_key)
+
     def build_tree(self) -> Dict[str, Any]:
-        entries = self._read_entries_cached()
-        nodes: Dict[str, Dict[str, Any]] = {}
-        metrics_entries_from_log: List[Dict[str, Any]] = []
-        roots: List[str] = []
-
-        def ensure_node(cid: str, parent_id: Optional[str] = None) -> Dict[str, Any]:
-            if cid not in nodes:
-                nodes[cid] = {
-                    'call_id': cid,
-                    'parent_id': parent_id,
-                    'function': None,
-                    'fn_type': None,
-                    'start_time': None,
-                    'end_time': None,
-                    'duration': None,
-                    'cpu_time': None,
-                    'mem_peak_kb': None,
-                    'mem_rss_kb': None,
-                    'mem_delta_kb': None,
-                    'mem_mode': None,
-                    'args_preview': None,
-                    'kwargs_preview': None,
-                    'result_preview': None,
-                    'status': None,
-                    'level': None,
-                    'project': None,
-                    'children': []
-                }
-            node = nodes[cid]
-            if parent_id and node.get('parent_id') is None:
-                node['parent_id'] = parent_id
-            return node
-
-        for e in entries:
-            data = e.get('data') or {}
-            call_id = data.get('call_id')
-            parent_id = data.get('parent_id')
-            event = data.get('event')  # 'start' | 'end' | 'error' | None
-            function = e.get('function') or data.get('function')
-            fn_type = e.get('fn_type') or data.get('fn_type')
-            status = data.get('status')
-
-            if event == 'metrics_summary':
-                metrics_entries_from_log.append({
-                    'timestamp': e.get('timestamp'),
-                    'status': status or e.get('level'),
-                    'metrics': data.get('metrics', []),
-                    'total_functions': data.get('total_functions'),
-                    'total_calls': data.get('total_calls'),
-                    'generated_at': data.get('generated_at') or self._to_epoch(e.get('timestamp', ''))
-                })
-                continue
+        """Return the trace tree, reusing the last result while the log and sidecar are unchanged."""
+        key = (self._stat_key(self.log_file), self._stat_key(self._metrics_file()))
+        with self._tree_lock:
+            if self._tree_cache is not None and key == self._tree_cache_key:
+                result = dict(self._tree_cache)
+                result['generated_at'] = time.time()
+                return result
+            result = self._build_tree_uncached()
+            self._tree_cache = result
+            self._tree_cache_key = key
+            return dict(result)
+
+    def _build_tree_uncached(self) -> Dict[str, Any]:
+        with self._entries_lock:
+            self._ingest_new()
+            return self._materialize_tree()
 
-            if not call_id:
-                # Not a structured trace entry; skip from tree but include as loose log?
-                continue
+    def build_subtree(
+        self,
+        root: Optional[str] = None,
+        depth: int = 2,
+        offset: int = 0,
+        limit: int = 200,
+    ) -> Optional[Dict[str, Any]]:
+        """Materialize ``depth`` levels below ``root`` (or the forest roots).
+
+        Only ``limit`` nodes starting at ``offset`` are returned at the top level,
+        and at most ``limit`` children per node below it. Every node carries
+        ``child_count``; ``has_more`` marks nodes whose children were cut off by
+        the depth or page limit. Returns None when ``root`` is unknown.
+        """
+        with self._entries_lock:
+            self._ingest_new()
+            nodes = self._nodes
+            children_of = self._children_of
+            if root is None:
+                top_ids = list(self._roots)
+            elif root in nodes:
+                top_ids = list(children_of.get(root, ()))
+            else:
+                return None
+
+            def page(ids: List[str], start: int) -> List[Dict[str, Any]]:
+                return [{'_id': cid} for cid in ids[start:start + limit]]
+
+            top = page(top_ids, offset)
+            # Breadth-first, one level at a time, so depth never recurses.
+            level = top
+            for remaining in range(depth, 0, -1):
+                next_level: List[Dict[str, Any]] = []
+                for slot in level:
+                    cid = slot.pop('_id')
+                    kids = list(children_of.get(cid, ()))
+                    slot.update(nodes[cid].to_dict())
+                    slot['child_count'] = len(kids)
+                    if remaining > 1:
+                        slot['children'] = page(kids, 0)
+                        next_level.extend(slot['children'])
+                    else:
+                        slot['children'] = []
+                    slot['has_more'] = len(slot['children']) < len(kids)
+                level = next_level
 
-            node = ensure_node(call_id, parent_id)
-            node.update({
-                'function': node.get('function') or function,
-                'fn_type': node.get('fn_type') or fn_type,
-                'status': status if status is not None else node.get('status'),
-                'level': node.get('level') or e.get('level'),
-                'project': node.get('project') or e.get('project'),
-            })
-
-            if parent_id:
-                parent = ensure_node(parent_id)
-                if call_id not in parent['children']:
-                    parent['children'].append(call_id)
-
-            # Timestamps and metrics
-            if event == 'start':
-                node['start_time'] = data.get('time_epoch') or self._to_epoch(e.get('timestamp', ''))
-                node['args_preview'] = data.get('args_preview')
-                node['kwargs_preview'] = data.get('kwargs_preview')
-                node['status'] = status or 'running'
-            elif event == 'end':
-                node['end_time'] = data.get('time_epoch') or self._to_epoch(e.get('timestamp', ''))
-                node['duration'] = e.get('duration')
-                node['cpu_time'] = data.get('cpu_time')
-                node['mem_rss_kb'] = data.get('mem_rss_kb') or data.get('mem_peak_kb')
-                node['mem_peak_kb'] = data.get('mem_peak_kb')
-                node['mem_delta_kb'] = data.get('mem_delta_kb')
-                node['mem_mode'] = data.get('mem_mode') or node.get('mem_mode')
-                node['result_preview'] = data.get('result_preview')
-                node['status'] = status or 'success'
-            elif event == 'error':
-                # Mark node with error info
-                node['error'] = e.get('message')
-                node['status'] = status or 'error'
-                node['end_time'] = data.get('time_epoch') or self._to_epoch(e.get('timestamp', ''))
-
-        # Determine roots
-        seen_as_child = set()
-        for n in nodes.values():
-            for c in n['children']:
-                seen_as_child.add(c)
-        roots = [cid for cid, n in nodes.items() if not n.get('parent_id') or cid not in seen_as_child]
-
-        # Convert to nested structure
-        def materialize(cid: str) -> Dict[str, Any]:
-            n = nodes[cid]
             return {
-                **{k: v for k, v in n.items() if k != 'children'},
-                'children': [materialize(child) for child in n['children']]
+                'generated_at': time.time(),
+                'log_file': str(self.log_file),
+                'root': root,
+                'offset': offset,
+                'limit': limit,
+                'total': len(top_ids),
+                'total_nodes': len(nodes),
+                'nodes': top,
+            }
+
+    def build_tree_ndjson(self) -> List[bytes]:
+        """The tree as NDJSON lines: one meta record, then nodes parents-first.
+
+        Each node line carries ``tree_parent`` (the node it nests under, or
+        null for a root) so a client can attach it as soon as it is parsed.
+        Lines are serialized under the lock and streamed after it is released.
+        """
+        with self._entries_lock:
+            self._ingest_new()
+            nodes = self._nodes
+            children_of = self._children_of
+            sidecar_metrics = self._read_metrics_sidecar()
+            meta = {
+                'type': 'meta',
+                'generated_at': time.time(),
+                'log_file': str(self.log_file),
+                'total_nodes': len(nodes),
+                'metrics': sidecar_metrics or list(self._log_metrics),
             }
+            lines = [_json_bytes(meta) + b'\n']
+            entered = set()
+            # Pre-order walk: pop in document order, push children reversed.
+            stack: List[tuple] = [(cid, None) for cid in reversed(list(self._roots))]
+            while stack:
+                cid, parent = stack.pop()
+                if cid in entered:
+                    continue
+                entered.add(cid)
+                out = nodes[cid].to_dict()
+                out['tree_parent'] = parent
+                lines.append(_json_bytes(out) + b'\n')
+                kids = children_of.get(cid)
+                if kids:
+                    stack.extend([(child, cid) for child in reversed(list(kids))])
+            return lines
+
+    def _materialize_tree(self) -> Dict[str, Any]:
+        nodes = self._nodes
+        children_of = self._children_of
+
+        roots = list(self._roots)
+
+        # Convert to nested structure with an explicit post-order walk, so deep
+        # call chains cannot hit the recursion limit.
+        built: Dict[str, Dict[str, Any]] = {}
+        entered = set()
+        stack = [(cid, False) for cid in reversed(roots)]
+        while stack:
+            cid, visited = stack.pop()
+            kids = children_of.get(cid, ())
+            if visited:
+                out = nodes[cid].to_dict()
+                out['children'] = [built[c] for c in kids if c in built]
+                built[cid] = out
+                continue
+            if cid in entered:
+                # Already built under another parent, or a parent_id cycle.
+                continue
+            entered.add(cid)
+            stack.append((cid, True))
+            # Visit order does not matter: 'children' follows kids' order.
+            stack.extend([(child, False) for child in kids])
 
-        tree = [materialize(cid) for cid in roots]
+        tree = [built[cid] for cid in roots if cid in built]
 
         sidecar_metrics = self._read_metrics_sidecar()
         metrics_entries: List[Dict[str, Any]] = []
@@ -344,7 +668,7 @@ class _TraceTreeBuilder:
             # Prefer sidecar snapshots; they are derived UI caches and avoid polluting trace logs.
             metrics_entries = sidecar_metrics
         else:
-            metrics_entries = metrics_entries_from_log
+            metrics_entries = list(self._log_metrics)
 
         return {
             'generated_at': time.time(),
@@ -355,8 +679,27 @@ class _TraceTreeBuilder:
         }
 
 
+class _StaticAsset:
+    """A pre-encoded response body with its gzip variant and content-hash ETag."""
+
+    __slots__ = ('body', 'gzipped', 'etag', 'ctype', 'cache_control')
+
+    def __init__(self, text: str, ctype: str, cache_control: str) -> None:
+        self.body = text.encode('utf-8')
+        self.gzipped = gzip.compress(self.body, 6)
+        self.etag = '"%s"' % hashlib.sha256(self.body).hexdigest()[:16]
+        self.ctype = ctype
+        self.cache_control = cache_control
+
+
 class TraceViewerServer:
-    def __init__(self, log_file: Path, host: str = '127.0.0.1', port: int = 8765) -> None:
+    def __init__(
+        self,
+        log_file: Path,
+        host: str = '127.0.0.1',
+        port: int = 8765,
+        refresh_interval: float = _WATCH_INTERVAL_S,
+    ) -> None:
         try:
             self.log_file = log_file.expanduser().resolve(strict=False)
         except Exception:
@@ -365,28 +708,145 @@ class TraceViewerServer:
         self.port = port
         self._builder = _TraceTreeBuilder(self.log_file)
         self._httpd: Optional[ThreadingHTTPServer] = None
+        # Latest (etag, tree). While serving, one refresher thread keeps it
+        # current so concurrent clients never rebuild the tree in parallel.
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[tuple[Optional[str], Dict[str, Any]]] = None
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        # The page and script never change while serving: encode and compress once.
+        # The script URL carries its content hash, so browsers may cache it
+        # indefinitely; the page itself is always revalidated by ETag.
+        self._js_asset = _StaticAsset(
+            self._js_bundle(), 'application/javascript', 'public, max-age=31536000, immutable'
+        )
+        html = self._html_page().replace(
+            'src="/app.js"', 'src="/app.js?v=%s"' % self._js_asset.etag.strip('"')
+        )
+        self._html_asset = _StaticAsset(html, 'text/html; charset=utf-8', 'no-cache')
 
     def _handler_factory(self):
         outer = self
 
         class Handler(BaseHTTPRequestHandler):
-            def _send(self, code: int, body: bytes, ctype: str = 'application/json'):
+            # Chunked transfer encoding requires HTTP/1.1; every other response
+            # carries a Content-Length, so keep-alive stays well-formed.
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, code: int, body: bytes, ctype: str = 'application/json',
+                      headers: Optional[Dict[str, str]] = None):
                 self.send_response(code)
                 self.send_header('Content-Type', ctype)
                 self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
                 self.end_headers()
                 self.wfile.write(body)
 
+            def _send_json(self, code: int, obj: Any, headers: Optional[Dict[str, str]] = None):
+                self._send(code, _json_bytes(obj), 'application/json', headers)
+
+            def _send_chunked(self, code: int, chunks, ctype: str = 'application/json',
+                              headers: Optional[Dict[str, str]] = None):
+                """Stream str or bytes chunks with Transfer-Encoding: chunked."""
+                self.send_response(code)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Transfer-Encoding', 'chunked')
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                write = self.wfile.write
+                # iterencode yields many tiny fragments; coalesce them so each
+                # chunk on the wire is a reasonably sized write.
+                pending: List[Any] = []
+                pending_len = 0
+
+                def flush():
+                    if isinstance(pending[0], bytes):
+                        b = b''.join(pending)
+                    else:
+                        b = ''.join(pending).encode('utf-8')
+                    write(f"{len(b):X}\r\n".encode('ascii') + b + b"\r\n")
+
+                for part in chunks:
+                    pending.append(part)
+                    pending_len += len(part)
+                    if pending_len >= _STREAM_CHUNK_CHARS:
+                        flush()
+                        pending.clear()
+                        pending_len = 0
+                if pending:
+                    flush()
+                write(b"0\r\n\r\n")
+
+            def _send_not_modified(self, etag: str):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+
+            def _send_asset(self, asset: _StaticAsset):
+                headers = {
+                    'ETag': asset.etag,
+                    'Cache-Control': asset.cache_control,
+                    'Vary': 'Accept-Encoding',
+                }
+                if self.headers.get('If-None-Match') == asset.etag:
+                    self.send_response(304)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    return
+                if 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+                    headers['Content-Encoding'] = 'gzip'
+                    self._send(200, asset.gzipped, asset.ctype, headers)
+                else:
+                    self._send(200, asset.body, asset.ctype, headers)
+
             def do_GET(self):  # noqa: N802 (keep stdlib name)
                 parsed = urlparse(self.path)
                 query = parse_qs(parsed.query)
                 if parsed.path == '/':
-                    self._send(200, outer._html_page().encode('utf-8'), 'text/html; charset=utf-8')
+                    self._send_asset(outer._html_asset)
                 elif parsed.path == '/app.js':
-                    self._send(200, outer._js_bundle().encode('utf-8'), 'application/javascript')
+                    self._send_asset(outer._js_asset)
+                elif parsed.path == '/api/tree' and query.keys() & {'root', 'depth', 'offset', 'limit'}:
+                    def int_param(name: str, default: int, lo: int, hi: int) -> int:
+                        try:
+                            value = int((query.get(name) or [default])[0])
+                        except Exception:
+                            value = default
+                        return max(lo, min(value, hi))
+
+                    subtree = outer._builder.build_subtree(
+                        root=(query.get('root') or [None])[0] or None,
+                        depth=int_param('depth', 2, 1, 64),
+                        offset=int_param('offset', 0, 0, 1 << 31),
+                        limit=int_param('limit', 200, 1, 5000),
+                    )
+                    if subtree is None:
+                        self._send(404, b'Not Found', 'text/plain')
+                    else:
+                        self._send_json(200, subtree)
                 elif parsed.path == '/api/tree':
-                    data = outer._builder.build_tree()
-                    self._send(200, json.dumps(data).encode('utf-8'), 'application/json')
+                    etag, data = outer._tree_snapshot()
+                    if etag is not None and self.headers.get('If-None-Match') == etag:
+                        # Log and sidecar unchanged since the client's copy.
+                        self._send_not_modified(etag)
+                        return
+                    headers = {'ETag': etag} if etag is not None else None
+                    if orjson is not None:
+                        # orjson writes bytes directly, with no intermediate str copy.
+                        self._send_json(200, data, headers)
+                    else:
+                        self._send_chunked(200, _STREAM_ENCODER.iterencode(data), 'application/json', headers)
+                elif parsed.path == '/api/tree.ndjson':
+                    etag = outer._builder.tree_etag()
+                    if etag is not None and self.headers.get('If-None-Match') == etag:
+                        self._send_not_modified(etag)
+                        return
+                    headers = {'ETag': etag} if etag is not None else None
+                    self._send_chunked(200, outer._builder.build_tree_ndjson(), 'application/x-ndjson', headers)
                 elif parsed.path == '/api/logs':
                     try:
                         limit = int((query.get('limit') or ['2000'])[0])
@@ -399,7 +859,7 @@ class TraceViewerServer:
                     limit = max(100, min(limit, 10000))
                     preview = max(100, min(preview, 50000))
                     data = outer._builder.build_logs(limit=limit, payload_preview_chars=preview)
-                    self._send(200, json.dumps(data).encode('utf-8'), 'application/json')
+                    self._send_json(200, data)
                 elif parsed.path == '/api/logs/payload':
                     try:
                         entry_id = int((query.get('id') or ['-1'])[0])
@@ -409,11 +869,10 @@ class TraceViewerServer:
                     if payload is None:
                         self._send(404, b'Not Found', 'text/plain')
                     else:
-                        self._send(200, json.dumps(payload).encode('utf-8'), 'application/json')
+                        self._send_json(200, payload)
                 elif parsed.path == '/api/entries':
                     # raw entries for debugging
-                    entries = outer._builder._read_entries_cached()
-                    self._send(200, json.dumps(entries[-1000:]).encode('utf-8'), 'application/json')
+                    self._send_json(200, outer._builder.recent_entries())
                 else:
                     self._send(404, b'Not Found', 'text/plain')
 
@@ -515,15 +974,14 @@ class TraceViewerServer:
     .flame-container { position: relative; width: 100%; min-height: 120px; background: var(--surface-soft); border: 1px solid var(--border); border-radius: 10px; overflow: hidden; }
     .flame-depth-line { position: absolute; left: 0; right: 0; border-top: 1px dashed rgba(156,163,175,0.25); pointer-events: none; }
     .flame-depth-label { position: absolute; left: 6px; font-size: 10px; color: var(--muted); background: rgba(17,24,39,0.8); padding: 1px 4px; border-radius: 4px; pointer-events: none; }
-    .flame-bar { position: absolute; height: 22px; border-radius: 6px; padding: 2px 6px; font-size: 11px; line-height: 18px; color: #0b1220; background: linear-gradient(135deg, rgba(56,189,248,0.9), rgba(14,165,233,0.9)); box-shadow: 0 2px 6px rgba(0,0,0,0.2); overflow: hidden; white-space: nowrap; text-overflow: ellipsis; }
-    .flame-bar.error { background: linear-gradient(135deg, rgba(239,68,68,0.9), rgba(244,114,182,0.9)); }
+    .flame-canvas { position: absolute; left: 0; top: 0; width: 100%; height: 100%; }
     .flame-scale { display: flex; justify-content: space-between; color: var(--muted); font-size: 11px; margin-top: 8px; }
     .issue-table { width: 100%; border-collapse: collapse; }
     .issue-table th, .issue-table td { padding: 10px 12px; border-bottom: 1px solid var(--border); font-size: 12px; text-align: left; }
     .issue-table th { text-transform: uppercase; letter-spacing: 0.06em; color: var(--muted); }
     .split-layout { display: grid; grid-template-columns: minmax(260px, 0.9fr) minmax(320px, 1.1fr) minmax(320px, 1.2fr); gap: 14px; align-items: stretch; }
     .panel { border: 1px solid var(--border); background: var(--surface); border-radius: 12px; padding: 12px; box-shadow: 0 12px 30px rgba(0,0,0,0.25); display: flex; flex-direction: column; min-height: 0; height: clamp(380px, 60vh, 620px); overflow: hidden; }
-    .trace-tree { max-height: none; overflow: auto; padding-right: 4px; min-height: 0; flex: 1; }
+    .trace-tree { position: relative; max-height: none; overflow: auto; padding-right: 4px; min-height: 0; flex: 1; }
     .trace-row { padding: 8px 10px; border-radius: 8px; border: 1px solid transparent; display: flex; align-items: center; gap: 8px; cursor: pointer; }
     .trace-row:hover { background: var(--surface-soft); border-color: var(--border); }
     .trace-row.selected { border-color: rgba(56,189,248,0.6); box-shadow: 0 0 0 2px rgba(56,189,248,0.2); }
@@ -541,6 +999,12 @@ class TraceViewerServer:
     .virtual-spacer { width: 1px; opacity: 0; }
     .virtual-layer { position: absolute; left: 0; right: 0; top: 0; }
     .run-group { height: 34px; display: flex; align-items: center; padding: 0 10px; color: var(--muted); font-size: 11px; text-transform: uppercase; letter-spacing: 0.06em; border-bottom: 1px dashed var(--border); }
+    /* Virtualized row heights; keep in step with the row pitch used by renderRuns() and TRACE_ROW_H. */
+    .run-group.compact { height: 38px; }
+    .run-group.comfy { height: 56px; }
+    .virtual-layer > .run-item.compact { height: 32px; }
+    .virtual-layer > .run-item.comfy { height: 50px; }
+    .virtual-layer > .trace-row { height: 34px; margin-bottom: 4px; }
     .run-item { padding: 8px 10px; border-radius: 8px; border: 1px solid var(--border); background: var(--surface-soft); cursor: pointer; font-size: 12px; display: flex; gap: 8px; align-items: center; }
     .run-item.compact { min-height: 34px; margin: 2px 6px; }
     .run-item.comfy { min-height: 50px; margin: 4px 6px; }
@@ -751,6 +1215,9 @@ class TraceViewerServer:
   const sortModeEl = document.getElementById('sort-mode');
   const togglePayloadsEl = document.getElementById('toggle-payloads');
   const statusFilterGroup = document.getElementById('status-filter');
+  // The chips are static markup: look them up once and track the active one.
+  const chipByFilter = new Map([...statusFilterGroup.querySelectorAll('.chip')].map(c=>[c.dataset.filter, c]));
+  let activeChip = statusFilterGroup.querySelector('.chip.active');
   const autoRefreshEl = document.getElementById('auto-refresh');
   const focusModeEl = document.getElementById('focus-mode');
   const depthLimitEl = document.getElementById('depth-limit');
@@ -759,6 +1226,8 @@ class TraceViewerServer:
   const copyFilteredEl = document.getElementById('copy-filtered');
 
   let tree = [];
+  // Bumped whenever `tree` is replaced; keys the flatten/filter memo caches.
+  let treeVersion = 0;
   let logs = [];
   let logsVersion = 0;
   let total = 0;
@@ -783,9 +1252,18 @@ class TraceViewerServer:
   let depthLimit = 99;
   let slowThresholdMs = 10;
   let visibleTraceNodes = [];
+  // call_id -> node / parent call_id / root call_id, rebuilt once per tree.
   let traceMap = new Map();
+  let parentMap = new Map();
   let callToRunMap = new Map();
+  let runRanges = new Map();
+  let runTrees = new Map();
+  // Position of each call in flattenNodes(tree) and, per position, the
+  // position of its parent (-1 for roots): ancestor walks are integer loads.
+  let nodeIndex = new Map();
+  let treeParentIdx = new Int32Array(0);
   let runScrollTop = 0;
+  let traceScrollTop = 0;
   let selectionHistory = [];
   let historyIndex = -1;
   let logQuery = '';
@@ -804,13 +1282,134 @@ class TraceViewerServer:
   let filteredLogsCacheKey = '';
   let filteredLogsCache = [];
   let logSearchDebounce = null;
+  let searchDebounce = null;
   let logsFetchCounter = 0;
   let fetchTreeInFlight = false;
+  let treeEtag = null;
+  let lastTreeData = null;
   const fullPayloadCache = new Map();
 
   const STATE_KEY = 'pyeztrace_viewer_ui_v1';
+  const TRACE_ROW_H = 38;
+  const VIRTUAL_OVERSCAN = 6;
+
+  // Coalesce bursts (scroll events, keystrokes) into at most one call per frame.
+  const frameTasks = new Map();
+  function onNextFrame(key, fn){
+    if(frameTasks.has(key)) return;
+    frameTasks.set(key, requestAnimationFrame(()=>{
+      frameTasks.delete(key);
+      fn();
+    }));
+  }
+  function cancelFrame(key){
+    if(!frameTasks.has(key)) return;
+    cancelAnimationFrame(frameTasks.get(key));
+    frameTasks.delete(key);
+  }
+
+  // Virtualized lists need their viewport height on every scroll frame.
+  // Reading clientHeight there can force a layout, so heights are cached
+  // per element and refreshed by a ResizeObserver, which also re-renders
+  // the list whose viewport changed size.
+  const viewHeights = new WeakMap();
+  const viewRenderers = new WeakMap();
+  const viewResizeObserver = typeof ResizeObserver !== 'undefined' ? new ResizeObserver(entries=>{
+    for(const entry of entries){
+      const el = entry.target;
+      const h = el.clientHeight;
+      if(viewHeights.get(el) === h) continue;
+      viewHeights.set(el, h);
+      const rerender = viewRenderers.get(el);
+      if(rerender) onNextFrame(rerender[0], rerender[1]);
+    }
+  }) : null;
+  function viewportHeight(el, fallback, key, rerender){
+    if(!viewResizeObserver) return el.clientHeight || fallback;
+    let h = viewHeights.get(el);
+    if(h === undefined){
+      h = el.clientHeight;
+      viewHeights.set(el, h);
+      viewRenderers.set(el, [key, rerender]);
+      viewResizeObserver.observe(el);
+    }
+    return h || fallback;
+  }
+
+  // Keyed reconciliation: children carry data-key; a child whose key and
+  // markup are unchanged is kept as-is, changed or new ones are built from
+  // their markup, and orphans are dropped. Replaces wholesale innerHTML.
+  // An item may be [key, signature, build] instead: the signature stands in
+  // for the markup in the comparison and build() creates the element.
+  const renderedHtml = new WeakMap();
+  function htmlToElement(html){
+    const tpl = document.createElement('template');
+    tpl.innerHTML = html.trim();
+    return tpl.content.firstElementChild;
+  }
+  function patchKeyed(container, items){
+    const existing = new Map();
+    for(const el of Array.from(container.children)){
+      const key = el.dataset.key;
+      if(key != null && !existing.has(key)) existing.set(key, el);
+      else el.remove();
+    }
+    // Nothing reusable (e.g. a filter change replaced the window): build the
+    // rows off-document and swap them in with a single mutation.
+    if(!items.some(([key, html])=> existing.has(key) && renderedHtml.get(existing.get(key)) === html)){
+      const frag = document.createDocumentFragment();
+      for(const [key, html, build] of items){
+        const el = build ? build() : htmlToElement(html);
+        if(!el) continue;
+        el.dataset.key = key;
+        renderedHtml.set(el, html);
+        frag.appendChild(el);
+      }
+      container.replaceChildren(frag);
+      return;
+    }
+    let cursor = container.firstElementChild;
+    for(const [key, html, build] of items){
+      let el = existing.get(key);
+      existing.delete(key);
+      if(el && renderedHtml.get(el) !== html){
+        if(el === cursor) cursor = el.nextElementSibling;
+        el.remove();
+        el = null;
+      }
+      if(!el){
+        el = build ? build() : htmlToElement(html);
+        if(!el) continue;
+        el.dataset.key = key;
+        renderedHtml.set(el, html);
+      }
+      if(el === cursor) cursor = cursor.nextElementSibling;
+      else container.insertBefore(el, cursor);
+    }
+    for(const el of existing.values()) el.remove();
+  }
 
-  function saveState(){
+  // Selection is applied as a class on already-patched rows rather than
+  // baked into their markup, so moving it never replaces a row.
+  function markSelected(container, key, cls){
+    for(const el of container.children){
+      el.classList.toggle(cls, el.dataset.key === key);
+    }
+  }
+
+  // Filter inputs go through here so an event burst costs one render per frame.
+  function scheduleRender(){
+    onNextFrame('render', render);
+  }
+
+  // localStorage writes are synchronous; batch bursts of state changes into
+  // one trailing write, and flush whatever is pending when the page goes away.
+  let saveTimer = null;
+  function writeState(){
+    if(saveTimer){
+      clearTimeout(saveTimer);
+      saveTimer = null;
+    }
     try {
       localStorage.setItem(STATE_KEY, JSON.stringify({
         statusFilter, minDurationMs, fnTypeFilter, sortMode, showPayloads,
@@ -820,6 +1419,13 @@ class TraceViewerServer:
       }));
     } catch (_e) {}
   }
+  function saveState(){
+    if(saveTimer) return;
+    saveTimer = setTimeout(writeState, 300);
+  }
+  window.addEventListener('beforeunload', ()=>{
+    if(saveTimer) writeState();
+  });
 
   function loadState(){
     try {
@@ -867,15 +1473,38 @@ class TraceViewerServer:
     autoRefreshEl.checked = autoRefreshEnabled;
     focusModeEl.value = focusMode;
     depthLimitEl.value = depthLimit;
-    [...statusFilterGroup.querySelectorAll('.chip')].forEach(btn=>{
-      btn.classList.toggle('active', btn.dataset.filter === statusFilter);
-    });
+    const chip = chipByFilter.get(statusFilter) || null;
+    if(chip !== activeChip){
+      if(activeChip) activeChip.classList.remove('active');
+      if(chip) chip.classList.add('active');
+      activeChip = chip;
+    }
   }
 
   function fmt(n){ return n==null ? '-' : (typeof n==='number' ? n.toFixed(6) : String(n)); }
+  // Function names repeat across thousands of nodes; strip "<locals>" once
+  // per distinct name. Label caches are bounded LRUs (a Map iterates in
+  // insertion order, so a hit is re-inserted at the back and the front is
+  // evicted): a long session cannot grow them without limit, and unique
+  // call ids seen early cannot crowd out names that keep recurring.
+  const LABEL_CACHE_MAX = 4096;
+  function lruGet(cache, key, compute){
+    let out = cache.get(key);
+    if(out !== undefined){
+      cache.delete(key);
+      cache.set(key, out);
+      return out;
+    }
+    out = compute(key);
+    if(cache.size >= LABEL_CACHE_MAX) cache.delete(cache.keys().next().value);
+    cache.set(key, out);
+    return out;
+  }
+  const cleanNameCache = new Map();
+  const stripLocals = (name)=> String(name).replace(/\.<locals>\./g, '.').replace(/<locals>/g, '');
   function cleanFnName(name){
     if(!name) return '-';
-    return String(name).replace(/\.<locals>\./g, '.').replace(/<locals>/g, '');
+    return lruGet(cleanNameCache, name, stripLocals);
   }
   function fmtDuration(sec){
     if(sec==null) return '-';
@@ -887,11 +1516,25 @@ class TraceViewerServer:
     const d = new Date(epoch*1000);
     return `${d.toLocaleTimeString()} (${d.toLocaleDateString()})`;
   }
+  // One regex pass covers both text and attribute contexts.
+  const ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+  const ESCAPE_RE = /[&<>"]/g;
+  const escapeChar = (c)=> ESCAPES[c];
   function escapeHtml(value){
-    return String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+    return String(value).replace(ESCAPE_RE, escapeChar);
   }
   function escapeAttr(value){
-    return String(value).replace(/&/g, '&amp;').replace(/"/g, '&quot;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+    return escapeHtml(value);
+  }
+  // Function names and call ids repeat across rows; cache their escaped forms.
+  const escCache = new Map();
+  function escFn(value){
+    return lruGet(escCache, value, escapeHtml);
+  }
+  const fnLabelCache = new Map();
+  const labelHtml = (name)=> escapeHtml(cleanFnName(name));
+  function fnLabelHtml(name){
+    return lruGet(fnLabelCache, name, labelHtml);
   }
   function infoTip(text){
     return `<span class="info-wrap"><span class="info-icon" tabindex="0" aria-label="Metric info">i</span><span class="tooltip">${escapeHtml(text)}</span></span>`;
@@ -902,27 +1545,88 @@ class TraceViewerServer:
     return node.start_time || null;
   }
 
-  function flattenNodes(nodes, depth=0, parentId=null, acc=[]){
-    nodes.forEach(n=>{
-      acc.push({ ...n, depth, parent_id: parentId });
-      if(n.children && n.children.length) flattenNodes(n.children, depth+1, n.call_id, acc);
-    });
+  // Nodes are annotated in place (depth is always relative to the run root,
+  // so every caller sees the same values) and the pre-order list is cached
+  // per node array; a refreshed tree brings new arrays, so stale entries die
+  // with the old tree.
+  const flatCache = new WeakMap();
+  function flattenInto(nodes, depth, parentId, acc){
+    for(const n of nodes){
+      n.depth = depth;
+      n.parent_id = parentId;
+      acc.push(n);
+      if(n.children && n.children.length) flattenInto(n.children, depth+1, n.call_id, acc);
+    }
     return acc;
   }
+  function flattenNodes(nodes){
+    let flat = flatCache.get(nodes);
+    if(!flat){
+      flat = flattenInto(nodes, 0, null, []);
+      flatCache.set(nodes, flat);
+    }
+    return flat;
+  }
 
-  function getRunNode(runId){
-    return tree.find(n=>n.call_id === runId) || null;
+  function filterKey(q){
+    return `${treeVersion}|${JSON.stringify([q, statusFilter, fnTypeFilter, minDurationMs])}`;
+  }
+  const matchCache = new WeakMap();
+  function matchingNodes(nodes, q){
+    const key = filterKey(q);
+    const hit = matchCache.get(nodes);
+    if(hit && hit.key === key) return hit.list;
+    const list = flattenNodes(nodes).filter(n=>matchesNode(n, q));
+    matchCache.set(nodes, { key, list });
+    return list;
   }
 
-  function rebuildCallToRunMap(){
-    const out = new Map();
-    tree.forEach(root=>{
-      const runId = root.call_id || null;
-      flattenNodes([root]).forEach(n=>{
-        if(n.call_id) out.set(n.call_id, runId);
-      });
-    });
-    callToRunMap = out;
+  function getRunNode(runId){
+    const node = traceMap.get(runId);
+    return node && parentMap.get(runId) == null ? node : null;
+  }
+
+  function inActiveTree(callId, activeTree){
+    if(!traceMap.has(callId)) return false;
+    if(activeTree === tree) return true;
+    return activeTree.length === 1 && callToRunMap.get(callId) === activeTree[0].call_id;
+  }
+
+  function rebuildTreeIndexes(){
+    const runs = new Map();
+    const nodes = new Map();
+    const parents = new Map();
+    const ranges = new Map();
+    const flat = flattenNodes(tree);
+    const index = new Map();
+    const parentIdx = new Int32Array(flat.length);
+    const stack = [];
+    let runId = null;
+    let runStart = 0;
+    for(let i=0;i<flat.length;i++){
+      const n = flat[i];
+      const depth = n.depth || 0;
+      stack[depth] = i;
+      parentIdx[i] = depth > 0 ? stack[depth - 1] : -1;
+      if(depth === 0){
+        if(runId) ranges.set(runId, [runStart, i]);
+        runId = n.call_id || null;
+        runStart = i;
+      }
+      if(!n.call_id) continue;
+      index.set(n.call_id, i);
+      runs.set(n.call_id, runId);
+      nodes.set(n.call_id, n);
+      parents.set(n.call_id, n.parent_id);
+    }
+    if(runId) ranges.set(runId, [runStart, flat.length]);
+    callToRunMap = runs;
+    traceMap = nodes;
+    parentMap = parents;
+    runRanges = ranges;
+    runTrees = new Map();
+    nodeIndex = index;
+    treeParentIdx = parentIdx;
   }
 
   function filteredLogs(){
@@ -973,14 +1677,15 @@ class TraceViewerServer:
     });
   }
 
-  function restoreScrollGroup(baseKey, selector){
+  // Collects scroll positions to write; restoreUiScrollState() applies them
+  // in one pass. Assigning scrollTop clamps by itself, so no geometry is
+  // read back between writes.
+  function restoreScrollGroup(baseKey, selector, out){
     const nodes = document.querySelectorAll(selector);
     nodes.forEach((node, idx)=>{
       const key = `${baseKey}:${idx}`;
       if(!panelScrollTopByKey.has(key)) return;
-      const wanted = Number(panelScrollTopByKey.get(key) || 0);
-      const maxTop = Math.max(0, node.scrollHeight - node.clientHeight);
-      node.scrollTop = Math.min(wanted, maxTop);
+      out.push([node, Number(panelScrollTopByKey.get(key) || 0)]);
     });
   }
 
@@ -1004,24 +1709,20 @@ class TraceViewerServer:
   }
 
   function restoreUiScrollState(){
+    const writes = [];
     const listEl = getLogsScrollEl();
-    if(listEl){
-      const maxTop = Math.max(0, listEl.scrollHeight - listEl.clientHeight);
-      listEl.scrollTop = Math.min(logScrollTop || 0, maxTop);
-    }
+    if(listEl) writes.push([listEl, logScrollTop || 0]);
     const detailEl = getLogsDetailEl();
-    if(detailEl){
-      const maxTop = Math.max(0, detailEl.scrollHeight - detailEl.clientHeight);
-      detailEl.scrollTop = Math.min(logDetailScrollTop || 0, maxTop);
-    }
-    restoreScrollGroup('trace-tree', '#trace-tree');
-    restoreScrollGroup('trace-details', '#trace-details');
-    restoreScrollGroup('run-viewport', '#run-viewport');
-    restoreScrollGroup('flame-scroll', '.flame-scroll');
-    restoreScrollGroup('metrics-scroll', '.metrics-scroll');
-    restoreScrollGroup('overview-scroll', '.overview-scroll');
-    restoreScrollGroup('code-block', '.code-block');
-    restoreScrollGroup('payload-tree', '.payload-tree');
+    if(detailEl) writes.push([detailEl, logDetailScrollTop || 0]);
+    restoreScrollGroup('trace-tree', '#trace-tree', writes);
+    restoreScrollGroup('trace-details', '#trace-details', writes);
+    restoreScrollGroup('run-viewport', '#run-viewport', writes);
+    restoreScrollGroup('flame-scroll', '.flame-scroll', writes);
+    restoreScrollGroup('metrics-scroll', '.metrics-scroll', writes);
+    restoreScrollGroup('overview-scroll', '.overview-scroll', writes);
+    restoreScrollGroup('code-block', '.code-block', writes);
+    restoreScrollGroup('payload-tree', '.payload-tree', writes);
+    for(const [node, top] of writes) node.scrollTop = top;
   }
 
   function captureLogListAnchor(){
@@ -1057,7 +1758,7 @@ class TraceViewerServer:
     const rowH = 72;
     const totalH = visibleLogs.length * rowH;
     spacer.style.height = `${totalH}px`;
-    const viewH = viewport.clientHeight || 560;
+    const viewH = viewportHeight(viewport, 560, 'log-rows', renderLogsRows);
     if(pendingLogAnchorId !== null){
       const anchorIndex = visibleLogs.findIndex(l=>String(l.id) === String(pendingLogAnchorId));
       if(anchorIndex >= 0){
@@ -1079,7 +1780,11 @@ class TraceViewerServer:
     const end = Math.min(visibleLogs.length, start + Math.ceil(viewH / rowH) + 8);
     const slice = visibleLogs.slice(start, end);
     layer.style.transform = `translateY(${start * rowH}px)`;
-    layer.innerHTML = slice.map(l=>`
+    if(!slice.length){
+      patchKeyed(layer, [['empty', '<div class="log-row"><span class="muted">No logs for current filters.</span></div>']]);
+      return;
+    }
+    patchKeyed(layer, slice.map(l=>[`l:${l.id}`, `
       <div class="log-row ${String(selectedLogId)===String(l.id) ? 'active' : ''}" data-action="select-log" data-log-id="${escapeAttr(String(l.id))}" style="height:${rowH-6}px;">
         <div class="log-row-title">
           <span class="pill ${String(l.level||'').toUpperCase()==='ERROR' ? 'error' : 'success'}">${escapeHtml(String(l.level || '-').toUpperCase())}</span>
@@ -1089,12 +1794,12 @@ class TraceViewerServer:
         </div>
         <div class="log-row-msg">${escapeHtml(l.message || '(no message)')}</div>
         <div class="log-row-meta">
-          <span>${escapeHtml(cleanFnName(l.function || '-'))}</span>
+          <span>${fnLabelHtml(l.function || '-')}</span>
           <span>call=${escapeHtml((l.call_id || '-').slice(0, 12))}</span>
           <span>event=${escapeHtml(l.event || '-')}</span>
         </div>
       </div>
-    `).join('') || '<div class="log-row"><span class="muted">No logs for current filters.</span></div>';
+    `]));
   }
 
   function logConsoleLine(log){
@@ -1261,7 +1966,7 @@ class TraceViewerServer:
         </div>
         <div class="pretty-grid">
           <div class="pretty-key">Timestamp</div><div class="pretty-value">${escapeHtml(log.timestamp || '-')}</div>
-          <div class="pretty-key">Function</div><div class="pretty-value">${escapeHtml(cleanFnName(log.function || '-'))}</div>
+          <div class="pretty-key">Function</div><div class="pretty-value">${fnLabelHtml(log.function || '-')}</div>
           <div class="pretty-key">Message</div><div class="pretty-value">${escapeHtml(log.message || '-')}</div>
           <div class="pretty-key">Call ID</div><div class="pretty-value pretty-mono">${escapeHtml(log.call_id || '-')}</div>
           <div class="pretty-key">Parent ID</div><div class="pretty-value pretty-mono">${escapeHtml(log.parent_id || '-')}</div>
@@ -1300,16 +2005,26 @@ class TraceViewerServer:
     `;
   }
 
+  // Returns the same array for the same (tree, run) so memoized views hit.
+  // One stable array per run for the current tree, so switching back to a
+  // run hits the flatten/filter/display caches keyed on it. A run is a
+  // contiguous slice of the whole tree's pre-order list, which seeds its
+  // flattened view without walking the subtree again.
   function currentTree(){
-    if(selectedRunId){
-      const match = getRunNode(selectedRunId);
-      return match ? [match] : tree;
-    }
-    return tree;
+    if(!selectedRunId) return tree;
+    let value = runTrees.get(selectedRunId);
+    if(value) return value;
+    const match = getRunNode(selectedRunId);
+    if(!match) return tree;
+    value = [match];
+    const range = runRanges.get(selectedRunId);
+    if(range) flatCache.set(value, flattenNodes(tree).slice(range[0], range[1]));
+    runTrees.set(selectedRunId, value);
+    return value;
   }
 
   function matchFilter(node, q){
-    const hay = [node.function||'', node.error||'', node.call_id||'', node.parent_id||'', node.status||''].join(' ').toLowerCase();
+    const hay = [node.function||'', node.error||'', node.call_id||'', parentMap.get(node.call_id)||'', node.status||''].join(' ').toLowerCase();
     return hay.includes(q);
   }
   function passesStatus(node){
@@ -1329,10 +2044,31 @@ class TraceViewerServer:
   function matchesNode(node, q){
     return matchFilter(node, q) && passesStatus(node) && passesExtra(node);
   }
-  function shouldDisplay(node, q){
-    const selfMatch = matchesNode(node, q);
-    const childMatch = (node.children||[]).some(c=>shouldDisplay(c, q));
-    return selfMatch || childMatch;
+  // display[i] is 1 when flattenNodes(nodes)[i] matches or has a matching
+  // descendant. Pre-order puts parents first, so one reverse pass suffices.
+  const displayCache = new WeakMap();
+  function displayMask(nodes, q){
+    const key = filterKey(q);
+    const hit = displayCache.get(nodes);
+    if(hit && hit.key === key) return hit.mask;
+    const flat = flattenNodes(nodes);
+    const count = flat.length;
+    const parentIdx = new Int32Array(count);
+    const stack = [];
+    for(let i=0;i<count;i++){
+      const depth = flat[i].depth || 0;
+      stack[depth] = i;
+      parentIdx[i] = depth > 0 ? stack[depth - 1] : -1;
+    }
+    const mask = new Uint8Array(count);
+    for(let i=count-1;i>=0;i--){
+      if(mask[i] || matchesNode(flat[i], q)){
+        mask[i] = 1;
+        if(parentIdx[i] >= 0) mask[parentIdx[i]] = 1;
+      }
+    }
+    displayCache.set(nodes, { key, mask });
+    return mask;
   }
 
   function summarizeNodes(nodes, q){
@@ -1374,54 +2110,175 @@ class TraceViewerServer:
     fnTypeEl.value = fnTypeFilter;
   }
 
-  function normalizeMetricsList(mList){
-    const out = [];
-    (mList||[]).forEach(row=>{
-      if(!row) return;
+  // Snapshots never change once received, so each is normalized once. The
+  // returned list is shared: callers that reorder it must copy first.
+  const normalizedSnapshots = new WeakMap();
+  function normalizeMetricsList(snap){
+    if(!snap || typeof snap !== 'object') return [];
+    let out = normalizedSnapshots.get(snap);
+    if(out) return out;
+    out = [];
+    for(const row of snap.metrics || []){
+      if(!row) continue;
       out.push({
         function: row.function || '-',
         calls: row.calls || 0,
         total_seconds: row.total_seconds || 0,
         avg_seconds: row.avg_seconds || 0
       });
-    });
+    }
+    normalizedSnapshots.set(snap, out);
     return out;
   }
 
+  // One pass over the snapshots, carrying each function's previous counters.
+  // A function missing from the preceding snapshot counts from zero.
   function buildDeltaSeries(snaps){
     const series = new Map();
     if(!snaps || snaps.length < 2) return series;
-    const toMap = (snap)=>{
-      const map = new Map();
-      normalizeMetricsList(snap.metrics).forEach(r=> map.set(r.function, r));
-      return map;
-    };
-    for(let i=1;i<snaps.length;i++){
-      const prev = toMap(snaps[i-1]);
-      const cur = toMap(snaps[i]);
-      const fns = new Set([...prev.keys(), ...cur.keys()]);
-      fns.forEach(fn=>{
-        const p = prev.get(fn) || {calls:0,total_seconds:0};
-        const c = cur.get(fn) || {calls:0,total_seconds:0};
-        const dcalls = (c.calls||0) - (p.calls||0);
-        const dtotal = (c.total_seconds||0) - (p.total_seconds||0);
-        if(dcalls <= 0 || dtotal < 0) return;
-        if(!series.has(fn)) series.set(fn, { fn, deltas: [] });
-        series.get(fn).deltas.push(dtotal);
-      });
+    const rolling = new Map();
+    for(let i=0;i<snaps.length;i++){
+      for(const r of normalizeMetricsList(snaps[i])){
+        let st = rolling.get(r.function);
+        if(!st){
+          st = { calls: 0, total: 0, seen: -1 };
+          rolling.set(r.function, st);
+        }
+        if(i > 0){
+          const fresh = st.seen === i - 1;
+          const dcalls = r.calls - (fresh ? st.calls : 0);
+          const dtotal = r.total_seconds - (fresh ? st.total : 0);
+          if(dcalls > 0 && dtotal >= 0){
+            let entry = series.get(r.function);
+            if(!entry){
+              entry = { fn: r.function, deltas: [] };
+              series.set(r.function, entry);
+            }
+            entry.deltas.push(dtotal);
+          }
+        }
+        st.calls = r.calls;
+        st.total = r.total_seconds;
+        st.seen = i;
+      }
     }
     return series;
   }
 
+  // One <svg> polyline per row instead of one styled <span> per sample.
   function sparkline(values){
-    const vals = (values||[]).map(v=>Number(v)||0);
-    if(!vals.length) return '<span class="muted">-</span>';
-    const max = Math.max(...vals, 1e-9);
-    const bars = vals.map(v=>{
-      const h = Math.max(2, Math.round((v / max) * 18));
-      return `<span style="display:inline-block;width:4px;height:${h}px;background:rgba(56,189,248,0.65);border-radius:2px;"></span>`;
-    }).join('');
-    return `<span style="display:inline-flex;align-items:flex-end;gap:2px;height:20px;">${bars}</span>`;
+    const count = values ? values.length : 0;
+    if(!count) return '<span class="muted">-</span>';
+    let max = 1e-9;
+    for(let i=0;i<count;i++){
+      const v = Number(values[i]) || 0;
+      if(v > max) max = v;
+    }
+    const step = 6;
+    const width = Math.max(step, (count - 1) * step + 4);
+    const pts = new Array(count);
+    for(let i=0;i<count;i++){
+      const h = Math.max(2, Math.round(((Number(values[i]) || 0) / max) * 18));
+      pts[i] = `${i * step + 2},${20 - h}`;
+    }
+    return `<svg width="${width}" height="20" viewBox="0 0 ${width} 20" aria-hidden="true"><polyline fill="none" stroke="rgba(56,189,248,0.65)" stroke-width="2" stroke-linejoin="round" points="${pts.join(' ')}"/></svg>`;
+  }
+
+  // Long tables render their first rows inline with the pane; the rest are
+  // appended in idle time, 100 rows per chunk, once the pane is mounted. A
+  // tbody that was already filled (its pane kept by patchKeyed) is skipped.
+  const TABLE_INLINE_ROWS = 60;
+  const TABLE_MAX_ROWS = 2000;
+  const TABLE_CHUNK_ROWS = 100;
+  const requestIdle = window.requestIdleCallback
+    ? (fn)=> window.requestIdleCallback(fn)
+    : (fn)=> setTimeout(()=> fn({ timeRemaining: ()=> 8 }), 16);
+  const cancelIdle = window.cancelIdleCallback
+    ? (id)=> window.cancelIdleCallback(id)
+    : (id)=> clearTimeout(id);
+  const deferredTables = new Map();
+  const chunkJobs = new Map();
+  const chunkedBodies = new WeakSet();
+  function deferTableRows(tbodyId, rows, renderRow){
+    deferredTables.set(tbodyId, { rows, renderRow });
+  }
+  function flushDeferredTables(){
+    for(const [tbodyId, job] of deferredTables){
+      const tbody = document.getElementById(tbodyId);
+      if(!tbody || chunkedBodies.has(tbody)) continue;
+      chunkedBodies.add(tbody);
+      if(chunkJobs.has(tbodyId)) cancelIdle(chunkJobs.get(tbodyId));
+      chunkJobs.delete(tbodyId);
+      if(job.rows.length) renderTableChunked(tbodyId, tbody, job.rows, job.renderRow);
+    }
+    deferredTables.clear();
+  }
+  function renderTableChunked(jobKey, tbody, rows, renderRow, chunkSize=TABLE_CHUNK_ROWS){
+    let i = 0;
+    const step = (deadline)=>{
+      chunkJobs.delete(jobKey);
+      if(!tbody.isConnected) return;
+      while(i < rows.length && deadline.timeRemaining() > 4){
+        const end = Math.min(i + chunkSize, rows.length);
+        const parts = new Array(end - i);
+        for(let j=i;j<end;j++) parts[j - i] = renderRow(rows[j]);
+        tbody.insertAdjacentHTML('beforeend', parts.join(''));
+        i = end;
+      }
+      if(i < rows.length) chunkJobs.set(jobKey, requestIdle(step));
+    };
+    chunkJobs.set(jobKey, requestIdle(step));
+  }
+
+  // Panel markup is a pure function of a few inputs; renders that leave
+  // them unchanged (selection moves, refreshes with no new data) reuse the
+  // previous string, replaying any table rows it deferred.
+  const panelMemo = new Map();
+  function memoPanel(name, deps, build){
+    const hit = panelMemo.get(name);
+    if(hit && hit.deps.length === deps.length && hit.deps.every((d, i)=> d === deps[i])){
+      for(const [tbodyId, job] of hit.deferred) deferredTables.set(tbodyId, job);
+      return hit.html;
+    }
+    const before = new Set(deferredTables.keys());
+    const html = build();
+    const deferred = [...deferredTables].filter(([tbodyId])=> !before.has(tbodyId));
+    panelMemo.set(name, { deps, html, deferred });
+    return html;
+  }
+
+  function panelInputs(activeTree, q){
+    return {
+      overview: [[treeVersion, metrics, generatedAt], buildOverviewPanel],
+      metrics: [[metrics, metricsTab], buildMetricsPanel],
+      issues: [[activeTree, filterKey(q)], ()=> buildIssuesPanel(activeTree, q)],
+    };
+  }
+
+  // Hidden panels are built one per idle slice after a render, so switching
+  // tabs usually hits memoPanel() instead of building on the click. Their
+  // deferred rows stay in the memo until the panel is actually shown.
+  let prewarmJob = null;
+  function schedulePanelPrewarm(){
+    if(prewarmJob !== null) cancelIdle(prewarmJob);
+    const pending = ['overview', 'issues', 'metrics'].filter(name=> name !== insightTab);
+    const step = ()=>{
+      prewarmJob = null;
+      const name = pending.shift();
+      if(!name) return;
+      const q = (searchEl.value||'').toLowerCase().trim();
+      const before = new Set(deferredTables.keys());
+      memoPanel(name, ...panelInputs(currentTree(), q)[name]);
+      for(const tbodyId of deferredTables.keys()){
+        if(!before.has(tbodyId)) deferredTables.delete(tbodyId);
+      }
+      if(pending.length) prewarmJob = requestIdle(step);
+    };
+    prewarmJob = requestIdle(step);
+  }
+
+  function metricsRowHtml(row){
+    return `<tr><td class="function-name">${escFn(row.function)}</td><td class="number">${row.calls}</td><td class="number">${row.total_seconds.toFixed(6)}s</td><td class="number">${row.avg_seconds.toFixed(6)}s</td></tr>`;
   }
 
   function buildMetricsPanel(){
@@ -1430,6 +2287,12 @@ class TraceViewerServer:
       return `<div class="insight-panel metrics-panel"><div class="panel-title">Performance metrics</div><div class="metrics-scroll"><div class="muted">No metrics snapshots available.</div></div></div>`;
     }
     if(metricsTab === 'latest'){
+      const rows = normalizeMetricsList(latestMetrics);
+      const limit = Math.min(rows.length, TABLE_INLINE_ROWS);
+      const parts = new Array(limit);
+      for(let i=0;i<limit;i++) parts[i] = metricsRowHtml(rows[i]);
+      const latestRows = parts.join('');
+      deferTableRows('metrics-latest-rows', rows.slice(limit, TABLE_MAX_ROWS), metricsRowHtml);
       return `
         <div class="insight-panel metrics-panel">
           <div class="panel-title">Performance metrics (latest)</div>
@@ -1441,15 +2304,8 @@ class TraceViewerServer:
             </div>
             <table class="metrics-table">
               <thead><tr><th>Function</th><th class="number">Calls</th><th class="number">Total</th><th class="number">Avg</th></tr></thead>
-              <tbody>
-                ${normalizeMetricsList(latestMetrics.metrics).slice(0,40).map(row=>`
-                  <tr>
-                    <td class="function-name">${row.function}</td>
-                    <td class="number">${row.calls}</td>
-                    <td class="number">${row.total_seconds.toFixed(6)}s</td>
-                    <td class="number">${row.avg_seconds.toFixed(6)}s</td>
-                  </tr>
-                `).join('')}
+              <tbody id="metrics-latest-rows">
+                ${latestRows}
               </tbody>
             </table>
           </div>
@@ -1457,7 +2313,14 @@ class TraceViewerServer:
       `;
     }
     const series = buildDeltaSeries(metrics);
-    const latestList = normalizeMetricsList(latestMetrics.metrics).sort((a,b)=> (b.total_seconds||0)-(a.total_seconds||0)).slice(0,20);
+    const latestList = [...normalizeMetricsList(latestMetrics)].sort((a,b)=> (b.total_seconds||0)-(a.total_seconds||0)).slice(0,20);
+    const parts = new Array(latestList.length);
+    for(let i=0;i<latestList.length;i++){
+      const r = latestList[i];
+      const entry = series.get(r.function);
+      parts[i] = `<tr><td class="function-name">${r.function}</td><td class="number">${r.total_seconds.toFixed(6)}s</td><td class="number">${r.calls}</td><td>${sparkline(entry ? entry.deltas : [])}</td></tr>`;
+    }
+    const seriesRows = parts.join('');
     return `
       <div class="insight-panel metrics-panel">
         <div class="panel-title">Performance metrics (time series)</div>
@@ -1465,14 +2328,7 @@ class TraceViewerServer:
           <table class="metrics-table">
             <thead><tr><th>Function</th><th class="number">Total</th><th class="number">Calls</th><th>Trend</th></tr></thead>
             <tbody>
-              ${latestList.map(r=>`
-                <tr>
-                  <td class="function-name">${r.function}</td>
-                  <td class="number">${r.total_seconds.toFixed(6)}s</td>
-                  <td class="number">${r.calls}</td>
-                  <td>${sparkline((series.get(r.function)||{}).deltas||[])}</td>
-                </tr>
-              `).join('')}
+              ${seriesRows}
             </tbody>
           </table>
         </div>
@@ -1481,33 +2337,58 @@ class TraceViewerServer:
   }
 
   function buildFlameGraph(nodes, q){
-    const filtered = flattenNodes(nodes).filter(n=>matchesNode(n, q));
+    const filtered = matchingNodes(nodes, q);
     if(filtered.length === 0){
+      flameModel = null;
       return `<div class="insight-panel"><div class="panel-title">Flame graph</div><div class="muted">No trace data for current filters.</div></div>`;
     }
-    const starts = filtered.map(n=>n.start_time).filter(Boolean);
-    const ends = filtered.map(n=>safeEnd(n)).filter(Boolean);
-    const minStart = Math.min(...starts);
-    const maxEnd = Math.max(...ends);
+    // One pass for the bounds (no spread into Math.min/max, which also caps
+    // the argument count) that also records start/end columns, then one
+    // indexed pass that lays the bars out for drawFlameGraph().
+    const count = filtered.length;
+    const starts = new Float64Array(count);
+    const ends = new Float64Array(count);
+    let minStart = Infinity;
+    let maxEnd = -Infinity;
+    let maxDepth = 0;
+    for(let i=0;i<count;i++){
+      const n = filtered[i];
+      const st = n.start_time || 0;
+      const end = safeEnd(n) || 0;
+      starts[i] = st;
+      ends[i] = end;
+      if(st && st < minStart) minStart = st;
+      if(end && end > maxEnd) maxEnd = end;
+      if((n.depth || 0) > maxDepth) maxDepth = n.depth;
+    }
     const span = Math.max(maxEnd - minStart, 0.000001);
-    const maxDepth = Math.max(...filtered.map(n=>n.depth || 0), 0);
+    const pctPerSec = 100 / span;
     const rowHeight = 26;
     const height = (maxDepth + 1) * rowHeight + 8;
-    const depthGuides = Array.from({length: maxDepth + 1}, (_v, d)=>{
+    const guides = new Array(maxDepth + 1);
+    for(let d=0;d<=maxDepth;d++){
       const y = d * rowHeight + 16;
-      return `<div class="flame-depth-line" style="top:${y}px;"></div><div class="flame-depth-label" style="top:${y-9}px;">d${d}</div>`;
-    }).join('');
-    const bars = filtered.map(n=>{
-      const start = n.start_time || minStart;
-      const end = safeEnd(n) || start;
-      const left = ((start - minStart) / span) * 100;
-      const width = Math.max(((end - start) / span) * 100, 0.5);
-      const top = (n.depth || 0) * rowHeight + 6;
-      const label = `${n.function || n.call_id} (${fmtDuration(n.duration)})`;
-      const isError = n.error || n.status === 'error';
-      const text = width > 9 ? cleanFnName(n.function || n.call_id) : '';
-      return `<div class="flame-bar ${isError ? 'error' : ''}" style="left:${left}%;width:${width}%;top:${top}px;" title="${label}">${text}</div>`;
-    }).join('');
+      guides[d] = `<div class="flame-depth-line" style="top:${y}px;"></div><div class="flame-depth-label" style="top:${y-9}px;">d${d}</div>`;
+    }
+    const depthGuides = guides.join('');
+    // geo holds [left, width] as fractions of the container width, then the
+    // bar's top in px and an error flag; byDepth lists bar indexes per row in
+    // start order for hit-testing.
+    const geo = new Float32Array(count * 4);
+    const byDepth = Array.from({length: maxDepth + 1}, ()=>[]);
+    for(let i=0;i<count;i++){
+      const n = filtered[i];
+      const start = starts[i] || minStart;
+      const end = ends[i] || start;
+      const o = i * 4;
+      geo[o] = (start - minStart) * pctPerSec / 100;
+      geo[o + 1] = Math.max((end - start) * pctPerSec, 0.5) / 100;
+      geo[o + 2] = (n.depth || 0) * rowHeight + 6;
+      geo[o + 3] = (n.error || n.status === 'error') ? 1 : 0;
+      byDepth[n.depth || 0].push(i);
+    }
+    for(const row of byDepth) row.sort((a, b)=> geo[a * 4] - geo[b * 4]);
+    flameModel = { nodes: filtered, geo, byDepth, rowHeight, height };
     return `
       <div class="insight-panel traces-panel">
         <div class="panel-title">Flame graph</div>
@@ -1517,7 +2398,7 @@ class TraceViewerServer:
             <span><strong>Bar width:</strong> call duration</span>
             <span><strong>Y axis:</strong> call depth (d0 root)</span>
           </div>
-          <div class="flame-container" style="height:${height}px;">${depthGuides}${bars}</div>
+          <div class="flame-container" style="height:${height}px;">${depthGuides}<canvas id="flame-canvas" class="flame-canvas"></canvas></div>
           <div class="flame-scale">
             <span>${new Date(minStart*1000).toLocaleTimeString()}</span>
             <span>${span.toFixed(3)}s span</span>
@@ -1528,35 +2409,116 @@ class TraceViewerServer:
     `;
   }
 
+  // Flame bars are painted onto one canvas after the pane is in the DOM,
+  // switching fill style only between normal and error runs of bars.
+  let flameModel = null;
+  const FLAME_BAR_H = 22;
+  const FLAME_FILL = 'rgba(14,165,233,0.9)';
+  const FLAME_ERROR_FILL = 'rgba(239,68,68,0.9)';
+  function drawFlameGraph(){
+    const canvas = document.getElementById('flame-canvas');
+    if(!canvas || !canvas.getContext) return;
+    const ctx = canvas.getContext('2d');
+    if(!ctx) return;
+    const model = flameModel;
+    const cssW = canvas.clientWidth || (canvas.parentElement && canvas.parentElement.clientWidth) || 0;
+    const cssH = model ? model.height : 0;
+    const dpr = window.devicePixelRatio || 1;
+    canvas.width = Math.round(cssW * dpr);
+    canvas.height = Math.round(cssH * dpr);
+    if(!model || !cssW) return;
+    ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    const { geo, nodes } = model;
+    const count = nodes.length;
+    let fill = null;
+    for(let i=0;i<count;i++){
+      const o = i * 4;
+      const style = geo[o + 3] ? FLAME_ERROR_FILL : FLAME_FILL;
+      if(style !== fill){
+        ctx.fillStyle = style;
+        fill = style;
+      }
+      ctx.fillRect(geo[o] * cssW, geo[o + 2], Math.max(geo[o + 1] * cssW, 1), FLAME_BAR_H);
+    }
+    ctx.fillStyle = '#0b1220';
+    ctx.font = '11px Inter, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, sans-serif';
+    ctx.textBaseline = 'middle';
+    for(let i=0;i<count;i++){
+      const o = i * 4;
+      const w = geo[o + 1] * cssW;
+      if(w <= 40) continue;
+      const x = geo[o] * cssW;
+      const y = geo[o + 2];
+      ctx.save();
+      ctx.beginPath();
+      ctx.rect(x, y, w - 6, FLAME_BAR_H);
+      ctx.clip();
+      ctx.fillText(cleanFnName(nodes[i].function || nodes[i].call_id), x + 6, y + FLAME_BAR_H / 2);
+      ctx.restore();
+    }
+    if(!canvas.dataset.bound){
+      canvas.dataset.bound = '1';
+      canvas.addEventListener('mousemove', (e)=>{
+        const n = flameHitTest(canvas, e.offsetX, e.offsetY);
+        canvas.title = n ? `${n.function || n.call_id} (${fmtDuration(n.duration)})` : '';
+      });
+    }
+  }
+  function flameHitTest(canvas, x, y){
+    const model = flameModel;
+    if(!model) return null;
+    const depth = Math.floor((y - 6) / model.rowHeight);
+    const row = model.byDepth[depth];
+    if(!row || (y - 6) - depth * model.rowHeight > FLAME_BAR_H) return null;
+    const frac = x / (canvas.clientWidth || 1);
+    const geo = model.geo;
+    // Last bar starting at or before x, then check that x is within it.
+    let lo = 0;
+    let hi = row.length - 1;
+    let hit = -1;
+    while(lo <= hi){
+      const mid = (lo + hi) >> 1;
+      if(geo[row[mid] * 4] <= frac){
+        hit = mid;
+        lo = mid + 1;
+      } else {
+        hi = mid - 1;
+      }
+    }
+    if(hit < 0) return null;
+    const i = row[hit];
+    return frac <= geo[i * 4] + geo[i * 4 + 1] ? model.nodes[i] : null;
+  }
+
+  function issueRowHtml(n){
+    const callId = n.call_id || '';
+    const hasTraceTarget = !!(callId && callToRunMap.has(callId));
+    const callIdCell = callId
+      ? (hasTraceTarget
+          ? `<button class="btn small" data-action="go-trace-from-log" data-call-id="${escapeAttr(callId)}">${escapeHtml(callId)}</button>`
+          : `<span class="muted">${escapeHtml(callId)}</span>`)
+      : '-';
+    const openCell = hasTraceTarget
+      ? `<button class="btn small primary" data-action="go-trace-from-log" data-call-id="${escapeAttr(callId)}">Open trace</button>`
+      : `<span class="muted">No trace</span>`;
+    return `<tr><td>${fnLabelHtml(n.function || '-')}</td><td>${escapeHtml(n.error || '-')}</td><td>${callIdCell}</td><td>${openCell} <button class="btn small" data-action="copy-text" data-copy="${escapeAttr(encodeURIComponent(callId))}">Copy</button></td></tr>`;
+  }
+
   function buildIssuesPanel(nodes, q){
-    const issues = flattenNodes(nodes).filter(n=>matchesNode(n, q) && (n.error || n.status === 'error'));
+    const issues = matchingNodes(nodes, q).filter(n=>n.error || n.status === 'error');
+    const shown = Math.min(issues.length, TABLE_INLINE_ROWS);
+    const parts = new Array(shown);
+    for(let i=0;i<shown;i++) parts[i] = issueRowHtml(issues[i]);
+    const issueRows = parts.join('');
+    deferTableRows('issue-rows', issues.slice(shown, TABLE_MAX_ROWS), issueRowHtml);
     return `
       <div class="insight-panel">
         <div class="panel-title">Issue debugger (${issues.length})</div>
         ${issues.length ? `
           <table class="issue-table">
             <thead><tr><th>Function</th><th>Error</th><th>Call ID</th><th>Actions</th></tr></thead>
-            <tbody>
-              ${issues.slice(0,60).map(n=>{
-                  const callId = n.call_id || '';
-                  const hasTraceTarget = !!(callId && callToRunMap.has(callId));
-                  const callIdCell = callId
-                    ? (hasTraceTarget
-                        ? `<button class="btn small" data-action="go-trace-from-log" data-call-id="${escapeAttr(callId)}">${escapeHtml(callId)}</button>`
-                        : `<span class="muted">${escapeHtml(callId)}</span>`)
-                    : '-';
-                  return `
-                <tr>
-                  <td>${escapeHtml(cleanFnName(n.function || '-'))}</td>
-                  <td>${escapeHtml(n.error || '-')}</td>
-                  <td>${callIdCell}</td>
-                  <td>
-                    ${hasTraceTarget ? `<button class="btn small primary" data-action="go-trace-from-log" data-call-id="${escapeAttr(callId)}">Open trace</button>` : `<span class="muted">No trace</span>`}
-                    <button class="btn small" data-action="copy-text" data-copy="${escapeAttr(encodeURIComponent(callId))}">Copy</button>
-                  </td>
-                </tr>
-                  `;
-                }).join('')}
+            <tbody id="issue-rows">
+              ${issueRows}
             </tbody>
           </table>
         ` : '<div class="muted">No errors for current filters.</div>'}
@@ -1674,88 +2636,182 @@ class TraceViewerServer:
     `;
   }
 
-  function percentile(values, p){
-    if(!values.length) return null;
-    const sorted = [...values].sort((a,b)=>a-b);
-    const idx = Math.max(0, Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1));
-    return sorted[idx];
+  // Struct-of-arrays view of flattenNodes(tree) for the overview's full scans:
+  // numeric fields in typed columns, status bits in `flags`, and function
+  // labels deduplicated into `fnNames`. Built once per tree version.
+  const NODE_ERROR = 1;
+  const NODE_SUCCESS = 2;
+  const NODE_HAS_DURATION = 4;
+  const NODE_MISSING_END = 8;
+  const NODE_HAS_CALL_ID = 16;
+  let columnsMemo = { version: -1, cols: null };
+  // Columns computed by the tree worker for the tree it delivered; adopted by
+  // nodeColumns() when they belong to the current treeVersion.
+  let workerColumns = null;
+  function nodeColumns(){
+    if(columnsMemo.version === treeVersion && columnsMemo.cols) return columnsMemo.cols;
+    const nodes = flattenNodes(tree);
+    let cols;
+    if(workerColumns && workerColumns.version === treeVersion && workerColumns.cols.count === nodes.length){
+      cols = workerColumns.cols;
+      cols.nodes = nodes;
+    } else {
+      cols = buildNodeColumns(nodes);
+    }
+    workerColumns = null;
+    columnsMemo = { version: treeVersion, cols };
+    return cols;
+  }
+  function buildNodeColumns(nodes){
+    const N = nodes.length;
+    const cols = {
+      nodes,
+      count: N,
+      duration: new Float64Array(N),
+      startTime: new Float64Array(N),
+      endTime: new Float64Array(N),
+      cpuTime: new Float64Array(N),
+      memDeltaKb: new Float64Array(N),
+      flags: new Uint8Array(N),
+      fnIdx: new Uint32Array(N),
+      fnNames: [],
+      memModes: new Set()
+    };
+    const fnLookup = new Map();
+    for(let i=0;i<N;i++){
+      const n = nodes[i];
+      let f = 0;
+      if(n.error || n.status === 'error') f |= NODE_ERROR;
+      if(n.status === 'success') f |= NODE_SUCCESS;
+      if(n.duration != null){
+        f |= NODE_HAS_DURATION;
+        cols.duration[i] = n.duration;
+      }
+      if(n.start_time && !n.end_time) f |= NODE_MISSING_END;
+      if(n.call_id) f |= NODE_HAS_CALL_ID;
+      cols.flags[i] = f;
+      cols.startTime[i] = n.start_time || 0;
+      cols.endTime[i] = safeEnd(n) || 0;
+      cols.cpuTime[i] = n.cpu_time != null ? (Number(n.cpu_time) || 0) : 0;
+      cols.memDeltaKb[i] = n.mem_delta_kb != null ? (Number(n.mem_delta_kb) || 0) : 0;
+      if(n.mem_mode) cols.memModes.add(String(n.mem_mode));
+      const key = cleanFnName(n.function || n.call_id || 'unknown');
+      let k = fnLookup.get(key);
+      if(k === undefined){
+        k = cols.fnNames.length;
+        cols.fnNames.push(key);
+        fnLookup.set(key, k);
+      }
+      cols.fnIdx[i] = k;
+    }
+    return cols;
+  }
+
+  // Sorts once (typed-array sort is numeric and comparator-free) and reads
+  // every requested percentile from the same copy; null for empty input.
+  function percentilesSorted(values, ps){
+    if(!values.length) return ps.map(()=>null);
+    const sorted = Float64Array.from(values).sort();
+    const last = sorted.length - 1;
+    return ps.map(p=> sorted[Math.max(0, Math.min(last, Math.ceil((p / 100) * sorted.length) - 1))]);
   }
 
   function buildOverviewPanel(){
-    const allNodes = flattenNodes(tree);
-    const durationsMs = allNodes.filter(n=>n.duration != null).map(n=>n.duration * 1000);
-    const totalCalls = allNodes.length;
+    const cols = nodeColumns();
+    const allNodes = cols.nodes;
+    const N = cols.count;
+    const { duration, startTime, endTime, cpuTime, memDeltaKb, flags, fnIdx, fnNames } = cols;
+    const totalCalls = N;
     const totalRuns = tree.length;
-    const errorNodes = allNodes.filter(n=>n.error || n.status === 'error');
-    const successNodes = allNodes.filter(n=>n.status === 'success');
-    const errorRate = totalCalls ? ((errorNodes.length / totalCalls) * 100) : 0;
-    const p50 = percentile(durationsMs, 50);
-    const p95 = percentile(durationsMs, 95);
-    const p99 = percentile(durationsMs, 99);
-    const latestMetrics = metrics.length ? metrics[metrics.length - 1] : null;
-    const missingEnd = allNodes.filter(n=>n.start_time && !n.end_time).length;
-
-    const fnMap = new Map();
-    const functionTraceTarget = new Map();
+    const F = fnNames.length;
+    const fnCalls = new Uint32Array(F);
+    const fnErrors = new Uint32Array(F);
+    const fnTotalMs = new Float64Array(F);
+    const fnMaxMs = new Float64Array(F);
+    const fnCpuS = new Float64Array(F);
+    const fnMemKb = new Float64Array(F);
+    const fnTargetIdx = new Int32Array(F).fill(-1);
+    const fnTargetDur = new Float64Array(F);
+    const durationsMs = [];
+    const errorIdx = [];
+    let successCount = 0;
+    let missingEnd = 0;
     let cpuTotal = 0;
     let memDeltaNet = 0;
     let memDeltaPositive = 0;
     let memDeltaNegative = 0;
     let memDeltaMax = 0;
-    const memModes = new Set();
-    allNodes.forEach(n=>{
-      const key = cleanFnName(n.function || n.call_id || 'unknown');
-      if(!fnMap.has(key)){
-        fnMap.set(key, { fn: key, calls: 0, totalMs: 0, errors: 0, maxMs: 0, cpuS: 0, memDeltaKb: 0 });
-      }
-      const row = fnMap.get(key);
-      row.calls += 1;
-      if(n.duration != null){
-        const ms = n.duration * 1000;
-        row.totalMs += ms;
-        row.maxMs = Math.max(row.maxMs, ms);
+    let minStart = Infinity;
+    let maxStart = -Infinity;
+    let maxEnd = -Infinity;
+    for(let i=0;i<N;i++){
+      const f = flags[i];
+      const k = fnIdx[i];
+      fnCalls[k] += 1;
+      if(f & NODE_HAS_DURATION){
+        const ms = duration[i] * 1000;
+        durationsMs.push(ms);
+        fnTotalMs[k] += ms;
+        if(ms > fnMaxMs[k]) fnMaxMs[k] = ms;
       }
-      if(n.cpu_time != null){
-        row.cpuS += Number(n.cpu_time) || 0;
-        cpuTotal += Number(n.cpu_time) || 0;
+      const cpu = cpuTime[i];
+      fnCpuS[k] += cpu;
+      cpuTotal += cpu;
+      const md = memDeltaKb[i];
+      fnMemKb[k] += md;
+      memDeltaNet += md;
+      if(md >= 0) memDeltaPositive += md; else memDeltaNegative += md;
+      if(md > memDeltaMax) memDeltaMax = md;
+      if(f & NODE_ERROR){
+        fnErrors[k] += 1;
+        errorIdx.push(i);
       }
-      if(n.mem_delta_kb != null){
-        const md = Number(n.mem_delta_kb) || 0;
-        row.memDeltaKb += md;
-        memDeltaNet += md;
-        if(md >= 0){
-          memDeltaPositive += md;
-        } else {
-          memDeltaNegative += md;
+      if(f & NODE_SUCCESS) successCount++;
+      if(f & NODE_MISSING_END) missingEnd++;
+      if(f & NODE_HAS_CALL_ID){
+        const d = (f & NODE_HAS_DURATION) ? duration[i] : 0;
+        if(fnTargetIdx[k] < 0 || d > fnTargetDur[k]){
+          fnTargetIdx[k] = i;
+          fnTargetDur[k] = d;
         }
-        memDeltaMax = Math.max(memDeltaMax, md);
       }
-      if(n.mem_mode){
-        memModes.add(String(n.mem_mode));
+      const st = startTime[i];
+      if(st){
+        if(st < minStart) minStart = st;
+        if(st > maxStart) maxStart = st;
       }
-      if(n.error || n.status === 'error') row.errors += 1;
-      if(n.call_id){
-        const prev = functionTraceTarget.get(key);
-        const duration = Number(n.duration) || 0;
-        if(!prev || duration > prev.duration){
-          functionTraceTarget.set(key, { call_id: n.call_id, duration });
-        }
+      const en = endTime[i];
+      if(en && en > maxEnd) maxEnd = en;
+    }
+    const errorCount = errorIdx.length;
+    const errorRate = totalCalls ? ((errorCount / totalCalls) * 100) : 0;
+    const [p50, p95, p99] = percentilesSorted(durationsMs, [50, 95, 99]);
+    const latestMetrics = metrics.length ? metrics[metrics.length - 1] : null;
+    const memModes = cols.memModes;
+
+    const fnRows = new Array(F);
+    const functionTraceTarget = new Map();
+    for(let k=0;k<F;k++){
+      fnRows[k] = { fn: fnNames[k], calls: fnCalls[k], totalMs: fnTotalMs[k], errors: fnErrors[k], maxMs: fnMaxMs[k], cpuS: fnCpuS[k], memDeltaKb: fnMemKb[k] };
+      if(fnTargetIdx[k] >= 0){
+        functionTraceTarget.set(fnNames[k], { call_id: allNodes[fnTargetIdx[k]].call_id, duration: fnTargetDur[k] });
       }
-    });
-    const hotspots = [...fnMap.values()]
+    }
+    const hotspots = [...fnRows]
       .sort((a,b)=> b.totalMs - a.totalMs)
       .slice(0, 12);
-    const cpuHotspots = [...fnMap.values()].sort((a,b)=> b.cpuS - a.cpuS).slice(0, 10);
-    const memHotspots = [...fnMap.values()].sort((a,b)=> b.memDeltaKb - a.memDeltaKb).slice(0, 10);
+    const cpuHotspots = [...fnRows].sort((a,b)=> b.cpuS - a.cpuS).slice(0, 10);
+    const memHotspots = [...fnRows].sort((a,b)=> b.memDeltaKb - a.memDeltaKb).slice(0, 10);
 
     const errMap = new Map();
-    errorNodes.forEach(n=>{
+    for(const i of errorIdx){
+      const n = allNodes[i];
       const sig = String(n.error || 'error').split('\\n')[0].slice(0, 140);
       if(!errMap.has(sig)) errMap.set(sig, { sig, count: 0, fn: cleanFnName(n.function || '-'), call_id: n.call_id || null });
       const row = errMap.get(sig);
       row.count += 1;
       if(!row.call_id && n.call_id) row.call_id = n.call_id;
-    });
+    }
     const errorSigs = [...errMap.values()].sort((a,b)=> b.count - a.count).slice(0, 12);
 
     const generated = generatedAt ? new Date(generatedAt*1000).toLocaleString() : '-';
@@ -1766,31 +2822,47 @@ class TraceViewerServer:
       ? 'Memory values are using peak RSS fallback on this platform/runtime. Deltas can overstate real-time memory movement and are best used as coarse signals.'
       : 'Memory values are based on current RSS snapshots. Compare SUM+, SUM-, and NET to distinguish bursty churn from sustained growth.';
 
-    const startTimes = allNodes.map(n=>n.start_time).filter(Boolean);
-    const endTimes = allNodes.map(n=>safeEnd(n)).filter(Boolean);
-    const spanSec = (startTimes.length && endTimes.length) ? Math.max(0, Math.max(...endTimes) - Math.min(...startTimes)) : 0;
+    const hasStarts = maxStart !== -Infinity;
+    const spanSec = (hasStarts && maxEnd !== -Infinity) ? Math.max(0, maxEnd - minStart) : 0;
     const callsPerMin = spanSec > 0 ? (totalCalls / (spanSec / 60)) : 0;
 
-    const refTs = startTimes.length ? Math.max(...startTimes) : (generatedAt || 0);
+    const refTs = hasStarts ? maxStart : (generatedAt || 0);
     const RECENT_WINDOW = 300; // 5 min
-    const recentNodes = allNodes.filter(n => (n.start_time || 0) >= (refTs - RECENT_WINDOW));
-    const previousNodes = allNodes.filter(n => (n.start_time || 0) < (refTs - RECENT_WINDOW) && (n.start_time || 0) >= (refTs - RECENT_WINDOW * 2));
-
-    const windowStats = (nodes) => {
-      const d = nodes.filter(n=>n.duration != null).map(n=>n.duration * 1000);
-      const errs = nodes.filter(n=>n.error || n.status === 'error').length;
-      const cpu = nodes.reduce((a,n)=>a + (Number(n.cpu_time)||0), 0);
+    const recentFrom = refTs - RECENT_WINDOW;
+    const previousFrom = refTs - RECENT_WINDOW * 2;
+    const recentIdx = [];
+    const previousIdx = [];
+    for(let i=0;i<N;i++){
+      const st = startTime[i];
+      if(st >= recentFrom) recentIdx.push(i);
+      else if(st >= previousFrom) previousIdx.push(i);
+    }
+
+    const windowStats = (idx) => {
+      const d = [];
+      let errs = 0;
+      let cpu = 0;
+      let sumMs = 0;
+      for(const i of idx){
+        if(flags[i] & NODE_HAS_DURATION){
+          const ms = duration[i] * 1000;
+          d.push(ms);
+          sumMs += ms;
+        }
+        if(flags[i] & NODE_ERROR) errs++;
+        cpu += cpuTime[i];
+      }
       return {
-        calls: nodes.length,
+        calls: idx.length,
         errors: errs,
-        errorRate: nodes.length ? (errs / nodes.length * 100) : 0,
-        avgMs: d.length ? d.reduce((a,b)=>a+b,0) / d.length : 0,
-        p95: percentile(d, 95) || 0,
+        errorRate: idx.length ? (errs / idx.length * 100) : 0,
+        avgMs: d.length ? sumMs / d.length : 0,
+        p95: percentilesSorted(d, [95])[0] || 0,
         cpu
       };
     };
-    const recent = windowStats(recentNodes);
-    const previous = windowStats(previousNodes);
+    const recent = windowStats(recentIdx);
+    const previous = windowStats(previousIdx);
 
     const trend = (cur, prev, higherIsBetter=true) => {
       if(!prev) return { txt: 'n/a', cls: 'flat' };
@@ -1801,10 +2873,11 @@ class TraceViewerServer:
       return { txt: `${sign}${pct.toFixed(1)}% vs prev`, cls: good ? 'up' : 'down' };
     };
 
-    const recentSlow = [...recentNodes]
-      .filter(n=>n.duration != null)
-      .sort((a,b)=> (b.duration||0) - (a.duration||0))
-      .slice(0, 10);
+    const recentSlow = recentIdx
+      .filter(i=> flags[i] & NODE_HAS_DURATION)
+      .sort((a,b)=> duration[b] - duration[a])
+      .slice(0, 10)
+      .map(i=> allNodes[i]);
 
     return `
       <div class="insight-panel">
@@ -1813,8 +2886,8 @@ class TraceViewerServer:
           <div class="overview-card"><div class="overview-label">Last updated ${infoTip('Timestamp of the latest parsed trace data. Use this to confirm the dashboard reflects current logs.')}</div><div class="overview-value">${generated}</div><div class="overview-sub">Live trace snapshot</div></div>
           <div class="overview-card"><div class="overview-label">Trace runs ${infoTip('Number of top-level trace roots. Useful for estimating how many independent workflows were captured.')}</div><div class="overview-value">${totalRuns}</div><div class="overview-sub">Top-level root traces</div></div>
           <div class="overview-card"><div class="overview-label">Total calls ${infoTip('Count of all parsed trace nodes (root + nested). Higher values indicate deeper or busier execution paths.')}</div><div class="overview-value">${totalCalls}</div><div class="overview-sub">All nodes parsed</div></div>
-          <div class="overview-card"><div class="overview-label">Success rate ${infoTip('Share of calls with successful completion status. Track this over time for service stability.')}</div><div class="overview-value">${totalCalls ? ((successNodes.length/totalCalls)*100).toFixed(1) : '0.0'}%</div><div class="overview-sub">${successNodes.length} successful calls</div></div>
-          <div class="overview-card"><div class="overview-label">Error rate ${infoTip('Share of calls marked as errors. Rising error rate can indicate regressions or environmental failures.')}</div><div class="overview-value" style="color:#fca5a5;">${errorRate.toFixed(1)}%</div><div class="overview-sub">${errorNodes.length} error calls</div></div>
+          <div class="overview-card"><div class="overview-label">Success rate ${infoTip('Share of calls with successful completion status. Track this over time for service stability.')}</div><div class="overview-value">${totalCalls ? ((successCount/totalCalls)*100).toFixed(1) : '0.0'}%</div><div class="overview-sub">${successCount} successful calls</div></div>
+          <div class="overview-card"><div class="overview-label">Error rate ${infoTip('Share of calls marked as errors. Rising error rate can indicate regressions or environmental failures.')}</div><div class="overview-value" style="color:#fca5a5;">${errorRate.toFixed(1)}%</div><div class="overview-sub">${errorCount} error calls</div></div>
           <div class="overview-card"><div class="overview-label">Latency p95 / p99 ${infoTip('Tail latency percentiles. p95 and p99 are strong indicators of user-facing slowdowns and outliers.')}</div><div class="overview-value">${p95==null?'-':p95.toFixed(1)} / ${p99==null?'-':p99.toFixed(1)} ms</div><div class="overview-sub">p50 ${p50==null?'-':p50.toFixed(1)} ms</div></div>
           <div class="overview-card"><div class="overview-label">Trace health ${infoTip('Calls that started but have no end timestamp. Persistent growth may indicate interrupted execution or incomplete logging.')}</div><div class="overview-value">${missingEnd}</div><div class="overview-sub">Calls missing end timestamp</div></div>
           <div class="overview-card"><div class="overview-label">Calls / min ${infoTip('Throughput estimate over the observed trace span. Useful for capacity monitoring and traffic comparisons.')}</div><div class="overview-value">${callsPerMin ? callsPerMin.toFixed(1) : '-'}</div><div class="overview-sub">Across ${(spanSec/60).toFixed(1)} min window</div></div>
@@ -1929,7 +3002,7 @@ class TraceViewerServer:
                   ${recentSlow.map(n=>{
                     const callId = n.call_id || '';
                     const hasTraceTarget = !!(callId && callToRunMap.has(callId));
-                    const fnText = escapeHtml(cleanFnName(n.function || n.call_id || '-'));
+                    const fnText = fnLabelHtml(n.function || n.call_id || '-');
                     const linkedFnText = hasTraceTarget
                       ? `<span class="function-name text-action" data-action="go-trace-from-log" data-call-id="${escapeAttr(callId)}">${fnText}</span>`
                       : `<span class="function-name">${fnText}</span>`;
@@ -2015,8 +3088,26 @@ class TraceViewerServer:
     const viewport = document.getElementById('run-viewport');
     viewport.addEventListener('scroll', ()=>{
       runScrollTop = viewport.scrollTop || 0;
-      renderRuns();
-    });
+      onNextFrame('runs', renderRuns);
+    }, { passive: true });
+  }
+
+  function runRowItem(run){
+    const time = run.start_time ? new Date(run.start_time*1000).toLocaleTimeString() : '-';
+    const hasError = !!(run.error || run.status === 'error');
+    const label = cleanFnName(run.function);
+    const sig = `${runCompact ? 1 : 0}|${hasError ? 1 : 0}|${time}|${label}`;
+    return [`r:${run.id}`, sig, ()=>{
+      const el = makeEl('div', `run-item ${runCompact ? 'compact' : 'comfy'}`);
+      el.dataset.action = 'select-run';
+      el.dataset.runId = run.id;
+      if(hasError) el.appendChild(makeEl('span', 'pill error')).textContent = 'error';
+      const grow = el.appendChild(makeEl('div', 'grow'));
+      grow.appendChild(makeEl('div')).textContent = label;
+      if(!runCompact) grow.appendChild(makeEl('div', 'muted')).textContent = run.id;
+      el.appendChild(makeEl('div', 'muted')).textContent = time;
+      return el;
+    }];
   }
 
   function renderRuns(){
@@ -2036,47 +3127,40 @@ class TraceViewerServer:
     const rowH = runCompact ? 38 : 56;
     const totalH = items.length * rowH;
     spacer.style.height = `${totalH}px`;
-    const viewH = viewport.clientHeight || 620;
+    const viewH = viewportHeight(viewport, 620, 'runs', renderRuns);
     const maxScroll = Math.max(0, totalH - viewH);
     if((runScrollTop || 0) > maxScroll){
       runScrollTop = maxScroll;
       viewport.scrollTop = maxScroll;
     }
-    const start = Math.max(0, Math.floor((runScrollTop || viewport.scrollTop || 0) / rowH) - 4);
+    const start = Math.max(0, Math.floor((runScrollTop || 0) / rowH) - 4);
     const end = Math.min(items.length, start + Math.ceil(viewH / rowH) + 8);
     const slice = items.slice(start, end);
     layer.style.transform = `translateY(${start * rowH}px)`;
-    layer.innerHTML = slice.map(item=>{
+    patchKeyed(layer, slice.map(item=>{
       if(item.kind === 'group'){
-        return `<div class="run-group" style="height:${rowH}px;">${escapeHtml(item.label)} (${item.count})</div>`;
+        return [`g:${item.label}`, `<div class="run-group ${runCompact ? 'compact' : 'comfy'}">${escapeHtml(item.label)} (${item.count})</div>`];
       }
-      const run = item.run;
-      const isActive = run.id === selectedRunId;
-      const time = run.start_time ? new Date(run.start_time*1000).toLocaleTimeString() : '-';
-      const errorBadge = run.error || run.status === 'error' ? '<span class="pill error">error</span>' : '';
-      return `
-        <div class="run-item ${isActive ? 'active' : ''} ${runCompact ? 'compact' : 'comfy'}" data-action="select-run" data-run-id="${escapeAttr(run.id)}" style="height:${rowH-6}px;">
-          ${errorBadge}
-          <div class="grow">
-            <div>${escapeHtml(cleanFnName(run.function))}</div>
-            ${runCompact ? '' : `<div class="muted">${escapeHtml(run.id)}</div>`}
-          </div>
-          <div class="muted">${time}</div>
-        </div>
-      `;
-    }).join('');
+      return runRowItem(item.run);
+    }));
     if(!selectedRunId && rawRuns.length) selectedRunId = rawRuns[0].id;
+    markSelected(layer, `r:${selectedRunId}`, 'active');
   }
 
-  function getPathSet(parentMap, targetId){
-    const s = new Set();
-    let cur = targetId;
-    while(cur && parentMap.has(cur)){
-      s.add(cur);
-      cur = parentMap.get(cur);
+  // Calls from the root down to targetId, as positions in flattenNodes(tree).
+  function ancestorPath(targetId){
+    const path = [];
+    let i = nodeIndex.has(targetId) ? nodeIndex.get(targetId) : -1;
+    while(i >= 0){
+      path.push(i);
+      i = treeParentIdx[i];
     }
-    if(cur) s.add(cur);
-    return s;
+    return path.reverse();
+  }
+
+  function getPathSet(targetId){
+    const flat = flattenNodes(tree);
+    return new Set(ancestorPath(targetId).map(i=> flat[i].call_id));
   }
 
   function renderSelectionStrip(){
@@ -2086,13 +3170,8 @@ class TraceViewerServer:
       selectionStripEl.innerHTML = '<span class="selection-path">No node selected</span>';
       return;
     }
-    const path = [];
-    let cur = node;
-    while(cur){
-      path.push(cleanFnName(cur.function || cur.call_id || '?'));
-      cur = traceMap.get(cur.parent_id);
-    }
-    path.reverse();
+    const flat = flattenNodes(tree);
+    const path = ancestorPath(selectedCallId).map(i=> cleanFnName(flat[i].function || flat[i].call_id || '?'));
     const canBack = historyIndex > 0;
     const canForward = historyIndex >= 0 && historyIndex < selectionHistory.length - 1;
     selectionStripEl.innerHTML = `
@@ -2104,49 +3183,146 @@ class TraceViewerServer:
     `;
   }
 
+  // The visible row list only depends on the display mask (tree, query and
+  // filters) plus the tree-panel controls; selection only matters in path
+  // focus. Renders that change none of these reuse the previous list.
+  let visibleMemo = { mask: null, key: '', value: [], index: null };
+  // Row position of a call in the visible list, -1 when it is not shown.
+  function visibleIndexOf(callId){
+    if(!visibleMemo.index){
+      const index = new Map();
+      visibleMemo.value.forEach((n, i)=> index.set(n.call_id, i));
+      visibleMemo.index = index;
+    }
+    const i = visibleMemo.index.get(callId);
+    return i === undefined ? -1 : i;
+  }
   function renderTraceTree(activeTree, q){
     const flat = flattenNodes(activeTree);
-    traceMap = new Map(flat.map(n=>[n.call_id, n]));
     if(!selectedCallId && flat.length) selectedCallId = flat[0].call_id || null;
-    if(selectedCallId && !traceMap.has(selectedCallId) && flat.length) selectedCallId = flat[0].call_id;
-    const parentMap = new Map(flat.map(n=>[n.call_id, n.parent_id]));
-    const pathSet = focusMode === 'path' ? getPathSet(parentMap, selectedCallId) : new Set();
-    const visible = flat.filter(n=>{
-      if((n.depth||0) > depthLimit) return false;
-      if(!shouldDisplay(n, q)) return false;
-      if(focusMode === 'errors' && !(n.error || n.status === 'error')) return false;
-      if(focusMode === 'slow' && !((n.duration||0) * 1000 >= slowThresholdMs)) return false;
-      if(focusMode === 'path' && !pathSet.has(n.call_id)) return false;
-      return true;
-    });
-    visibleTraceNodes = visible;
-    traceTreeEl.innerHTML = visible.map(n=>{
-      const depth = n.depth || 0;
-      const depthPad = 10 + (depth * 14);
-      const isSelected = n.call_id === selectedCallId;
-      const hasError = n.error || n.status === 'error';
-      const duration = n.duration != null ? fmtDuration(n.duration) : '-';
-      const shortId = (n.call_id || '-').slice(0, 8);
-      const start = n.start_time ? new Date(n.start_time*1000).toLocaleTimeString() : '-';
-      return `
-        <div class="trace-row ${isSelected ? 'selected' : ''} ${hasError ? 'error' : ''}" data-action="select-call" data-call-id="${escapeAttr(n.call_id || '')}" style="padding-left:${depthPad}px;" title="call_id=${escapeAttr(n.call_id || '')} parent_id=${escapeAttr(n.parent_id || '-')}">
-          <span class="trace-depth">d${depth}</span>
-          <span class="trace-main">
-            <span class="trace-fn">${escapeHtml(cleanFnName(n.function || n.call_id))}</span>
-            <span class="trace-id">${shortId}</span>
-          </span>
-          <span class="trace-meta">${duration}</span>
-          <span class="trace-meta">${start}</span>
-          ${hasError ? '<span class="pill error">error</span>' : ''}
-        </div>
-      `;
-    }).join('') || '<div class="muted">No trace nodes found for current filters.</div>';
+    if(selectedCallId && !inActiveTree(selectedCallId, activeTree) && flat.length) selectedCallId = flat[0].call_id;
+    const display = displayMask(activeTree, q);
+    const key = `${depthLimit}|${focusMode}|${slowThresholdMs}|${focusMode === 'path' ? selectedCallId : ''}`;
+    if(visibleMemo.mask !== display || visibleMemo.key !== key){
+      const pathSet = focusMode === 'path' ? getPathSet(selectedCallId) : new Set();
+      const visible = flat.filter((n, i)=>{
+        if((n.depth||0) > depthLimit) return false;
+        if(!display[i]) return false;
+        if(focusMode === 'errors' && !(n.error || n.status === 'error')) return false;
+        if(focusMode === 'slow' && !((n.duration||0) * 1000 >= slowThresholdMs)) return false;
+        if(focusMode === 'path' && !pathSet.has(n.call_id)) return false;
+        return true;
+      });
+      visibleMemo = { mask: display, key, value: visible, index: null };
+    }
+    visibleTraceNodes = visibleMemo.value;
+    renderTraceRows();
     renderSelectionStrip();
   }
 
+  function ensureTraceVirtualDom(){
+    if(document.getElementById('trace-layer')) return;
+    traceTreeEl.innerHTML = `
+      <div id="trace-spacer" class="virtual-spacer"></div>
+      <div id="trace-layer" class="virtual-layer"></div>
+    `;
+    traceTreeEl.addEventListener('scroll', ()=>{
+      traceScrollTop = traceTreeEl.scrollTop || 0;
+      onNextFrame('trace-rows', renderTraceRows);
+    }, { passive: true });
+  }
+
+  // Trace and run rows are hot on scroll: build them from DOM nodes filled
+  // through textContent, so no markup is parsed and nothing is escaped.
+  function makeEl(tag, className, children){
+    const el = document.createElement(tag);
+    if(className) el.className = className;
+    for(const child of children || []) el.appendChild(child);
+    return el;
+  }
+
+  let traceRowProto = null;
+  function traceRowItem(n){
+    const depth = n.depth || 0;
+    const hasError = !!(n.error || n.status === 'error');
+    const duration = n.duration != null ? fmtDuration(n.duration) : '-';
+    const start = n.start_time ? new Date(n.start_time*1000).toLocaleTimeString() : '-';
+    const callId = n.call_id || '';
+    const label = cleanFnName(n.function || n.call_id);
+    const sig = `${depth}|${hasError ? 1 : 0}|${duration}|${start}|${n.parent_id || ''}|${label}`;
+    return [`t:${callId}`, sig, ()=>{
+      if(!traceRowProto){
+        traceRowProto = makeEl('div', 'trace-row', [
+          makeEl('span', 'trace-depth'),
+          makeEl('span', 'trace-main', [makeEl('span', 'trace-fn'), makeEl('span', 'trace-id')]),
+          makeEl('span', 'trace-meta'),
+          makeEl('span', 'trace-meta'),
+        ]);
+        traceRowProto.dataset.action = 'select-call';
+      }
+      const el = traceRowProto.cloneNode(true);
+      const [depthEl, mainEl, durationEl, startEl] = el.children;
+      el.dataset.callId = callId;
+      el.style.paddingLeft = `${10 + (depth * 14)}px`;
+      el.title = `call_id=${callId} parent_id=${n.parent_id || '-'}`;
+      depthEl.textContent = `d${depth}`;
+      mainEl.children[0].textContent = label;
+      mainEl.children[1].textContent = (n.call_id || '-').slice(0, 8);
+      durationEl.textContent = duration;
+      startEl.textContent = start;
+      if(hasError){
+        el.classList.add('error');
+        el.appendChild(makeEl('span', 'pill error')).textContent = 'error';
+      }
+      return el;
+    }];
+  }
+
+  // Only rows intersecting the viewport (plus overscan) exist in the DOM; the
+  // spacer keeps the scrollbar geometry of the full list.
+  function renderTraceRows(){
+    ensureTraceVirtualDom();
+    const spacer = document.getElementById('trace-spacer');
+    const layer = document.getElementById('trace-layer');
+    const rows = visibleTraceNodes;
+    const totalH = rows.length * TRACE_ROW_H;
+    spacer.style.height = `${totalH}px`;
+    if(!rows.length){
+      layer.style.transform = 'translateY(0px)';
+      patchKeyed(layer, [['empty', '<div class="muted">No trace nodes found for current filters.</div>']]);
+      return;
+    }
+    const viewH = viewportHeight(traceTreeEl, 620, 'trace-rows', renderTraceRows);
+    // Work from the tracked offset: reading scrollTop right after the spacer
+    // write above would force a layout.
+    const maxScroll = Math.max(0, totalH - viewH);
+    if(traceScrollTop > maxScroll){
+      traceScrollTop = maxScroll;
+      traceTreeEl.scrollTop = maxScroll;
+    }
+    const start = Math.max(0, Math.floor(traceScrollTop / TRACE_ROW_H) - VIRTUAL_OVERSCAN);
+    const end = Math.min(rows.length, start + Math.ceil(viewH / TRACE_ROW_H) + (2 * VIRTUAL_OVERSCAN));
+    layer.style.transform = `translateY(${start * TRACE_ROW_H}px)`;
+    patchKeyed(layer, rows.slice(start, end).map(traceRowItem));
+    markSelected(layer, `t:${selectedCallId}`, 'selected');
+  }
+
+  // Keyboard moves can leave the virtualized window; scroll just enough to
+  // bring the row back before the next render captures scroll state.
+  function revealTraceRow(callId){
+    const idx = visibleIndexOf(callId);
+    if(idx < 0) return;
+    const top = idx * TRACE_ROW_H;
+    const viewH = viewportHeight(traceTreeEl, 620, 'trace-rows', renderTraceRows);
+    if(top < traceScrollTop) traceScrollTop = top;
+    else if(top + TRACE_ROW_H > traceScrollTop + viewH) traceScrollTop = top + TRACE_ROW_H - viewH;
+    else return;
+    traceTreeEl.scrollTop = traceScrollTop;
+  }
+
   function renderTraceDetails(activeTree){
     const flat = flattenNodes(activeTree);
-    const node = flat.find(n=>n.call_id === selectedCallId) || flat[0];
+    const node = (inActiveTree(selectedCallId, activeTree) && traceMap.get(selectedCallId)) || flat[0];
     if(!node){
       traceDetailsEl.innerHTML = '<div class="muted">Select a trace to see details.</div>';
       return;
@@ -2165,7 +3341,7 @@ class TraceViewerServer:
     traceDetailsEl.innerHTML = `
       <div class="detail-block">
         <div class="detail-title ${hasError ? 'error' : ''}">Overview</div>
-        <div class="kv"><strong>Function:</strong> ${escapeHtml(cleanFnName(node.function || '-'))}</div>
+        <div class="kv"><strong>Function:</strong> ${fnLabelHtml(node.function || '-')}</div>
         <div class="kv ${hasError ? 'error-kv' : ''}"><strong>Status:</strong> ${escapeHtml(node.status || '-')}</div>
         <div class="kv"><strong>Call ID:</strong> ${escapeHtml(node.call_id || '-')}</div>
         <div class="kv"><strong>Parent ID:</strong> ${escapeHtml(node.parent_id || '-')}</div>
@@ -2216,27 +3392,32 @@ class TraceViewerServer:
     const item = selectionHistory[historyIndex];
     selectedRunId = item.runId;
     selectedCallId = item.callId;
-    render();
+    scheduleRender();
   }
 
   function getFilteredNodes(q){
-    return flattenNodes(currentTree()).filter(n=>matchesNode(n, q));
+    return matchingNodes(currentTree(), q);
   }
 
   function render(){
+    // A synchronous render satisfies any render already queued for the frame.
+    cancelFrame('render');
     captureUiScrollState();
     syncControlState();
     const q = (searchEl.value||'').toLowerCase().trim();
     const activeTree = currentTree();
     overviewEl.innerHTML = '';
 
-    const overviewPanel = insightTab === 'overview' ? buildOverviewPanel() : '';
-    const metricsPanel = insightTab === 'metrics' ? buildMetricsPanel() : '';
+    const panels = panelInputs(activeTree, q);
+    const overviewPanel = insightTab === 'overview' ? memoPanel('overview', ...panels.overview) : '';
+    const metricsPanel = insightTab === 'metrics' ? memoPanel('metrics', ...panels.metrics) : '';
     const flamePanel = insightTab === 'flame' ? buildFlameGraph(activeTree, q) : '';
-    const issuesPanel = insightTab === 'issues' ? buildIssuesPanel(activeTree, q) : '';
+    const issuesPanel = insightTab === 'issues' ? memoPanel('issues', ...panels.issues) : '';
     const logsPanel = insightTab === 'logs' ? buildLogsPanel() : '';
 
-    rootEl.innerHTML = `
+    // Panes whose markup is unchanged keep their DOM (and scroll/expansion state).
+    patchKeyed(rootEl, [
+      ['tabs', `
       <div class="tab-row">
         <button class="tab-btn ${insightTab==='overview' ? 'active' : ''}" data-action="select-insight-tab" data-tab="overview">Overview</button>
         <button class="tab-btn ${insightTab==='flame' ? 'active' : ''}" data-action="select-insight-tab" data-tab="flame">Traces</button>
@@ -2250,16 +3431,18 @@ class TraceViewerServer:
             <button class="tab-btn ${metricsTab==='timeseries' ? 'active' : ''}" data-action="metrics-tab" data-tab="timeseries">Time series</button>
           </div>
         ` : ''}
-      </div>
-      <div class="${insightTab==='overview' ? '' : 'hidden-panel'}">${overviewPanel}</div>
-      <div id="traces-tab-pane" class="${insightTab==='flame' ? '' : 'hidden-panel'}">
+      </div>`],
+      ['overview', `<div class="${insightTab==='overview' ? '' : 'hidden-panel'}">${overviewPanel}</div>`],
+      ['flame', `<div id="traces-tab-pane" class="${insightTab==='flame' ? '' : 'hidden-panel'}">
         <div id="trace-settings-slot"></div>
         ${flamePanel}
-      </div>
-      <div class="${insightTab==='issues' ? '' : 'hidden-panel'}">${issuesPanel}</div>
-      <div class="${insightTab==='metrics' ? '' : 'hidden-panel'}">${metricsPanel}</div>
-      <div class="${insightTab==='logs' ? '' : 'hidden-panel'}">${logsPanel}</div>
-    `;
+      </div>`],
+      ['issues', `<div class="${insightTab==='issues' ? '' : 'hidden-panel'}">${issuesPanel}</div>`],
+      ['metrics', `<div class="${insightTab==='metrics' ? '' : 'hidden-panel'}">${metricsPanel}</div>`],
+      ['logs', `<div class="${insightTab==='logs' ? '' : 'hidden-panel'}">${logsPanel}</div>`],
+    ]);
+
+    flushDeferredTables();
 
     const traceSettingsSlot = document.getElementById('trace-settings-slot');
     if(traceSettingsEl && traceSettingsSlot && traceSettingsEl.parentElement !== traceSettingsSlot){
@@ -2274,6 +3457,7 @@ class TraceViewerServer:
     }
 
     if(insightTab === 'flame'){
+      drawFlameGraph();
       renderRuns();
       renderTraceTree(activeTree, q);
       renderTraceDetails(activeTree);
@@ -2283,6 +3467,7 @@ class TraceViewerServer:
       renderLogsRows();
     }
     restoreUiScrollState();
+    schedulePanelPrewarm();
     saveState();
   }
 
@@ -2310,19 +3495,159 @@ class TraceViewerServer:
     saveState();
   }
 
+  // Parse /api/tree.ndjson as it arrives: nodes come parents-first, so each
+  // one is attached to its parent the moment its line is complete.
+  const canStreamTree = typeof TextDecoderStream !== 'undefined';
+  async function readTreeStream(res){
+    const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+    const byId = new Map();
+    const roots = [];
+    let meta = {};
+    let buf = '';
+    const apply = (line) => {
+      if(!line) return;
+      const rec = JSON.parse(line);
+      if(rec.type === 'meta'){ meta = rec; return; }
+      const parent = rec.tree_parent != null ? byId.get(rec.tree_parent) : null;
+      delete rec.tree_parent;
+      rec.children = [];
+      byId.set(rec.call_id, rec);
+      (parent ? parent.children : roots).push(rec);
+    };
+    for(;;){
+      const { value, done } = await reader.read();
+      if(done) break;
+      buf += value;
+      let start = 0;
+      let nl;
+      while((nl = buf.indexOf('\\n', start)) >= 0){
+        apply(buf.slice(start, nl));
+        start = nl + 1;
+      }
+      buf = buf.slice(start);
+    }
+    apply(buf.trim());
+    return { ...meta, roots };
+  }
+
+  // Fetching, parsing and column building run in a worker when one can be
+  // started; its source is assembled from the same functions the main
+  // thread uses. Any worker failure falls back to the main thread for good.
+  function treeWorkerMain(){
+    self.onmessage = async (e)=>{
+      const { id, url, etag } = e.data;
+      try {
+        const res = await fetch(url, etag ? { headers: { 'If-None-Match': etag } } : undefined);
+        if(res.status === 304){
+          self.postMessage({ id, unchanged: true });
+          return;
+        }
+        const data = canStreamTree ? await readTreeStream(res) : await res.json();
+        const cols = buildNodeColumns(flattenInto(data.roots || [], 0, null, []));
+        delete cols.nodes;
+        const buffers = [cols.duration, cols.startTime, cols.endTime, cols.cpuTime, cols.memDeltaKb, cols.flags, cols.fnIdx].map(a=>a.buffer);
+        self.postMessage({ id, unchanged: false, etag: res.headers.get('ETag'), data, cols }, buffers);
+      } catch (err) {
+        self.postMessage({ id, error: String(err) });
+      }
+    };
+  }
+  let treeWorker = null;
+  let treeWorkerSeq = 0;
+  const treeWorkerWaiters = new Map();
+  function startTreeWorker(){
+    if(typeof Worker === 'undefined' || typeof Blob === 'undefined' || !window.URL || !URL.createObjectURL) return null;
+    const src = [
+      `const canStreamTree = ${canStreamTree};`,
+      `const LABEL_CACHE_MAX = ${LABEL_CACHE_MAX};`,
+      'const cleanNameCache = new Map();',
+      `const stripLocals = ${stripLocals.toString()};`,
+      `const NODE_ERROR = ${NODE_ERROR}, NODE_SUCCESS = ${NODE_SUCCESS}, NODE_HAS_DURATION = ${NODE_HAS_DURATION}, NODE_MISSING_END = ${NODE_MISSING_END}, NODE_HAS_CALL_ID = ${NODE_HAS_CALL_ID};`,
+      lruGet.toString(),
+      cleanFnName.toString(),
+      safeEnd.toString(),
+      flattenInto.toString(),
+      buildNodeColumns.toString(),
+      readTreeStream.toString(),
+      `(${treeWorkerMain.toString()})();`
+    ].join('\\n');
+    try {
+      const url = URL.createObjectURL(new Blob([src], { type: 'application/javascript' }));
+      const worker = new Worker(url);
+      URL.revokeObjectURL(url);
+      worker.onmessage = (e)=>{
+        const waiter = treeWorkerWaiters.get(e.data.id);
+        if(!waiter) return;
+        treeWorkerWaiters.delete(e.data.id);
+        if(e.data.error) waiter.reject(new Error(e.data.error));
+        else waiter.resolve(e.data);
+      };
+      worker.onerror = (e)=>{
+        e.preventDefault();
+        stopTreeWorker(new Error(e.message || 'tree worker failed'));
+      };
+      return worker;
+    } catch (_e) {
+      return null;
+    }
+  }
+  function stopTreeWorker(err){
+    if(treeWorker) treeWorker.terminate();
+    treeWorker = false;
+    for(const waiter of treeWorkerWaiters.values()) waiter.reject(err);
+    treeWorkerWaiters.clear();
+  }
+  async function fetchTreeOnMainThread(etag){
+    const res = await fetch(canStreamTree ? '/api/tree.ndjson' : '/api/tree', etag ? { headers: { 'If-None-Match': etag } } : undefined);
+    if(res.status === 304) return { unchanged: true };
+    const data = canStreamTree ? await readTreeStream(res) : await res.json();
+    return { unchanged: false, etag: res.headers.get('ETag'), data, cols: null };
+  }
+  async function loadTree(etag){
+    if(treeWorker === null) treeWorker = startTreeWorker() || false;
+    if(!treeWorker) return fetchTreeOnMainThread(etag);
+    const id = ++treeWorkerSeq;
+    const url = new URL(canStreamTree ? '/api/tree.ndjson' : '/api/tree', window.location.href).href;
+    try {
+      return await new Promise((resolve, reject)=>{
+        treeWorkerWaiters.set(id, { resolve, reject });
+        treeWorker.postMessage({ id, url, etag });
+      });
+    } catch (_e) {
+      stopTreeWorker(_e);
+      return fetchTreeOnMainThread(etag);
+    }
+  }
+
   async function fetchTree(){
     if(fetchTreeInFlight) return;
     fetchTreeInFlight = true;
     try {
     const shouldFetchLogs = (insightTab === 'logs') || logs.length === 0 || (logsFetchCounter % 3 === 0);
     logsFetchCounter += 1;
-    const [treeRes, logsRes] = await Promise.all([
-      fetch('/api/tree'),
+    const [treeResult, logsRes] = await Promise.all([
+      loadTree(treeEtag && lastTreeData ? treeEtag : null),
       shouldFetchLogs ? fetch('/api/logs?limit=2500&preview=1800') : Promise.resolve(null)
     ]);
-    const data = await treeRes.json();
+    const treeUnchanged = treeResult.unchanged;
     const logsData = logsRes ? await logsRes.json() : null;
-    tree = data.roots || [];
+    // Nothing new on either endpoint: keep the current render as-is.
+    if(treeUnchanged && !logsData) return;
+    const data = treeUnchanged ? lastTreeData : treeResult.data;
+    if(!treeUnchanged){
+      treeEtag = treeResult.etag;
+      lastTreeData = data;
+    }
+    const roots = data.roots || [];
+    if(roots !== tree){
+      tree = roots;
+      treeVersion += 1;
+      if(treeResult.cols) workerColumns = { version: treeVersion, cols: treeResult.cols };
+      // Logs-only refreshes keep the indexes, so per-run views (and every
+      // cache keyed on them) survive.
+      rebuildTreeIndexes();
+      renderFnTypeOptions();
+    }
     if(logsData){
       logs = logsData.logs || [];
       fullPayloadCache.clear();
@@ -2332,8 +3657,6 @@ class TraceViewerServer:
     total = data.total_nodes || 0;
     metrics = data.metrics || [];
     generatedAt = data.generated_at || null;
-    rebuildCallToRunMap();
-    renderFnTypeOptions();
     metaEl.textContent = `${generatedAt ? new Date(generatedAt*1000).toLocaleString() : ''} • ${data.log_file} • ${total} nodes • ${logs.length} logs`;
     if(!selectedRunId && tree.length) selectedRunId = tree[0].call_id || null;
     const runStillExists = selectedRunId ? !!getRunNode(selectedRunId) : false;
@@ -2397,46 +3720,57 @@ class TraceViewerServer:
     render();
   }
 
+  // Log filter controls are re-created with the logs pane, so their input and
+  // change events are handled once at the document (see the delegated
+  // listeners below); only scroll, which does not bubble, is bound here.
   function bindLogsControls(){
-    const logSearchEl = document.getElementById('log-search');
-    const logLevelEl = document.getElementById('log-level');
-    const logLinkEl = document.getElementById('log-link-filter');
-    const logViewModeEl = document.getElementById('log-view-mode');
-    const payloadModeEl = document.getElementById('payload-mode');
     const logsViewportEl = document.getElementById('logs-viewport');
     const logsListWrapEl = document.getElementById('logs-list-wrap');
     const logsDetailEl = document.getElementById('logs-detail-col');
-    if(logSearchEl) logSearchEl.oninput = (e)=>{
-      logQuery = e.target.value || '';
-      if(logSearchDebounce) clearTimeout(logSearchDebounce);
-      logSearchDebounce = setTimeout(()=>{ renderLogsOnly(); }, 140);
-    };
-    if(logLevelEl) logLevelEl.onchange = (e)=>{ logLevelFilter = e.target.value || 'all'; renderLogsOnly(); };
-    if(logLinkEl) logLinkEl.onchange = (e)=>{ logLinkFilter = e.target.value || 'all'; renderLogsOnly(); };
-    if(logViewModeEl) logViewModeEl.onchange = (e)=>{ logViewMode = e.target.value || 'console'; renderLogsOnly(); };
-    if(payloadModeEl) payloadModeEl.onchange = (e)=>{ payloadMode = e.target.value || 'pretty'; renderLogsOnly(); };
     if(logsViewportEl && !logsViewportEl.dataset.bound){
       logsViewportEl.dataset.bound = '1';
       logsViewportEl.addEventListener('scroll', ()=>{
         logScrollTop = logsViewportEl.scrollTop || 0;
-        renderLogsRows();
-      });
+        onNextFrame('log-rows', renderLogsRows);
+      }, { passive: true });
     }
     if(logsListWrapEl && !logsListWrapEl.dataset.bound){
       logsListWrapEl.dataset.bound = '1';
       logsListWrapEl.addEventListener('scroll', ()=>{
         logScrollTop = logsListWrapEl.scrollTop || 0;
-        renderLogsRows();
-      });
+        onNextFrame('log-rows', renderLogsRows);
+      }, { passive: true });
     }
     if(logsDetailEl && !logsDetailEl.dataset.bound){
       logsDetailEl.dataset.bound = '1';
       logsDetailEl.addEventListener('scroll', ()=>{
         logDetailScrollTop = logsDetailEl.scrollTop || 0;
-      });
+      }, { passive: true });
     }
   }
 
+  document.addEventListener('input', (e)=>{
+    const el = e.target;
+    if(!el || el.id !== 'log-search') return;
+    logQuery = el.value || '';
+    if(logSearchDebounce) clearTimeout(logSearchDebounce);
+    logSearchDebounce = setTimeout(()=>{ renderLogsOnly(); }, 140);
+  });
+
+  const logChangeHandlers = {
+    'log-level': (v)=>{ logLevelFilter = v || 'all'; },
+    'log-link-filter': (v)=>{ logLinkFilter = v || 'all'; },
+    'log-view-mode': (v)=>{ logViewMode = v || 'console'; },
+    'payload-mode': (v)=>{ payloadMode = v || 'pretty'; },
+  };
+  document.addEventListener('change', (e)=>{
+    const el = e.target;
+    const apply = el && logChangeHandlers[el.id];
+    if(!apply) return;
+    apply(el.value);
+    renderLogsOnly();
+  });
+
   document.addEventListener('click', (e)=>{
     const el = e.target && e.target.closest ? e.target.closest('[data-action]') : null;
     if(!el) return;
@@ -2512,7 +3846,7 @@ class TraceViewerServer:
       if(cur && cur.parent_id){
         selectedCallId = cur.parent_id;
         pushHistory(selectedRunId, selectedCallId);
-        render();
+        scheduleRender();
       }
       return;
     }
@@ -2532,7 +3866,7 @@ class TraceViewerServer:
 
   function setStatusFilter(val){
     statusFilter = val;
-    render();
+    scheduleRender();
   }
 
   statusFilterGroup.addEventListener('click', (e)=>{
@@ -2541,13 +3875,16 @@ class TraceViewerServer:
     }
   });
 
-  searchEl.addEventListener('input', render);
+  searchEl.addEventListener('input', ()=>{
+    if(searchDebounce) clearTimeout(searchDebounce);
+    searchDebounce = setTimeout(scheduleRender, 80);
+  });
   refreshBtn.addEventListener('click', fetchTree);
-  minDurationEl.addEventListener('input', (e)=>{ minDurationMs = Number(e.target.value || 0); render(); });
-  fnTypeEl.addEventListener('change', (e)=>{ fnTypeFilter = e.target.value || 'all'; render(); });
-  sortModeEl.addEventListener('change', (e)=>{ sortMode = e.target.value || 'start'; render(); });
-  togglePayloadsEl.addEventListener('change', (e)=>{ showPayloads = !!e.target.checked; render(); });
-  runSearchEl.addEventListener('input', (e)=>{ runQuery = e.target.value || ''; renderRuns(); saveState(); });
+  minDurationEl.addEventListener('input', (e)=>{ minDurationMs = Number(e.target.value || 0); scheduleRender(); });
+  fnTypeEl.addEventListener('change', (e)=>{ fnTypeFilter = e.target.value || 'all'; scheduleRender(); });
+  sortModeEl.addEventListener('change', (e)=>{ sortMode = e.target.value || 'start'; scheduleRender(); });
+  togglePayloadsEl.addEventListener('change', (e)=>{ showPayloads = !!e.target.checked; scheduleRender(); });
+  runSearchEl.addEventListener('input', (e)=>{ runQuery = e.target.value || ''; onNextFrame('runs', renderRuns); saveState(); });
   runGroupEl.addEventListener('change', (e)=>{ runGroupBy = e.target.value || 'none'; renderRuns(); saveState(); });
   runCompactEl.addEventListener('change', (e)=>{ runCompact = !!e.target.checked; renderRuns(); saveState(); });
   autoRefreshEl.addEventListener('change', (e)=>{
@@ -2555,10 +3892,10 @@ class TraceViewerServer:
     if(autoRefreshEnabled) scheduleRefresh(true); else if(refreshTimer) clearInterval(refreshTimer);
     saveState();
   });
-  focusModeEl.addEventListener('change', (e)=>{ focusMode = e.target.value || 'all'; render(); });
-  depthLimitEl.addEventListener('input', (e)=>{ depthLimit = Math.max(0, Number(e.target.value || 0)); render(); });
-  expandDepthEl.addEventListener('click', ()=>{ depthLimit = Math.min(999, depthLimit + 1); depthLimitEl.value = depthLimit; render(); });
-  collapseAllEl.addEventListener('click', ()=>{ depthLimit = 1; depthLimitEl.value = depthLimit; render(); });
+  focusModeEl.addEventListener('change', (e)=>{ focusMode = e.target.value || 'all'; scheduleRender(); });
+  depthLimitEl.addEventListener('input', (e)=>{ depthLimit = Math.max(0, Number(e.target.value || 0)); scheduleRender(); });
+  expandDepthEl.addEventListener('click', ()=>{ depthLimit = Math.min(999, depthLimit + 1); depthLimitEl.value = depthLimit; scheduleRender(); });
+  collapseAllEl.addEventListener('click', ()=>{ depthLimit = 1; depthLimitEl.value = depthLimit; scheduleRender(); });
   copyFilteredEl.addEventListener('click', ()=>{
     const q = (searchEl.value||'').toLowerCase().trim();
     window.__copyText(JSON.stringify(getFilteredNodes(q), null, 2));
@@ -2568,19 +3905,28 @@ class TraceViewerServer:
     const t = e.target;
     if(t && (t.tagName === 'INPUT' || t.tagName === 'TEXTAREA' || t.tagName === 'SELECT')) return;
     if(!visibleTraceNodes.length) return;
-    const idx = visibleTraceNodes.findIndex(n=>n.call_id === selectedCallId);
+    const idx = visibleIndexOf(selectedCallId);
     if(e.key === 'j' || e.key === 'ArrowDown'){
       const next = visibleTraceNodes[Math.min(visibleTraceNodes.length - 1, Math.max(0, idx + 1))];
-      if(next){ selectedCallId = next.call_id; pushHistory(selectedRunId, selectedCallId); render(); e.preventDefault(); }
+      if(next){ selectedCallId = next.call_id; pushHistory(selectedRunId, selectedCallId); revealTraceRow(selectedCallId); scheduleRender(); e.preventDefault(); }
     } else if(e.key === 'k' || e.key === 'ArrowUp'){
       const prev = visibleTraceNodes[Math.max(0, idx - 1)];
-      if(prev){ selectedCallId = prev.call_id; pushHistory(selectedRunId, selectedCallId); render(); e.preventDefault(); }
+      if(prev){ selectedCallId = prev.call_id; pushHistory(selectedRunId, selectedCallId); revealTraceRow(selectedCallId); scheduleRender(); e.preventDefault(); }
     } else if(e.key === 'h' || e.key === 'ArrowLeft'){
       const cur = traceMap.get(selectedCallId);
-      if(cur && cur.parent_id){ selectedCallId = cur.parent_id; pushHistory(selectedRunId, selectedCallId); render(); e.preventDefault(); }
+      if(cur && cur.parent_id){ selectedCallId = cur.parent_id; pushHistory(selectedRunId, selectedCallId); revealTraceRow(selectedCallId); scheduleRender(); e.preventDefault(); }
     } else if(e.key === 'l' || e.key === 'ArrowRight'){
-      const child = visibleTraceNodes.find(n=>n.parent_id === selectedCallId);
-      if(child){ selectedCallId = child.call_id; pushHistory(selectedRunId, selectedCallId); render(); e.preventDefault(); }
+      // Children follow their parent in pre-order: only scan its subtree.
+      let child = null;
+      if(idx >= 0){
+        const depth = visibleTraceNodes[idx].depth || 0;
+        for(let i=idx+1;i<visibleTraceNodes.length && (visibleTraceNodes[i].depth || 0) > depth;i++){
+          if(visibleTraceNodes[i].parent_id === selectedCallId){ child = visibleTraceNodes[i]; break; }
+        }
+      } else {
+        child = visibleTraceNodes.find(n=>n.parent_id === selectedCallId) || null;
+      }
+      if(child){ selectedCallId = child.call_id; pushHistory(selectedRunId, selectedCallId); revealTraceRow(selectedCallId); scheduleRender(); e.preventDefault(); }
     }
   });
 
@@ -2592,11 +3938,15 @@ class TraceViewerServer:
   }
 
   window.addEventListener('resize', ()=>{
-    renderRuns();
+    onNextFrame('runs', renderRuns);
+    if(insightTab === 'flame'){
+      onNextFrame('trace-rows', renderTraceRows);
+      onNextFrame('flame', drawFlameGraph);
+    }
     if(insightTab === 'logs'){
-      renderLogsRows();
+      onNextFrame('log-rows', renderLogsRows);
     }
-  });
+  }, { passive: true });
 
   loadState();
   syncControlState();
@@ -2606,12 +3956,62 @@ class TraceViewerServer:
             """
         ).strip()
 
+    def _refresh_snapshot(self) -> tuple[Optional[str], Dict[str, Any]]:
+        """Rebuild the tree snapshot if the log or sidecar changed, and return it."""
+        etag = self._builder.tree_etag()
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+        if snapshot is not None and snapshot[0] == etag:
+            return snapshot
+        snapshot = (etag, self._builder.build_tree())
+        with self._snapshot_lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def _tree_snapshot(self) -> tuple[Optional[str], Dict[str, Any]]:
+        refresher = self._refresher
+        if refresher is not None and refresher.is_alive():
+            with self._snapshot_lock:
+                snapshot = self._snapshot
+            if snapshot is not None:
+                return snapshot
+        # No refresher running (or no snapshot yet): refresh on demand.
+        return self._refresh_snapshot()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._refresh_snapshot()
+            except Exception:
+                # Keep serving the last good snapshot; retry next tick.
+                pass
+            self._stop.wait(self.refresh_interval)
+
+    def start_refresher(self) -> None:
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        self._stop.clear()
+        self._refresh_snapshot()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, name="pyeztrace-viewer-refresh", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        self._stop.set()
+        refresher = self._refresher
+        if refresher is not None:
+            refresher.join(timeout=max(1.0, self.refresh_interval * 2))
+        self._refresher = None
+
     def serve_forever(self) -> None:
         self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler_factory())
         print(f"PyEzTrace Viewer serving on http://{self.host}:{self.port} (reading {self.log_file})")
+        self.start_refresher()
         try:
             self._httpd.serve_forever()
         except KeyboardInterrupt:
             pass
         finally:
+            self.stop_refresher()
             self._httpd.server_close()
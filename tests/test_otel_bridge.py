@@ -3,6 +3,7 @@ import json
 import queue
 import sys
 import threading
+import time
 import types
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
@@ -312,6 +313,42 @@ def test_otlp_exporter_google_bearer_fallback_refreshes_token_per_export(monkeyp
     assert created["credentials"].refresh_calls == 3
 
 
+def test_google_bearer_exporter_reuses_token_until_near_expiry(monkeypatch):
+    import datetime
+
+    class FakeInner:
+        def __init__(self):
+            self._headers = {"Authorization": "Bearer unit-token-1"}
+            self.seen = []
+
+        def export(self, _spans):
+            self.seen.append(self._headers.get("Authorization"))
+            return True
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    creds = types.SimpleNamespace(token="unit-token-1", expiry=now + datetime.timedelta(hours=1))
+    refreshes = []
+
+    def fake_refresh(credentials):
+        refreshes.append(credentials)
+        credentials.token = f"unit-token-{len(refreshes) + 1}"
+        credentials.expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        return credentials.token, None
+
+    monkeypatch.setattr(otel, "_refresh_google_access_token", fake_refresh)
+
+    inner = FakeInner()
+    exporter = otel._RefreshingGoogleBearerSpanExporter(inner, creds, token="unit-token-1")
+    exporter.export([])
+    exporter.export([])
+    assert refreshes == []
+
+    exporter._token_expiry = time.time() + 30
+    exporter.export([])
+    assert len(refreshes) == 1
+    assert inner.seen == ["Bearer unit-token-1", "Bearer unit-token-1", "Bearer unit-token-2"]
+
+
 def test_otel_init_failure_surfaces_diagnostic_and_status(monkeypatch):
     Setup.initialize("BROKEN_OTEL_APP", show_metrics=False)
     monkeypatch.setenv("EZTRACE_OTEL_ENABLED", "true")
@@ -481,3 +518,183 @@ def test_azure_exporter_uploads_span_batch(monkeypatch):
     records = [json.loads(line) for line in content if line]
     assert any(record["name"] == "test_azure_span" for record in records)
     assert uploads[0]["content_type"] == "application/json"
+
+
+def test_env_flags_are_cached_until_cleared(monkeypatch):
+    monkeypatch.setenv("EZTRACE_OTEL_DEBUG", "true")
+    assert otel._otel_debug_enabled() is True
+
+    monkeypatch.setenv("EZTRACE_OTEL_DEBUG", "false")
+    assert otel._otel_debug_enabled() is True
+
+    otel.clear_env_cache()
+    assert otel._otel_debug_enabled() is False
+
+
+def test_disabled_start_span_skips_diagnostics(monkeypatch):
+    stderr = io.StringIO()
+    monkeypatch.setattr(sys, "__stderr__", stderr)
+
+    with otel.start_span("disabled-span") as span:
+        assert span is None
+
+    assert otel._state.resolved is True
+    assert otel._state.noop is True
+    assert not set(otel._DIAGNOSTIC_ONCE_KEYS) - {"otel-disabled"}
+    assert stderr.getvalue() == ""
+
+
+def test_span_to_dict_keeps_json_safe_attributes():
+    class Ctx:
+        trace_id = 1
+        span_id = 2
+
+    class FakeSpan:
+        name = "attrs"
+        parent = None
+        events = []
+        attributes = {"s": "x", "n": 3, "seq": ("a", "b"), "obj": object()}
+
+        def get_span_context(self):
+            return Ctx()
+
+    data = otel._span_to_dict(FakeSpan())
+    assert data["trace_id"] == "0" * 31 + "1"
+    assert data["span_id"] == "0" * 15 + "2"
+    assert data["parent_span_id"] == ""
+    assert data["attributes"]["s"] == "x"
+    assert data["attributes"]["n"] == 3
+    assert data["attributes"]["seq"] == ["a", "b"]
+    assert isinstance(data["attributes"]["obj"], str)
+    json.dumps(data)
+
+
+def test_batch_serialize_streams_gzip_lines(monkeypatch):
+    import gzip
+
+    monkeypatch.setenv("EZTRACE_GZIP_LEVEL", "1")
+    exporter = otel._BaseJsonBatchExporter()
+    assert exporter.compress is True
+    assert exporter.compress_level == 1
+
+    class Named:
+        def __init__(self, name):
+            self.name = name
+
+    body = exporter._serialize([Named("a"), Named("b")])
+    lines = gzip.decompress(body).split(b"\n")
+    assert [json.loads(line)["name"] for line in lines] == ["a", "b"]
+
+
+def test_exporter_aliases_resolve_to_canonical_names():
+    assert otel._canonical_exporter(" Google-Cloud ") == "gcp"
+    assert otel._canonical_exporter("stdout") == "console"
+    assert otel._canonical_exporter("otlp-http") == "otlp"
+    assert otel._canonical_exporter("custom") == "custom"
+    assert otel._resolve_otlp_endpoint("google") == "https://telemetry.googleapis.com/v1/traces"
+
+
+def test_start_span_degrades_when_span_context_fails_to_enter():
+    class BrokenCM:
+        def __enter__(self):
+            raise RuntimeError("boom")
+
+        def __exit__(self, *exc):
+            return False
+
+    class FakeTracer:
+        def start_as_current_span(self, name, attributes=None):  # noqa: ARG002
+            return BrokenCM()
+
+    otel._state.resolved = True
+    otel._state.enabled = True
+    otel._state.tracer = otel._state.active_tracer = FakeTracer()
+
+    with otel.start_span("broken") as span:
+        assert span is None
+
+    with pytest.raises(ValueError):
+        with otel.start_span("broken"):
+            raise ValueError("user error")
+
+
+def test_parse_headers_keeps_equals_in_values_and_skips_junk():
+    parsed = otel._parse_headers(" x-tenant = abc ,junk, authorization=Bearer a==,empty=")
+    assert parsed == {"x-tenant": "abc", "authorization": "Bearer a==", "empty": ""}
+    # Each call returns a fresh dict so callers can mutate it safely.
+    assert otel._parse_headers("k=v") is not otel._parse_headers("k=v")
+
+
+def test_google_adc_lookup_is_shared_and_memoized(monkeypatch):
+    calls = []
+
+    def fake_default(scopes=None):
+        calls.append(scopes)
+        return object(), "unit-project"
+
+    google_module = types.ModuleType("google")
+    google_auth_module = types.ModuleType("google.auth")
+    google_auth_module.default = fake_default
+    google_module.auth = google_auth_module
+    monkeypatch.setitem(sys.modules, "google", google_module)
+    monkeypatch.setitem(sys.modules, "google.auth", google_auth_module)
+
+    assert otel._resolve_gcp_project_id() == "unit-project"
+    credentials, err = otel._load_google_credentials()
+    assert err is None and credentials is not None
+    assert otel._resolve_gcp_project_id() == "unit-project"
+    assert len(calls) == 1
+
+
+def test_diagnostic_once_keys_are_bounded(monkeypatch):
+    monkeypatch.setattr(sys, "__stderr__", io.StringIO())
+    monkeypatch.setattr(otel, "_DIAGNOSTIC_ONCE_MAX_KEYS", 3)
+
+    for i in range(5):
+        otel._emit_diagnostic(f"msg {i}", once_key=f"key-{i}")
+
+    assert list(otel._DIAGNOSTIC_ONCE_KEYS) == ["key-2", "key-3", "key-4"]
+
+
+def test_batch_exporter_uploads_off_thread_and_reports_failures(monkeypatch):
+    stderr = io.StringIO()
+    monkeypatch.setattr(sys, "__stderr__", stderr)
+    monkeypatch.setenv("EZTRACE_EXPORT_WORKERS", "2")
+
+    uploaded = []
+
+    class RecordingExporter(otel._BaseJsonBatchExporter):
+        def _upload(self, name, body):
+            if name == "bad":
+                raise RuntimeError("upload rejected")
+            uploaded.append((name, threading.current_thread().name))
+
+    exporter = RecordingExporter()
+    exporter._submit_upload("good", b"{}")
+    exporter._submit_upload("bad", b"{}")
+    assert exporter.force_flush() is True
+    assert exporter.shutdown() is True
+
+    assert uploaded[0][0] == "good"
+    assert uploaded[0][1].startswith("pyeztrace-export")
+    assert "upload rejected" in stderr.getvalue()
+    assert otel._state.error == "Span export failed: upload rejected"
+
+
+def test_batch_exporter_uploads_inline_after_shutdown(monkeypatch):
+    monkeypatch.setenv("EZTRACE_EXPORT_WORKERS", "2")
+
+    uploaded = []
+
+    class RecordingExporter(otel._BaseJsonBatchExporter):
+        def _upload(self, name, body):
+            uploaded.append((name, threading.current_thread().name))
+
+    exporter = RecordingExporter()
+    exporter._submit_upload("before", b"{}")
+    assert exporter.shutdown() is True
+
+    exporter._submit_upload("after", b"{}")
+
+    assert exporter._executor is None
+    assert uploaded[-1] == ("after", threading.current_thread().name)
@@ -22,4 +22,67 @@ def test_increment_decrement_level():
 def test_double_initialize_raises():
     setup.Setup.initialize("EZTRACER_TEST3", show_metrics=False)
     with pytest.raises(exceptions.SetupAlreadyDoneError):
-        setup.Setup.initialize("EZTRACER_TEST3", show_metrics=False)
\ No newline at end of file
+        setup.Setup.initialize("EZTRACER_TEST3", show_metrics=False)
+
+def test_async_accessors_work_across_event_loops():
+    import asyncio
+
+    async def bump():
+        await setup.Setup.async_increment_level()
+        level = await setup.Setup.async_get_level()
+        await setup.Setup.async_decrement_level()
+        return level
+
+    setup.Setup.initialize("EZTRACER_ASYNC", show_metrics=False)
+    # No loop-bound primitives live on Setup, so separate loops must both work.
+    with pytest.deprecated_call():
+        assert asyncio.run(bump()) == 1
+        assert asyncio.run(bump()) == 1
+        assert asyncio.run(setup.Setup.async_get_project()) == "EZTRACER_ASYNC"
+
+def test_decrement_level_with_token_restores_previous_depth():
+    setup.Setup.initialize("EZTRACER_TOKEN", show_metrics=False)
+    outer = setup.Setup.increment_level()
+    inner = setup.Setup.increment_level()
+    assert setup.Setup.get_level() == 2
+    setup.Setup.decrement_level(inner)
+    assert setup.Setup.get_level() == 1
+    setup.Setup.decrement_level(outer)
+    assert setup.Setup.get_level() == 0
+    # A spent token falls back to a plain decrement instead of raising.
+    setup.Setup.increment_level()
+    setup.Setup.decrement_level(outer)
+    assert setup.Setup.get_level() == 0
+
+def test_project_name_is_interned():
+    import sys
+
+    setup.Setup.initialize("eztracer_interned", show_metrics=False)
+    assert setup.Setup.get_project() is sys.intern("EZTRACER_INTERNED")
+    setup.Setup.set_project("renamed_project")
+    assert setup.Setup.get_project() is sys.intern("RENAMED_PROJECT")
+
+def test_hot_path_readers_do_not_take_the_config_lock():
+    import threading
+
+    setup.Setup.initialize("EZTRACER_LOCK_FREE", show_metrics=False)
+    done = threading.Event()
+
+    def readers():
+        token = setup.Setup.increment_level()
+        setup.Setup.get_level()
+        setup.Setup.decrement_level(token)
+        setup.Setup.get_project()
+        setup.Setup.is_setup_done()
+        setup.Setup.is_testing_mode()
+        setup.Setup.capture_log({"message": "ignored"})
+        setup.Setup.get_disable_file_logging()
+        setup.Setup.get_show_metrics()
+        done.set()
+
+    # If any reader took the config lock, it would block while we hold it.
+    with setup.Setup._Setup__config_lock:
+        worker = threading.Thread(target=readers, daemon=True)
+        worker.start()
+        assert done.wait(timeout=2.0)
+    worker.join()
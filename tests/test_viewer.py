@@ -0,0 +1,407 @@
+import json
+import os
+
+from pyeztrace.viewer import _TraceTreeBuilder
+
+
+def _entry(call_id, event, parent_id=None, function="fn", ts="2024-01-01T00:00:00", **data):
+    payload = {"call_id": call_id, "event": event, **data}
+    if parent_id:
+        payload["parent_id"] = parent_id
+    return {
+        "timestamp": ts,
+        "level": "INFO",
+        "project": "VIEWER",
+        "fn_type": "sync",
+        "function": function,
+        "message": f"{function} {event}",
+        "data": payload,
+    }
+
+
+def _write(path, entries, mode="w"):
+    with open(path, mode, encoding="utf-8") as fh:
+        for e in entries:
+            fh.write(json.dumps(e) + "\n")
+
+
+def test_build_tree_reuses_result_until_log_changes(tmp_path):
+    log = tmp_path / "trace.log"
+    _write(log, [_entry("a", "start", time_epoch=1.0), _entry("a", "end", time_epoch=2.0)])
+    builder = _TraceTreeBuilder(log)
+
+    first = builder.build_tree()
+    assert first["total_nodes"] == 1
+    second = builder.build_tree()
+    # Same underlying roots object: nothing was rebuilt.
+    assert second["roots"] is first["roots"]
+    assert second["generated_at"] >= first["generated_at"]
+
+    _write(log, [_entry("b", "start", parent_id="a", time_epoch=3.0)], mode="a")
+    st = log.stat()
+    os.utime(log, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    third = builder.build_tree()
+    assert third["roots"] is not first["roots"]
+    assert third["total_nodes"] == 2
+    assert [c["call_id"] for c in third["roots"][0]["children"]] == ["b"]
+
+
+def test_ingest_parses_only_appended_bytes_and_resets_on_truncation(tmp_path):
+    log = tmp_path / "trace.log"
+    _write(log, [_entry("a", "start", time_epoch=1.0)])
+    builder = _TraceTreeBuilder(log)
+    assert builder.build_tree()["roots"][0]["status"] == "running"
+
+    # A partial line is held back until its newline arrives.
+    line = json.dumps(_entry("a", "end", time_epoch=2.0))
+    with open(log, "a", encoding="utf-8") as fh:
+        fh.write(line[:10])
+    assert len(builder._read_entries_cached()) == 1
+    with open(log, "a", encoding="utf-8") as fh:
+        fh.write(line[10:] + "\n")
+    tree = builder.build_tree()
+    assert tree["roots"][0]["status"] == "success"
+    assert tree["roots"][0]["end_time"] == 2.0
+
+    _write(log, [_entry("z", "start", time_epoch=5.0)])
+    tree = builder.build_tree()
+    assert [r["call_id"] for r in tree["roots"]] == ["z"]
+    assert len(builder._read_entries_cached()) == 1
+
+
+def test_build_tree_handles_chains_deeper_than_recursion_limit(tmp_path):
+    import sys
+
+    depth = sys.getrecursionlimit() + 200
+    log = tmp_path / "trace.log"
+    _write(log, [_entry(f"n{i}", "start", parent_id=f"n{i - 1}" if i else None) for i in range(depth)])
+    tree = _TraceTreeBuilder(log).build_tree()
+
+    assert tree["total_nodes"] == depth
+    node, seen = tree["roots"][0], 1
+    while node["children"]:
+        node, seen = node["children"][0], seen + 1
+    assert seen == depth
+
+
+def _serve(log):
+    import threading
+    from http.server import ThreadingHTTPServer
+
+    from pyeztrace.viewer import TraceViewerServer
+
+    viewer = TraceViewerServer(log, port=0)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), viewer._handler_factory())
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def test_api_tree_is_streamed_chunked(tmp_path, monkeypatch):
+    import http.client
+
+    from pyeztrace import viewer
+
+    # The chunked path is the stdlib fallback used when orjson is absent.
+    monkeypatch.setattr(viewer, "orjson", None)
+    log = tmp_path / "trace.log"
+    _write(log, [_entry(f"c{i}", "start", parent_id="root" if i else None) for i in range(500)])
+    httpd = _serve(log)
+    try:
+        conn = http.client.HTTPConnection(*httpd.server_address)
+        conn.request("GET", "/api/tree")
+        resp = conn.getresponse()
+        assert resp.status == 200
+        assert resp.getheader("Transfer-Encoding") == "chunked"
+        data = json.loads(resp.read())
+        assert data["total_nodes"] == 501
+        # The connection stays usable for a follow-up request.
+        conn.request("GET", "/api/logs")
+        assert json.loads(conn.getresponse().read())["total_entries"] == 500
+        conn.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_json_bytes_falls_back_to_stdlib_for_values_orjson_rejects():
+    from pyeztrace.viewer import _json_bytes
+
+    big = 2**70
+    assert json.loads(_json_bytes({"v": big, "s": "é"})) == {"v": big, "s": "é"}
+
+
+def test_non_entry_lines_are_skipped_without_parsing(tmp_path, monkeypatch):
+    from pyeztrace import viewer
+
+    log = tmp_path / "trace.log"
+    with open(log, "w", encoding="utf-8") as fh:
+        fh.write("Traceback (most recent call last):\n")
+        fh.write('{"unrelated": true}\n')
+        fh.write(json.dumps(_entry("a", "start")) + "\n")
+        fh.write("{not json \"timestamp\" \"level\"\n")
+
+    calls = []
+    real_loads = viewer._loads
+    monkeypatch.setattr(viewer, "_loads", lambda s: calls.append(s) or real_loads(s))
+    entries = viewer._TraceTreeBuilder(log)._read_entries_cached()
+
+    assert [e["data"]["call_id"] for e in entries] == ["a"]
+    assert len(calls) == 2
+
+
+def test_to_epoch_caches_valid_timestamps_only(tmp_path):
+    from pyeztrace.viewer import _parse_timestamp
+
+    builder = _TraceTreeBuilder(tmp_path / "trace.log")
+    _parse_timestamp.cache_clear()
+    first = builder._to_epoch("2024-01-01T00:00:00")
+    assert builder._to_epoch("2024-01-01T00:00:00") == first
+    assert _parse_timestamp.cache_info().hits == 1
+
+    # Malformed timestamps fall back to "now" and are never memoized.
+    assert builder._to_epoch("garbage") > first
+    assert _parse_timestamp.cache_info().currsize == 1
+
+
+def test_roots_track_late_parent_links(tmp_path):
+    log = tmp_path / "trace.log"
+    # The child is seen before its parent link is known.
+    _write(log, [
+        _entry("child", "start"),
+        _entry("other", "start"),
+        _entry("child", "end", parent_id="parent"),
+        _entry("parent", "start"),
+    ])
+    tree = _TraceTreeBuilder(log).build_tree()
+
+    assert [r["call_id"] for r in tree["roots"]] == ["other", "parent"]
+    parent = tree["roots"][1]
+    assert [c["call_id"] for c in parent["children"]] == ["child"]
+
+
+def test_ingest_falls_back_to_read_when_mmap_fails(tmp_path, monkeypatch):
+    from pyeztrace import viewer
+
+    def refuse(*args, **kwargs):
+        raise OSError("not mappable")
+
+    monkeypatch.setattr(viewer.mmap, "mmap", refuse)
+    log = tmp_path / "trace.log"
+    _write(log, [_entry("a", "start"), _entry("b", "start")])
+    with open(log, "a", encoding="utf-8") as fh:
+        fh.write('{"timestamp": "partial')
+    builder = viewer._TraceTreeBuilder(log)
+
+    assert len(builder._read_entries_cached()) == 2
+    assert builder._cached_offset < log.stat().st_size
+
+
+def test_api_tree_answers_matching_etag_with_304(tmp_path):
+    import http.client
+
+    log = tmp_path / "trace.log"
+    _write(log, [_entry("a", "start")])
+    httpd = _serve(log)
+    try:
+        conn = http.client.HTTPConnection(*httpd.server_address)
+        conn.request("GET", "/api/tree")
+        resp = conn.getresponse()
+        resp.read()
+        etag = resp.getheader("ETag")
+        assert etag and etag.startswith('W/"')
+
+        conn.request("GET", "/api/tree", headers={"If-None-Match": etag})
+        resp = conn.getresponse()
+        assert resp.status == 304
+        assert resp.read() == b""
+
+        _write(log, [_entry("b", "start")], mode="a")
+        conn.request("GET", "/api/tree", headers={"If-None-Match": etag})
+        resp = conn.getresponse()
+        assert resp.status == 200
+        assert json.loads(resp.read())["total_nodes"] == 2
+        conn.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_node_dicts_keep_their_shape(tmp_path):
+    log = tmp_path / "trace.log"
+    _write(log, [
+        _entry("ok", "start"),
+        _entry("ok", "end"),
+        _entry("bad", "start"),
+        dict(_entry("bad", "error"), message="boom"),
+    ])
+    ok, bad = _TraceTreeBuilder(log).build_tree()["roots"]
+
+    assert list(ok)[:3] == ["call_id", "parent_id", "function"]
+    assert list(ok)[-1] == "children"
+    assert "error" not in ok and ok["status"] == "success"
+    assert bad["error"] == "boom" and bad["status"] == "error"
+
+
+def test_static_assets_are_precompressed_and_revalidated(tmp_path):
+    import gzip
+    import http.client
+
+    httpd = _serve(tmp_path / "trace.log")
+    try:
+        conn = http.client.HTTPConnection(*httpd.server_address)
+        conn.request("GET", "/", headers={"Accept-Encoding": "gzip"})
+        resp = conn.getresponse()
+        assert resp.getheader("Content-Encoding") == "gzip"
+        html = gzip.decompress(resp.read()).decode("utf-8")
+        assert 'src="/app.js?v=' in html
+        etag = resp.getheader("ETag")
+
+        conn.request("GET", "/", headers={"If-None-Match": etag})
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 304
+
+        conn.request("GET", "/app.js")
+        resp = conn.getresponse()
+        assert resp.getheader("Content-Encoding") is None
+        assert "immutable" in resp.getheader("Cache-Control")
+        assert resp.read().decode("utf-8").strip()
+        conn.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_recent_entries_is_a_bounded_window(tmp_path, monkeypatch):
+    from pyeztrace import viewer
+
+    monkeypatch.setattr(viewer, "_RECENT_ENTRIES", 3)
+    log = tmp_path / "trace.log"
+    _write(log, [_entry(f"c{i}", "start") for i in range(5)])
+    builder = viewer._TraceTreeBuilder(log)
+
+    assert [e["data"]["call_id"] for e in builder.recent_entries()] == ["c2", "c3", "c4"]
+    _write(log, [_entry("c5", "start")], mode="a")
+    assert [e["data"]["call_id"] for e in builder.recent_entries()] == ["c3", "c4", "c5"]
+
+
+def test_background_refresher_serves_one_shared_snapshot(tmp_path, monkeypatch):
+    import time
+
+    from pyeztrace.viewer import TraceViewerServer
+
+    log = tmp_path / "trace.log"
+    _write(log, [_entry("a", "start")])
+    server = TraceViewerServer(log, refresh_interval=0.01)
+    builds = []
+    real_build = server._builder.build_tree
+    monkeypatch.setattr(server._builder, "build_tree", lambda: builds.append(1) or real_build())
+
+    server.start_refresher()
+    try:
+        first = server._tree_snapshot()
+        assert all(server._tree_snapshot() is first for _ in range(20))
+        assert len(builds) == 1
+
+        _write(log, [_entry("b", "start")], mode="a")
+        deadline = time.time() + 5
+        while server._tree_snapshot() is first and time.time() < deadline:
+            time.sleep(0.01)
+        assert server._tree_snapshot()[1]["total_nodes"] == 2
+    finally:
+        server.stop_refresher()
+    assert server._refresher is None
+
+
+def test_wide_parent_keeps_children_ordered_and_unique(tmp_path):
+    log = tmp_path / "trace.log"
+    kids = [f"k{i}" for i in range(2000)]
+    _write(log, [_entry(k, ev, parent_id="p") for k in kids for ev in ("start", "end")])
+    tree = _TraceTreeBuilder(log).build_tree()
+
+    (parent,) = tree["roots"]
+    assert [c["call_id"] for c in parent["children"]] == kids
+
+
+def test_build_subtree_pages_and_limits_depth(tmp_path):
+    log = tmp_path / "trace.log"
+    entries = [_entry("root", "start")]
+    entries += [_entry(f"k{i}", "start", parent_id="root") for i in range(5)]
+    entries += [_entry("gk", "start", parent_id="k1"), _entry("ggk", "start", parent_id="gk")]
+    _write(log, entries)
+    builder = _TraceTreeBuilder(log)
+
+    page = builder.build_subtree(root="root", depth=2, offset=1, limit=2)
+    assert page["total"] == 5
+    assert [n["call_id"] for n in page["nodes"]] == ["k1", "k2"]
+    k1 = page["nodes"][0]
+    assert k1["child_count"] == 1 and not k1["has_more"]
+    (gk,) = k1["children"]
+    assert gk["call_id"] == "gk" and gk["children"] == [] and gk["has_more"]
+
+    top = builder.build_subtree(depth=1)
+    assert [n["call_id"] for n in top["nodes"]] == ["root"]
+    assert top["nodes"][0]["has_more"] and top["nodes"][0]["child_count"] == 5
+    assert builder.build_subtree(root="missing") is None
+
+
+def test_repeated_node_fields_are_interned(tmp_path):
+    log = tmp_path / "trace.log"
+    _write(log, [_entry(f"c{i}", "start", function="worker_fn") for i in range(3)])
+    builder = _TraceTreeBuilder(log)
+    builder._read_entries_cached()
+
+    a, b, c = builder._nodes.values()
+    assert a.function is b.function is c.function
+    assert a.project is b.project and a.status is b.status
+
+
+def test_idle_refresher_only_stats_the_log(tmp_path, monkeypatch):
+    import time
+
+    from pyeztrace.viewer import TraceViewerServer
+
+    log = tmp_path / "trace.log"
+    _write(log, [_entry("a", "start")])
+    server = TraceViewerServer(log, refresh_interval=0.005)
+    server.start_refresher()
+    try:
+        ingests = []
+        monkeypatch.setattr(server._builder, "_ingest_new", lambda: ingests.append(1))
+        time.sleep(0.1)
+        assert ingests == []
+    finally:
+        server.stop_refresher()
+
+
+def test_api_tree_ndjson_streams_nodes_parents_first(tmp_path):
+    import http.client
+
+    log = tmp_path / "trace.log"
+    _write(log, [
+        _entry("b", "start", parent_id="a"),
+        _entry("a", "start"),
+        _entry("c", "start", parent_id="b"),
+        _entry("d", "start"),
+    ])
+    httpd = _serve(log)
+    try:
+        conn = http.client.HTTPConnection(*httpd.server_address)
+        conn.request("GET", "/api/tree.ndjson")
+        resp = conn.getresponse()
+        assert resp.getheader("Content-Type") == "application/x-ndjson"
+        etag = resp.getheader("ETag")
+        records = [json.loads(line) for line in resp.read().splitlines()]
+        assert records[0]["type"] == "meta" and records[0]["total_nodes"] == 4
+        assert [(r["call_id"], r["tree_parent"]) for r in records[1:]] == [
+            ("a", None), ("b", "a"), ("c", "b"), ("d", None),
+        ]
+
+        conn.request("GET", "/api/tree.ndjson", headers={"If-None-Match": etag})
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 304
+        conn.close()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()